@@ -0,0 +1,113 @@
+#!/usr/bin/env python3
+"""
+Benchmark font analysis of decks with large embedded media.
+
+Builds a small deck and a copy of it with one big stored video under
+ppt/media/, then times FontExtractor.extract_from_pptx on both and counts
+the bytes each extraction reads and pages in. Because packages are opened
+through package_reader.open_package, both decks should cost about the
+same no matter how large the video is.
+
+    python benchmark_package_reader.py --media-mb 2048 --runs 20
+"""
+
+import os
+import time
+import mmap
+import resource
+import shutil
+import zipfile
+import argparse
+import tempfile
+from pathlib import Path
+from typing import Dict, Optional
+
+from pptx import Presentation
+from pptx.util import Inches
+
+from font_extractor import FontExtractor
+
+
+CHUNK = 1024 * 1024
+
+
+def _read_bytes() -> Optional[int]:
+    """Bytes this process has read through read() calls so far (Linux only)."""
+    try:
+        with open('/proc/self/io', 'r') as f:
+            for line in f:
+                if line.startswith('rchar:'):
+                    return int(line.split()[1])
+    except OSError:
+        pass
+    return None
+
+
+def _paged_bytes() -> int:
+    """Bytes of pages this process has faulted in so far; mmap reads show up here, not in read()."""
+    usage = resource.getrusage(resource.RUSAGE_SELF)
+    return (usage.ru_minflt + usage.ru_majflt) * mmap.PAGESIZE
+
+
+def build_decks(folder: Path, media_mb: int) -> Dict[str, Path]:
+    """Write 'plain.pptx' and 'video.pptx', the same deck plus media_mb MB of stored video."""
+    prs = Presentation()
+    for number in range(1, 21):
+        slide = prs.slides.add_slide(prs.slide_layouts[1])
+        slide.shapes.title.text = f"Slide {number}"
+        body = slide.placeholders[1].text_frame
+        body.text = "Font analysis should not depend on the size of the video."
+        box = slide.shapes.add_textbox(Inches(1), Inches(5), Inches(6), Inches(1))
+        box.text_frame.text = "Speaker notes and captions"
+    plain = folder / 'plain.pptx'
+    prs.save(plain)
+
+    video = folder / 'video.pptx'
+    shutil.copyfile(plain, video)
+    block = os.urandom(CHUNK)
+    with zipfile.ZipFile(video, 'a', compression=zipfile.ZIP_STORED, allowZip64=True) as zip_ref:
+        with zip_ref.open(zipfile.ZipInfo('ppt/media/media1.mp4'), 'w', force_zip64=True) as entry:
+            for _ in range(media_mb):
+                entry.write(block)
+    return {'plain': plain, 'video': video}
+
+
+def measure(extractor: FontExtractor, deck: Path, runs: int) -> Dict:
+    """Average time and bytes read per extraction of one deck."""
+    extractor.extract_from_pptx(str(deck))  # warm caches and the font database
+    read_before, paged_before = _read_bytes(), _paged_bytes()
+    started = time.perf_counter()
+    for _ in range(runs):
+        extractor.extract_from_pptx(str(deck))
+    elapsed = time.perf_counter() - started
+    read_after, paged_after = _read_bytes(), _paged_bytes()
+    return {
+        'size': deck.stat().st_size,
+        'ms': elapsed / runs * 1000,
+        'read': (read_after - read_before) // runs if read_before is not None else None,
+        # Includes the extractor's own allocations, so compare decks rather than read it as file I/O
+        'paged': (paged_after - paged_before) // runs,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--media-mb', type=int, default=2048, help='Size of the embedded video in MB (default: 2048)')
+    parser.add_argument('--runs', type=int, default=20, help='Extractions per deck (default: 20)')
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        tmp = Path(tmp)
+        print(f"Building decks with a {args.media_mb} MB video...")
+        decks = build_decks(tmp, args.media_mb)
+        extractor = FontExtractor(output_dir=str(tmp / 'extracted'))
+
+        for label, deck in decks.items():
+            result = measure(extractor, deck, args.runs)
+            read = f"{result['read'] / 1024:.1f} KB read()" if result['read'] is not None else "read() n/a"
+            print(f"  {label:6} {result['size'] / CHUNK:9.1f} MB  {result['ms']:7.2f} ms/extraction  "
+                  f"{read}  {result['paged'] / 1024:.1f} KB paged in")
+
+
+if __name__ == '__main__':
+    main()
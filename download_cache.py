@@ -0,0 +1,225 @@
+"""
+Cross-project font download cache.
+Downloaded font files are kept once, by content hash, in a user-wide cache
+and linked into each project's fonts_downloaded/ folder, so a family that
+any project fetched before is never downloaded again.
+"""
+
+import time
+import sqlite3
+import hashlib
+import threading
+from contextlib import contextmanager
+from io import BytesIO
+from pathlib import Path
+from typing import Callable, Dict, Optional
+
+from font_store import FontStore
+
+try:
+    import fcntl
+except ImportError:  # Windows: no cross-process download locks
+    fcntl = None
+
+
+DEFAULT_CACHE_DIR = Path.home() / ".cache" / "presentation-toolkit" / "font_downloads"
+
+# Font files are small; 1 GiB holds thousands of families
+DEFAULT_MAX_BYTES = 1024 ** 3
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS entries (
+    family TEXT NOT NULL,
+    variant TEXT NOT NULL,
+    version TEXT NOT NULL,
+    sha256 TEXT NOT NULL,
+    size INTEGER NOT NULL,
+    url TEXT,
+    created_at REAL NOT NULL,
+    last_used REAL NOT NULL,
+    PRIMARY KEY (family, variant, version)
+);
+CREATE INDEX IF NOT EXISTS entries_last_used ON entries (last_used);
+CREATE INDEX IF NOT EXISTS entries_sha256 ON entries (sha256);
+"""
+
+
+class FontDownloadCache:
+    """
+    Downloaded font files keyed by (family, variant, catalog version).
+
+    File contents are stored by SHA-256 in a FontStore, so identical files
+    under several keys take space once; an SQLite index maps keys to blobs
+    and tracks when each was last used. When the blobs exceed max_bytes
+    the least recently used entries are evicted. Project folders hold
+    hardlinks (or copies), so eviction never breaks a project.
+
+    Several processes may share the cache: the index uses SQLite's WAL
+    mode, blobs are written atomically, and downloads of the same key are
+    serialized with a lock file where the platform supports it.
+    """
+
+    def __init__(self, cache_dir: Optional[str] = None, max_bytes: int = DEFAULT_MAX_BYTES):
+        self.cache_dir = Path(cache_dir) if cache_dir else DEFAULT_CACHE_DIR
+        self.cache_dir.mkdir(exist_ok=True, parents=True)
+        self.max_bytes = max_bytes
+        self.store = FontStore(self.cache_dir)
+        self.locks_dir = self.cache_dir / "locks"
+        self.locks_dir.mkdir(exist_ok=True)
+
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(str(self.cache_dir / "index.sqlite"), timeout=30, check_same_thread=False)
+        self._conn.row_factory = sqlite3.Row
+        self._conn.execute("PRAGMA journal_mode = WAL")
+        self._conn.execute("PRAGMA synchronous = NORMAL")
+        self._conn.executescript(SCHEMA)
+
+    def close(self):
+        self._conn.close()
+
+    def fetch(self, family: str, variant: str, version: str, url: str, target_path: Path,
+              download: Callable[[str], Optional[bytes]]) -> Optional[Dict]:
+        """
+        Place a font file at target_path, from the cache or by downloading it.
+
+        Args:
+            family: Family name
+            variant: Variant name ('regular', '700italic', ...)
+            version: Catalog version of the family (its lastModified date)
+            url: Download URL, used on a cache miss
+            target_path: Where the file should appear
+            download: Function returning the bytes at a URL, or None on failure
+
+        Returns:
+            Dictionary with 'sha256', 'size' and 'cached' (True for a cache
+            hit), or None if the download failed
+        """
+        hit = self.link(family, variant, version, target_path)
+        if hit:
+            return hit
+
+        with self._key_lock(family, variant, version):
+            # Another process may have downloaded it while we waited
+            hit = self.link(family, variant, version, target_path)
+            if hit:
+                return hit
+
+            data = download(url)
+            if data is None:
+                return None
+            digest, size = self.store.add_stream(BytesIO(data))
+            self._record(family, variant, version, digest, size, url)
+            try:
+                self.store.link_into(digest, target_path)
+            except FileNotFoundError:
+                # Evicted by another process right after it was added; the bytes are still at hand
+                digest, size = self.store.add_stream(BytesIO(data))
+                self._record(family, variant, version, digest, size, url)
+                self.store.link_into(digest, target_path)
+
+        self.evict()
+        return {'sha256': digest, 'size': size, 'cached': False}
+
+    def link(self, family: str, variant: str, version: str, target_path: Path) -> Optional[Dict]:
+        """Link a cached file to target_path; returns None on a cache miss."""
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT sha256, size FROM entries WHERE family = ? AND variant = ? AND version = ?",
+                (family, variant, version)
+            ).fetchone()
+        if row is None:
+            return None
+
+        try:
+            self.store.link_into(row['sha256'], target_path)
+        except FileNotFoundError:
+            # Evicted by another process between the lookup and the link
+            return None
+
+        with self._lock, self._conn:
+            self._conn.execute(
+                "UPDATE entries SET last_used = ? WHERE family = ? AND variant = ? AND version = ?",
+                (time.time(), family, variant, version)
+            )
+        return {'sha256': row['sha256'], 'size': row['size'], 'cached': True}
+
+    def evict(self, max_bytes: Optional[int] = None) -> int:
+        """
+        Drop least recently used entries until the blobs fit in max_bytes.
+
+        Returns:
+            Number of bytes freed
+        """
+        limit = self.max_bytes if max_bytes is None else max_bytes
+        with self._lock:
+            total = self._conn.execute(
+                "SELECT COALESCE(SUM(size), 0) FROM (SELECT sha256, MAX(size) AS size FROM entries GROUP BY sha256)"
+            ).fetchone()[0]
+            if total <= limit:
+                return 0
+
+            freed = 0
+            rows = self._conn.execute("SELECT family, variant, version, sha256 FROM entries ORDER BY last_used").fetchall()
+            for row in rows:
+                if total - freed <= limit:
+                    break
+                with self._conn:
+                    self._conn.execute("DELETE FROM entries WHERE family = ? AND variant = ? AND version = ?",
+                                       (row['family'], row['variant'], row['version']))
+                    shared = self._conn.execute("SELECT 1 FROM entries WHERE sha256 = ? LIMIT 1",
+                                                (row['sha256'],)).fetchone()
+                if shared:
+                    continue
+                blob = self.store.blob_path(row['sha256'])
+                try:
+                    freed += blob.stat().st_size
+                    blob.unlink()
+                except FileNotFoundError:
+                    pass
+            return freed
+
+    def stats(self) -> Dict[str, int]:
+        """Return the number of cached entries, unique files and their total size."""
+        with self._lock:
+            entries, files, size = self._conn.execute(
+                "SELECT COUNT(*), COUNT(DISTINCT sha256), "
+                "(SELECT COALESCE(SUM(size), 0) FROM (SELECT MAX(size) AS size FROM entries GROUP BY sha256)) "
+                "FROM entries"
+            ).fetchone()
+        return {'entries': entries, 'files': files, 'bytes': size, 'max_bytes': self.max_bytes}
+
+    def _record(self, family: str, variant: str, version: str, digest: str, size: int, url: str):
+        now = time.time()
+        with self._lock, self._conn:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO entries (family, variant, version, sha256, size, url, created_at, last_used) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+                (family, variant, version, digest, size, url, now, now)
+            )
+
+    @contextmanager
+    def _key_lock(self, family: str, variant: str, version: str):
+        """Hold an exclusive lock file for one cache key, across processes."""
+        if fcntl is None:
+            yield
+            return
+        name = hashlib.sha1(f"{family}\0{variant}\0{version}".encode('utf-8')).hexdigest()
+        with open(self.locks_dir / name, 'a') as lock_file:
+            fcntl.flock(lock_file, fcntl.LOCK_EX)
+            try:
+                yield
+            finally:
+                fcntl.flock(lock_file, fcntl.LOCK_UN)
+
+
+_default_cache = None
+_default_cache_lock = threading.Lock()
+
+
+def get_download_cache() -> FontDownloadCache:
+    """Return the download cache shared by every FontHunter in this process."""
+    global _default_cache
+    with _default_cache_lock:
+        if _default_cache is None:
+            _default_cache = FontDownloadCache()
+        return _default_cache
@@ -0,0 +1,191 @@
+"""
+Presentation file discovery.
+Walks show folders recursively with os.scandir and yields matching files as
+they are found, so processing can start before the walk has finished.
+"""
+
+import os
+import queue
+import threading
+from fnmatch import fnmatch
+from pathlib import Path
+from typing import Dict, Iterable, Iterator, List, Sequence
+
+
+# Document bundles that are directories on disk but one presentation each
+PACKAGE_EXTENSIONS = ('.key', '.keynote')
+
+# Never presentations: Office lock files, macOS resource forks, hidden files
+DEFAULT_EXCLUDES = ('~$*', '._*', '.*')
+
+
+def _matches(name: str, rel_path: str, patterns: Sequence[str]) -> bool:
+    """Match a pattern against the file name, or the relative path if it contains '/'."""
+    for pattern in patterns:
+        target = rel_path if '/' in pattern else name
+        if fnmatch(target.lower(), pattern.lower()):
+            return True
+    return False
+
+
+def iter_files(path: str, extensions: Iterable[str], include: Sequence[str] = (),
+               exclude: Sequence[str] = (), recursive: bool = True) -> Iterator[Path]:
+    """
+    Yield files with the given extensions below a path.
+
+    Extensions are compared case-insensitively. Keynote packages (.key
+    directories) are yielded as single files and never descended into.
+    Files reached twice through hardlinks or symlinks are yielded once.
+
+    Args:
+        path: File or directory path
+        extensions: File extensions (e.g., ['.pptx', '.key'])
+        include: Glob patterns a file must match (any of them), if given
+        exclude: Glob patterns for files and folders to skip; patterns with
+            a '/' are matched against the path relative to the input folder
+        recursive: Descend into subfolders
+
+    Yields:
+        Path objects, in directory walk order
+    """
+    root = Path(path)
+    extensions = tuple(ext.lower() for ext in extensions)
+    exclude = tuple(DEFAULT_EXCLUDES) + tuple(exclude)
+
+    def wanted(name: str, rel_path: str) -> bool:
+        if not name.lower().endswith(extensions):
+            return False
+        if include and not _matches(name, rel_path, include):
+            return False
+        return not _matches(name, rel_path, exclude)
+
+    if root.is_file() or (root.is_dir() and root.suffix.lower() in PACKAGE_EXTENSIONS):
+        if root.name.lower().endswith(extensions):
+            yield root
+        return
+    if not root.is_dir():
+        return
+
+    seen = set()
+    stack = [(str(root), '')]
+    try:
+        root_stat = root.stat()
+        seen.add((root_stat.st_dev, root_stat.st_ino))
+    except OSError:
+        pass
+
+    while stack:
+        current, rel_dir = stack.pop()
+        try:
+            with os.scandir(current) as entries:
+                entries = sorted(entries, key=lambda e: e.name)
+        except OSError as e:
+            print(f"Warning: Could not read folder {current}: {e}")
+            continue
+
+        subdirs = []
+        for entry in entries:
+            rel_path = f"{rel_dir}{entry.name}"
+            try:
+                is_dir = entry.is_dir()
+                is_package = is_dir and entry.name.lower().endswith(PACKAGE_EXTENSIONS)
+
+                if is_dir and not is_package:
+                    if recursive and not _matches(entry.name, rel_path, exclude):
+                        subdirs.append(entry)
+                    continue
+                if not wanted(entry.name, rel_path):
+                    continue
+
+                stat = entry.stat()
+            except OSError:
+                continue
+
+            key = (stat.st_dev, stat.st_ino)
+            if key in seen:
+                continue
+            seen.add(key)
+            yield Path(entry.path)
+
+        # Push in reverse so folders are visited in name order
+        for entry in reversed(subdirs):
+            try:
+                stat = entry.stat()
+            except OSError:
+                continue
+            key = (stat.st_dev, stat.st_ino)
+            if key in seen:  # symlink loop or folder reached twice
+                continue
+            seen.add(key)
+            stack.append((entry.path, f"{rel_dir}{entry.name}/"))
+
+
+def prefetch(items: Iterable, buffer_size: int = 256) -> Iterator:
+    """
+    Run an iterator in a background thread and yield its items as they arrive.
+
+    Lets a slow directory walk (network shares, large show folders) overlap
+    with the processing of files that were already found.
+    """
+    buffer = queue.Queue(maxsize=buffer_size)
+    done = object()
+    errors: List[BaseException] = []
+    stop = threading.Event()
+
+    def produce():
+        try:
+            for item in items:
+                if stop.is_set():
+                    return
+                buffer.put(item)
+        except BaseException as e:
+            errors.append(e)
+        finally:
+            buffer.put(done)
+
+    thread = threading.Thread(target=produce, name="file-discovery", daemon=True)
+    thread.start()
+    try:
+        while True:
+            item = buffer.get()
+            if item is done:
+                break
+            yield item
+    finally:
+        stop.set()
+        # Unblock the producer if it is waiting on a full buffer
+        while thread.is_alive():
+            try:
+                buffer.get_nowait()
+            except queue.Empty:
+                thread.join(0.05)
+
+    if errors:
+        raise errors[0]
+
+
+def discover_files(path: str, extensions: Iterable[str], include: Sequence[str] = (),
+                   exclude: Sequence[str] = ()) -> Iterator[Path]:
+    """Recursively discover files in a background thread (see iter_files)."""
+    return prefetch(iter_files(path, extensions, include=include, exclude=exclude))
+
+
+def output_name(path: Path, claimed: Dict[str, str]) -> str:
+    """
+    Name of the output folder for a discovered file.
+
+    The file's stem, suffixed ("talk-2") when another file already claimed
+    it, so a/talk.pptx and b/talk.pptx never write into the same folder.
+
+    Args:
+        path: Discovered file
+        claimed: Output names already in use, mapped to their file; updated
+    """
+    source = str(Path(path).absolute())
+    name = path.stem
+    number = 2
+    while claimed.get(name, source) != source:
+        name = f"{path.stem}-{number}"
+        number += 1
+    claimed[name] = source
+    return name
@@ -0,0 +1,215 @@
+"""
+Font classification database.
+Loads the known system, commercial and free font families once and
+classifies font names through a hash index and a prefix trie.
+"""
+
+import re
+import json
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Set, Tuple
+
+
+DEFAULT_DATABASE_PATH = Path(__file__).parent / "data" / "font_database.json"
+
+SYSTEM = 'system'
+COMMERCIAL = 'commercial'
+FREE = 'free'
+
+# When a name matches families of several categories, the first one wins
+CATEGORY_PRIORITY = (SYSTEM, COMMERCIAL, FREE)
+
+# Shortest name fragment accepted as a partial (prefix) match
+MIN_PARTIAL_LENGTH = 4
+
+
+def normalize_font_name(name: str) -> str:
+    """Lowercase a font name and drop spaces, hyphens and underscores."""
+    return re.sub(r'[\s_\-]+', '', name).casefold()
+
+
+class _TrieNode:
+    __slots__ = ('children', 'entry', 'categories')
+
+    def __init__(self):
+        self.children = {}
+        self.entry = None
+        self.categories = set()
+
+
+class FontDatabase:
+    """Classify font names as system, commercial or potentially free."""
+
+    def __init__(self, data: Dict):
+        self.version = data.get('version', 1)
+        self._exact = {}
+        self._root = _TrieNode()
+        self._memo = {}
+
+        for platform, families in data.get('system_fonts', {}).items():
+            for family in families:
+                self._add(family, SYSTEM, platform)
+        for family in data.get('commercial_families', []):
+            self._add(family, COMMERCIAL)
+        for family in data.get('free_families', []):
+            self._add(family, FREE)
+
+        self._style_tokens = sorted((normalize_font_name(t) for t in data.get('style_tokens', [])),
+                                    key=len, reverse=True)
+        # Width words name separate families at some foundries ("Roboto Condensed")
+        self._width_tokens = sorted((normalize_font_name(t) for t in data.get('width_tokens', [])),
+                                    key=len, reverse=True)
+        self._style_and_width_tokens = sorted(self._style_tokens + self._width_tokens, key=len, reverse=True)
+        self._foundry_markers = [
+            (tuple(re.findall(r'[a-z0-9&]+', marker.casefold())), normalize_font_name(marker))
+            for marker in data.get('foundry_markers', [])
+        ]
+
+    @classmethod
+    def load(cls, path: Optional[str] = None) -> 'FontDatabase':
+        """Load a database from a JSON file."""
+        with open(path or DEFAULT_DATABASE_PATH, 'r', encoding='utf-8') as f:
+            return cls(json.load(f))
+
+    def match(self, font_name: str) -> Dict:
+        """
+        Classify a single font name.
+
+        Matching order: exact normalized name, known family followed only by
+        style words ("Segoe UI Semibold", "HelveticaNeue-Bold"), prefix of a
+        known family ("Hiragino"), foundry marker ("Adobe Garamond Pro").
+        Anything else is assumed to be potentially free.
+
+        Returns:
+            Dictionary with 'category', 'family', 'platforms' and 'match'
+        """
+        key = normalize_font_name(font_name)
+        cached = self._memo.get(key)
+        if cached is not None:
+            return cached
+
+        result = self._match_key(key, font_name)
+        self._memo[key] = result
+        return result
+
+    def classify(self, font_name: str) -> str:
+        """Return the category of a font name."""
+        return self.match(font_name)['category']
+
+    def categorize(self, fonts: Iterable[str]) -> Tuple[Set[str], Set[str], Set[str]]:
+        """Split font names into (system, commercial, free) sets."""
+        buckets = {SYSTEM: set(), COMMERCIAL: set(), FREE: set()}
+        for font in fonts:
+            buckets[self.classify(font)].add(font)
+        return buckets[SYSTEM], buckets[COMMERCIAL], buckets[FREE]
+
+    def classify_batch(self, font_sets: Iterable[Iterable[str]]) -> List[Dict[str, str]]:
+        """
+        Classify the fonts of many decks at once.
+
+        Each distinct name is resolved once and shared across decks.
+
+        Returns:
+            One {font name: category} dictionary per input set
+        """
+        return [{font: self.classify(font) for font in fonts} for fonts in font_sets]
+
+    def _add(self, family: str, category: str, platform: Optional[str] = None):
+        key = normalize_font_name(family)
+        if not key:
+            return
+
+        entry = self._exact.get(key)
+        if entry is None:
+            entry = {'family': family, 'category': category, 'platforms': []}
+            self._exact[key] = entry
+        elif CATEGORY_PRIORITY.index(category) < CATEGORY_PRIORITY.index(entry['category']):
+            entry['category'] = category
+        if platform and platform not in entry['platforms']:
+            entry['platforms'].append(platform)
+
+        node = self._root
+        for char in key:
+            node.categories.add(category)
+            node = node.children.setdefault(char, _TrieNode())
+        node.categories.add(category)
+        node.entry = entry
+
+    def _match_key(self, key: str, font_name: str) -> Dict:
+        if not key:
+            return self._result(FREE, None, 'default')
+
+        entry = self._exact.get(key)
+        if entry:
+            return self._result(entry['category'], entry, 'exact')
+
+        # Longest known family that the name starts with, where the rest is
+        # only style words
+        node = self._root
+        best = None
+        for i, char in enumerate(key):
+            node = node.children.get(char)
+            if node is None:
+                break
+            if node.entry and self.is_style_suffix(key[i + 1:]):
+                best = node.entry
+        if best:
+            return self._result(best['category'], best, 'family+style')
+
+        # The name is the beginning of a known family
+        if node is not None and len(key) >= MIN_PARTIAL_LENGTH:
+            for category in CATEGORY_PRIORITY:
+                if category in node.categories:
+                    return self._result(category, None, 'partial')
+
+        tokens = tuple(re.findall(r'[a-z0-9&]+', font_name.casefold()))
+        for marker_tokens, marker_key in self._foundry_markers:
+            if key.startswith(marker_key) or _contains_sequence(tokens, marker_tokens):
+                return self._result(COMMERCIAL, None, 'foundry')
+
+        return self._result(FREE, None, 'default')
+
+    def is_style_suffix(self, rest: str, widths: bool = True) -> bool:
+        """
+        Check whether rest consists only of style words ("bold", "semibolditalic").
+
+        With widths=False, width words ("condensed") don't count as style,
+        for lookups where "Barlow Condensed" must not resolve to Barlow.
+        """
+        tokens = self._style_and_width_tokens if widths else self._style_tokens
+        while rest:
+            for token in tokens:
+                if rest.startswith(token):
+                    rest = rest[len(token):]
+                    break
+            else:
+                return False
+        return True
+
+    @staticmethod
+    def _result(category: str, entry: Optional[Dict], match: str) -> Dict:
+        return {
+            'category': category,
+            'family': entry['family'] if entry else None,
+            'platforms': list(entry['platforms']) if entry else [],
+            'match': match,
+        }
+
+
+def _contains_sequence(tokens: Tuple[str, ...], sequence: Tuple[str, ...]) -> bool:
+    """Check whether sequence appears as consecutive items of tokens."""
+    if not sequence:
+        return False
+    size = len(sequence)
+    return any(tokens[i:i + size] == sequence for i in range(len(tokens) - size + 1))
+
+
+_default_database = None
+
+
+def get_font_database() -> FontDatabase:
+    """Return the shared default database, loading it on first use."""
+    global _default_database
+    if _default_database is None:
+        _default_database = FontDatabase.load()
+    return _default_database
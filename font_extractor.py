@@ -1,22 +1,136 @@
 """
-Font extraction from PowerPoint (.pptx) files.
+Font extraction from PowerPoint (.pptx), Keynote and PDF files.
 Extracts embedded fonts and saves them to a designated folder.
 """
 
 import os
+import re
+import bisect
 import zipfile
 import shutil
+import threading
+from io import BytesIO
 from pathlib import Path
-from typing import List, Set, Dict
+from typing import List, Set, Dict, Optional, Tuple
 import xml.etree.ElementTree as ET
 
+from file_discovery import output_name
+from font_database import get_font_database
+from font_info import decode_embedded_font
+from font_store import FontStore
+from keynote_iwa import KeynoteArchive
+from package_reader import open_package
+from pdf_fonts import PDFFontScanner
+
+
+# Namespaces used in PPTX files
+A_NS = '{http://schemas.openxmlformats.org/drawingml/2006/main}'
+P_NS = '{http://schemas.openxmlformats.org/presentationml/2006/main}'
+
+A_P = A_NS + 'p'
+A_R = A_NS + 'r'
+A_BR = A_NS + 'br'
+A_FLD = A_NS + 'fld'
+A_T = A_NS + 't'
+A_RPR = A_NS + 'rPr'
+A_LATIN = A_NS + 'latin'
+A_EA = A_NS + 'ea'
+A_CS = A_NS + 'cs'
+A_MAJOR_FONT = A_NS + 'majorFont'
+A_MINOR_FONT = A_NS + 'minorFont'
+A_FONT = A_NS + 'font'
+P_SP = P_NS + 'sp'
+P_PH = P_NS + 'ph'
+
+THEME_SCRIPT_SLOTS = {A_LATIN: 'lt', A_EA: 'ea', A_CS: 'cs'}
+THEME_FONT_TOKENS = {'+mj-lt', '+mn-lt', '+mj-ea', '+mn-ea', '+mj-cs', '+mn-cs'}
+TITLE_PLACEHOLDERS = {'title', 'ctrTitle'}
+
+# Code point ranges PowerPoint draws with a run's a:ea or a:cs font; the rest use a:latin
+SCRIPT_RANGES = sorted([
+    (0x0590, 0x08FF, 'cs'),    # Hebrew, Arabic, Syriac, Thaana, NKo
+    (0x0900, 0x0DFF, 'cs'),    # Indic scripts and Sinhala
+    (0x0E00, 0x0FFF, 'cs'),    # Thai, Lao, Tibetan
+    (0x1100, 0x11FF, 'ea'),    # Hangul Jamo
+    (0x1780, 0x17FF, 'cs'),    # Khmer
+    (0x2E80, 0x2FDF, 'ea'),    # CJK radicals
+    (0x3000, 0x33FF, 'ea'),    # CJK punctuation, kana, bopomofo, compatibility
+    (0x3400, 0x4DBF, 'ea'),    # CJK extension A
+    (0x4E00, 0x9FFF, 'ea'),    # CJK unified ideographs
+    (0xA000, 0xA4CF, 'ea'),    # Yi
+    (0xAC00, 0xD7AF, 'ea'),    # Hangul syllables
+    (0xF900, 0xFAFF, 'ea'),    # CJK compatibility ideographs
+    (0xFB1D, 0xFDFF, 'cs'),    # Hebrew and Arabic presentation forms
+    (0xFE30, 0xFE4F, 'ea'),    # CJK compatibility forms
+    (0xFE70, 0xFEFF, 'cs'),    # Arabic presentation forms B
+    (0xFF00, 0xFFEF, 'ea'),    # Halfwidth and fullwidth forms
+    (0x20000, 0x3FFFF, 'ea'),  # CJK extensions B and later
+])
+SCRIPT_RANGE_STARTS = [start for start, _, _ in SCRIPT_RANGES]
+
+# Slide targeted by a notes slide's relationships part
+SLIDE_TARGET = re.compile(rb'Target="[^"]*slides/slide(\d+)\.xml"')
+
+# (bold, italic) -> style name
+RUN_STYLES = {
+    (False, False): 'regular',
+    (True, False): 'bold',
+    (False, True): 'italic',
+    (True, True): 'bold italic',
+}
+
+
+def _part_number(part_name: str) -> int:
+    """Return the number in a part name like 'ppt/slides/slide12.xml' (0 if none)."""
+    digits = re.findall(r'(\d+)\.xml$', part_name)
+    return int(digits[0]) if digits else 0
+
+
+def _join_text(parts: List[str]) -> str:
+    """Join collected run texts and paragraph breaks into clean text."""
+    lines = (' '.join(line.split()) for line in ''.join(parts).split('\n'))
+    return '\n'.join(line for line in lines if line)
+
+
+def _char_script(char: str) -> str:
+    """Return 'ea', 'cs' or 'lt': which of a run's fonts PowerPoint draws char with."""
+    code = ord(char)
+    index = bisect.bisect_right(SCRIPT_RANGE_STARTS, code) - 1
+    if index >= 0 and code <= SCRIPT_RANGES[index][1]:
+        return SCRIPT_RANGES[index][2]
+    return 'lt'
+
+
+def _split_scripts(text: str) -> List[Tuple[str, str]]:
+    """
+    Split run text into (script, text) pieces by _char_script.
+    
+    Whitespace stays with the piece it is in, so a space between two
+    ideographs is not credited to the latin font.
+    """
+    pieces = []
+    for char in text:
+        script = pieces[-1][0] if pieces and char.isspace() else _char_script(char)
+        if pieces and pieces[-1][0] == script:
+            pieces[-1][1].append(char)
+        else:
+            pieces.append((script, [char]))
+    return [(script, ''.join(chars)) for script, chars in pieces]
+
 
 class FontExtractor:
     """Extract fonts from presentation files."""
     
-    def __init__(self, output_dir: str = "extracted_fonts"):
+    def __init__(self, output_dir: str = "extracted_fonts", dedupe_fonts: bool = True, collect_text: bool = False):
         self.output_dir = Path(output_dir)
         self.output_dir.mkdir(exist_ok=True, parents=True)
+        # Identical embedded fonts are stored once and hardlinked per deck
+        self.font_store = FontStore(self.output_dir / ".font_store") if dedupe_fonts else None
+        # Also collect slide titles, text and speaker notes (for the slide text index)
+        self.collect_text = collect_text
+        # Output folder names by source file, so decks sharing a name get folders of their own
+        self._output_names = {}
+        self._output_names_lock = threading.Lock()
     
     def extract_from_pptx(self, pptx_path: str) -> Dict[str, List[str]]:
         """
@@ -33,158 +147,252 @@ class FontExtractor:
             raise FileNotFoundError(f"File not found: {pptx_path}")
         
         # Create output folder for this presentation
-        output_folder = self.output_dir / pptx_path.stem
+        output_folder = self._output_folder(pptx_path)
         output_folder.mkdir(exist_ok=True, parents=True)
         
         embedded_fonts = []
+        font_blobs = {}
         referenced_fonts = set()
+        font_usage = {}
+        font_codepoints = {}
+        theme_fallback_fonts = set()
+        slide_text = {} if self.collect_text else None
         
         try:
-            with zipfile.ZipFile(pptx_path, 'r') as zip_ref:
+            # Memory-mapped, central-directory-only access; ppt/media/ is never read
+            with open_package(pptx_path) as zip_ref:
                 # Extract embedded fonts from ppt/fonts/ directory
-                font_files = [f for f in zip_ref.namelist() if f.startswith('ppt/fonts/')]
+                font_files = [info for info in zip_ref.infolist()
+                              if info.filename.startswith('ppt/fonts/') and not info.is_dir()]
                 
-                for font_file in font_files:
-                    font_name = os.path.basename(font_file)
-                    output_path = output_folder / font_name
-                    
-                    # Extract the font file
-                    with zip_ref.open(font_file) as source:
-                        with open(output_path, 'wb') as target:
-                            shutil.copyfileobj(source, target)
-                    
+                for font_info in font_files:
+                    output_path = self._save_zip_font(zip_ref, font_info, output_folder, font_blobs)
                     embedded_fonts.append(str(output_path))
                 
-                # Analyze XML to find referenced fonts
-                referenced_fonts = self._extract_font_references_from_pptx(zip_ref)
+                # Analyze XML to find referenced fonts and how they are used
+                referenced_fonts, font_usage, font_codepoints, theme_fallback_fonts = self._scan_pptx_fonts(
+                    zip_ref, slide_text)
+                if slide_text is not None:
+                    self._scan_pptx_notes(zip_ref, slide_text)
         
         except Exception as e:
             print(f"Error extracting fonts from {pptx_path}: {e}")
         
+        self._record_font_blobs(pptx_path, font_blobs)
+        embedded_font_info = self._describe_embedded_fonts(embedded_fonts, output_folder)
+        
         # Categorize fonts by type
         system_fonts, commercial_fonts, free_fonts = self._categorize_fonts(referenced_fonts)
         
         return {
             'embedded_fonts': embedded_fonts,
+            'embedded_font_info': embedded_font_info,
+            'font_blobs': {name: info['sha256'] for name, info in font_blobs.items()},
             'referenced_fonts': sorted(list(referenced_fonts)),
+            'font_usage': font_usage,
+            'font_codepoints': font_codepoints,
+            'theme_fallback_fonts': sorted(theme_fallback_fonts),
+            'slide_text': [
+                {'slide': number, 'title': _join_text(parts['title']), 'text': _join_text(parts['body']),
+                 'notes': _join_text(parts['notes'])}
+                for number, parts in sorted((slide_text or {}).items())
+            ],
             'system_fonts': sorted(list(system_fonts)),
             'commercial_fonts': sorted(list(commercial_fonts)),
             'free_fonts': sorted(list(free_fonts)),
             'output_folder': str(output_folder)
         }
     
-    def _extract_font_references_from_pptx(self, zip_ref: zipfile.ZipFile) -> Set[str]:
-        """Extract font names referenced in the presentation XML."""
+    def _scan_pptx_fonts(self, zip_ref: zipfile.ZipFile, slide_text: Optional[Dict[int, Dict]] = None
+                         ) -> Tuple[Set[str], Dict[str, Dict], Dict[str, List[int]], Set[str]]:
+        """
+        Extract font names referenced in the presentation XML, together with
+        per-font usage statistics collected in the same streaming pass.
+        
+        Runs without an explicit latin typeface are attributed to the theme
+        font they inherit by default: the major (heading) font for title
+        placeholders, the minor (body) font for everything else.
+        
+        Args:
+            zip_ref: The open presentation package
+            slide_text: If given, filled with the title and body text of
+                each slide, keyed by slide number
+        
+        Returns:
+            Tuple of (referenced font names, usage by font name, sorted code
+            points of the text each font renders, fonts named only in the
+            theme's per-script fallback lists (<a:font script="Thai" ...>))
+        """
         fonts = set()
+        script_fallbacks = set()
+        usage = {}
+        characters = {}
         
-        # Namespaces used in PPTX files
-        namespaces = {
-            'a': 'http://schemas.openxmlformats.org/drawingml/2006/main',
-            'p': 'http://schemas.openxmlformats.org/presentationml/2006/main',
-            'r': 'http://schemas.openxmlformats.org/officeDocument/2006/relationships'
-        }
+        names = zip_ref.namelist()
+        theme_files = sorted((f for f in names if 'theme' in f and f.endswith('.xml')), key=_part_number)
+        slide_files = sorted((f for f in names if f.startswith('ppt/slides/slide') and f.endswith('.xml')),
+                             key=_part_number)
         
-        try:
-            # Check slides for font references
-            slide_files = [f for f in zip_ref.namelist() if f.startswith('ppt/slides/slide') and f.endswith('.xml')]
-            
-            for slide_file in slide_files:
-                try:
-                    with zip_ref.open(slide_file) as f:
-                        tree = ET.parse(f)
-                        root = tree.getroot()
+        # Theme files first, so +mj-lt / +mn-lt can be resolved while scanning slides
+        theme_fonts = {}
+        for theme_file in theme_files:
+            try:
+                with zip_ref.open(theme_file) as f:
+                    current_scheme = None
+                    for event, elem in ET.iterparse(f, events=('start', 'end')):
+                        if event == 'start':
+                            if elem.tag in (A_MAJOR_FONT, A_MINOR_FONT):
+                                current_scheme = 'mj' if elem.tag == A_MAJOR_FONT else 'mn'
+                            continue
                         
-                        # Find all font references
-                        for elem in root.iter():
-                            # Check for typeface attributes
-                            if 'typeface' in elem.attrib:
-                                fonts.add(elem.attrib['typeface'])
-                            
-                            # Check for latin, ea, cs font elements
-                            tag = elem.tag.split('}')[-1] if '}' in elem.tag else elem.tag
-                            if tag in ['latin', 'ea', 'cs']:
-                                if 'typeface' in elem.attrib:
-                                    fonts.add(elem.attrib['typeface'])
-                
-                except Exception as e:
-                    print(f"Warning: Could not parse {slide_file}: {e}")
-            
-            # Also check theme files
-            theme_files = [f for f in zip_ref.namelist() if 'theme' in f and f.endswith('.xml')]
-            
-            for theme_file in theme_files:
-                try:
-                    with zip_ref.open(theme_file) as f:
-                        tree = ET.parse(f)
-                        root = tree.getroot()
+                        typeface = elem.attrib.get('typeface')
+                        if typeface and elem.tag == A_FONT:
+                            script_fallbacks.add(typeface)
+                        elif typeface:
+                            fonts.add(typeface)
+                            script = THEME_SCRIPT_SLOTS.get(elem.tag)
+                            if current_scheme and script:
+                                theme_fonts.setdefault(f"+{current_scheme}-{script}", typeface)
+                        if elem.tag in (A_MAJOR_FONT, A_MINOR_FONT):
+                            current_scheme = None
+            except Exception as e:
+                print(f"Warning: Could not parse {theme_file}: {e}")
+        
+        for slide_file in slide_files:
+            slide_number = _part_number(slide_file)
+            if slide_text is not None:
+                text_parts = slide_text.setdefault(slide_number, {'title': [], 'body': [], 'notes': []})
+            try:
+                with zip_ref.open(slide_file) as f:
+                    placeholder = None
+                    for event, elem in ET.iterparse(f, events=('start', 'end')):
+                        tag = elem.tag
+                        if event == 'start':
+                            if tag == P_SP:
+                                placeholder = None
+                            continue
                         
-                        for elem in root.iter():
-                            if 'typeface' in elem.attrib:
-                                fonts.add(elem.attrib['typeface'])
-                            
-                            tag = elem.tag.split('}')[-1] if '}' in elem.tag else elem.tag
-                            if tag in ['latin', 'ea', 'cs', 'majorFont', 'minorFont']:
-                                if 'typeface' in elem.attrib:
-                                    fonts.add(elem.attrib['typeface'])
-                
-                except Exception as e:
-                    print(f"Warning: Could not parse {theme_file}: {e}")
+                        typeface = elem.attrib.get('typeface')
+                        if typeface:
+                            fonts.add(typeface)
+                        
+                        if tag == P_PH:
+                            placeholder = elem.get('type', 'body')
+                        elif tag in (A_R, A_FLD):
+                            text = self._record_run(elem, placeholder, slide_number, theme_fonts, usage, characters)
+                            if slide_text is not None:
+                                text_parts['title' if placeholder in TITLE_PLACEHOLDERS else 'body'].append(text)
+                        elif tag in (A_P, A_BR) and slide_text is not None:
+                            text_parts['title' if placeholder in TITLE_PLACEHOLDERS else 'body'].append('\n')
+                        elif tag == P_SP:
+                            # Tables, connectors and group text after a shape are not in its placeholder
+                            placeholder = None
+                            elem.clear()
+            except Exception as e:
+                print(f"Warning: Could not parse {slide_file}: {e}")
         
-        except Exception as e:
-            print(f"Warning: Error extracting font references: {e}")
+        # Fallbacks also named by the theme's own slots or by slides are really used
+        theme_fallback_fonts = script_fallbacks - fonts
+        fonts |= script_fallbacks
         
         # Filter out generic/system references
-        fonts = {f for f in fonts if f and f not in ['+mj-lt', '+mn-lt', '+mj-ea', '+mn-ea', '+mj-cs', '+mn-cs']}
+        fonts = {f for f in fonts if f and f not in THEME_FONT_TOKENS}
         
-        return fonts
+        for stats in usage.values():
+            stats['slides'] = sorted(stats['slides'])
+            stats['styles'] = sorted(stats['styles'], key=list(RUN_STYLES.values()).index)
+        
+        codepoints = {font: sorted(map(ord, chars)) for font, chars in characters.items()}
+        
+        return fonts, usage, codepoints, theme_fallback_fonts
     
-    def _categorize_fonts(self, fonts: Set[str]) -> tuple:
-        """Categorize fonts into system, commercial, and potentially free fonts."""
-        system_fonts = set()
-        commercial_fonts = set()
-        free_fonts = set()
-        
-        # Known system fonts (Windows, macOS, Linux)
-        known_system_fonts = {
-            # Windows system fonts
-            'Arial', 'Calibri', 'Cambria', 'Candara', 'Comic Sans MS', 'Consolas', 'Constantia',
-            'Corbel', 'Courier New', 'Georgia', 'Impact', 'Lucida Console', 'Lucida Sans Unicode',
-            'Microsoft Sans Serif', 'Palatino Linotype', 'Segoe UI', 'Tahoma', 'Times New Roman',
-            'Trebuchet MS', 'Verdana', 'Wingdings',
+    def _scan_pptx_notes(self, zip_ref: zipfile.ZipFile, slide_text: Dict[int, Dict]):
+        """Add the speaker notes of each slide to slide_text."""
+        for notes_file in zip_ref.namelist():
+            if not (notes_file.startswith('ppt/notesSlides/notesSlide') and notes_file.endswith('.xml')):
+                continue
             
-            # macOS system fonts
-            'Avenir', 'Avenir Next', 'Helvetica', 'Helvetica Neue', 'Menlo', 'Monaco', 'Optima',
-            'Palatino', 'San Francisco', 'Times', 'Zapfino', '游ゴシック', 'Yu Gothic', 'YuGothic',
-            'Hiragino Sans', 'Hiragino Kaku Gothic', 'Hiragino Mincho Pro', 'STSong',
-            'STHeiti', 'STKaiti', 'STFangsong', 'PingFang SC', 'PingFang HK', 'PingFang TC',
+            # The notes part's relationships point at the slide it belongs to
+            rels_file = notes_file.replace('notesSlides/', 'notesSlides/_rels/') + '.rels'
+            try:
+                match = SLIDE_TARGET.search(zip_ref.read(rels_file))
+            except KeyError:
+                match = None
+            if not match:
+                continue
             
-            # Linux system fonts
-            'Liberation Sans', 'Liberation Serif', 'Liberation Mono', 'DejaVu Sans',
-            'DejaVu Serif', 'DejaVu Sans Mono', 'Ubuntu', 'Noto Sans', 'Noto Serif',
+            parts = slide_text.setdefault(int(match.group(1)), {'title': [], 'body': [], 'notes': []})['notes']
+            try:
+                # Notes parts are small; a full parse is cheaper than iterparse here
+                root = ET.fromstring(zip_ref.read(notes_file))
+            except Exception as e:
+                print(f"Warning: Could not parse {notes_file}: {e}")
+                continue
             
-            # Web safe fonts
-            'serif', 'sans-serif', 'monospace', 'cursive', 'fantasy'
-        }
+            for shape in root.iter(P_SP):
+                placeholder = shape.find(f'.//{P_PH}')
+                # Skip the slide image, slide number and header placeholders
+                if placeholder is None or placeholder.get('type', 'body') != 'body':
+                    continue
+                for paragraph in shape.iter(A_P):
+                    parts.append(''.join(t.text or '' for t in paragraph.iter(A_T)))
+                    parts.append('\n')
+    
+    def _record_run(self, run, placeholder: Optional[str], slide_number: int,
+                    theme_fonts: Dict[str, str], usage: Dict[str, Dict], characters: Dict[str, Set[str]]) -> str:
+        """
+        Add one text run to the per-font usage statistics and character sets.
         
-        for font in fonts:
-            font_lower = font.lower().strip()
-            found_system = False
-            
-            for sys_font in known_system_fonts:
-                if font_lower == sys_font.lower() or font_lower in sys_font.lower():
-                    system_fonts.add(font)
-                    found_system = True
-                    break
-            
-            if not found_system:
-                # Check for common commercial font patterns
-                if any(commercial in font_lower for commercial in ['adobe', 'linotype', 'monotype', 'myfonts']):
-                    commercial_fonts.add(font)
-                else:
-                    # Assume potentially free (could be found in Google Fonts, etc.)
-                    free_fonts.add(font)
-        
-        return system_fonts, commercial_fonts, free_fonts
+        East Asian and complex-script text is credited to the run's a:ea or
+        a:cs font (or the theme's ea/cs slot) rather than its latin font.
+        
+        Returns:
+            The text of the run
+        """
+        text = ''.join(t.text or '' for t in run.iter(A_T))
+        scheme = 'mj' if placeholder in TITLE_PLACEHOLDERS else 'mn'
+        typefaces = {script: f"+{scheme}-{script}" for script in THEME_SCRIPT_SLOTS.values()}
+        bold = italic = False
+        
+        run_properties = run.find(A_RPR)
+        if run_properties is not None:
+            for tag, script in THEME_SCRIPT_SLOTS.items():
+                font = run_properties.find(tag)
+                if font is not None and font.get('typeface'):
+                    typefaces[script] = font.get('typeface')
+            bold = run_properties.get('b') in ('1', 'true')
+            italic = run_properties.get('i') in ('1', 'true')
+        
+        typefaces = {script: theme_fonts.get(typeface, typeface) for script, typeface in typefaces.items()}
+        run_text = {}
+        for script, piece in _split_scripts(text) or [('lt', '')]:
+            typeface = typefaces[script]
+            if typeface in THEME_FONT_TOKENS:
+                # No ea/cs font in the run or theme: PowerPoint falls back from the latin font
+                typeface = typefaces['lt']
+            if typeface and typeface not in THEME_FONT_TOKENS:
+                run_text[typeface] = run_text.get(typeface, '') + piece
+        
+        for typeface, piece in run_text.items():
+            stats = usage.get(typeface)
+            if stats is None:
+                stats = usage[typeface] = {
+                    'slides': set(), 'runs': 0, 'characters': 0,
+                    'bold': False, 'italic': False, 'styles': set()
+                }
+            stats['slides'].add(slide_number)
+            stats['runs'] += 1
+            stats['characters'] += len(piece)
+            stats['bold'] = stats['bold'] or bold
+            stats['italic'] = stats['italic'] or italic
+            stats['styles'].add(RUN_STYLES[bold, italic])
+            characters.setdefault(typeface, set()).update(piece)
+        return text
+    
+    def _categorize_fonts(self, fonts: Set[str]) -> tuple:
+        """Categorize fonts into system, commercial, and potentially free fonts."""
+        # The font database is loaded once per process and memoizes lookups
+        return get_font_database().categorize(fonts)
     
     def extract_from_keynote(self, keynote_path: str) -> Dict[str, List[str]]:
         """
@@ -204,20 +412,21 @@ class FontExtractor:
             raise FileNotFoundError(f"File not found: {keynote_path}")
         
         # Create output folder for this presentation
-        output_folder = self.output_dir / keynote_path.stem
+        output_folder = self._output_folder(keynote_path)
         output_folder.mkdir(exist_ok=True, parents=True)
         
         embedded_fonts = []
+        font_blobs = {}
         referenced_fonts = set()
         
         try:
             # Keynote files can be either packages or compressed archives
             if keynote_path.is_dir():
                 # It's a package (directory)
-                self._extract_fonts_from_keynote_package(keynote_path, output_folder, embedded_fonts)
+                self._extract_fonts_from_keynote_package(keynote_path, output_folder, embedded_fonts, font_blobs)
             else:
                 # It's a compressed file
-                self._extract_fonts_from_keynote_zip(keynote_path, output_folder, embedded_fonts)
+                self._extract_fonts_from_keynote_zip(keynote_path, output_folder, embedded_fonts, font_blobs)
             
             # Try to extract font references from the Index files
             referenced_fonts = self._extract_font_references_from_keynote(keynote_path)
@@ -225,145 +434,250 @@ class FontExtractor:
         except Exception as e:
             print(f"Error extracting fonts from {keynote_path}: {e}")
         
+        self._record_font_blobs(keynote_path, font_blobs)
+        embedded_font_info = self._describe_embedded_fonts(embedded_fonts, output_folder)
+        
         # Categorize fonts by type
         system_fonts, commercial_fonts, free_fonts = self._categorize_fonts(referenced_fonts)
         
         return {
             'embedded_fonts': embedded_fonts,
+            'embedded_font_info': embedded_font_info,
+            'font_blobs': {name: info['sha256'] for name, info in font_blobs.items()},
             'referenced_fonts': sorted(list(referenced_fonts)),
+            'font_usage': {},  # run-level statistics are only available for .pptx
+            'font_codepoints': {},
+            'slide_text': [],
             'system_fonts': sorted(list(system_fonts)),
             'commercial_fonts': sorted(list(commercial_fonts)),
             'free_fonts': sorted(list(free_fonts)),
             'output_folder': str(output_folder)
         }
     
-    def _extract_fonts_from_keynote_package(self, package_path: Path, output_folder: Path, embedded_fonts: List[str]):
+    def _extract_fonts_from_keynote_package(self, package_path: Path, output_folder: Path, embedded_fonts: List[str],
+                                            font_blobs: Optional[Dict[str, Dict]] = None):
         """Extract fonts from a Keynote package directory."""
         # Look for Data directory which might contain fonts
         data_dir = package_path / "Data"
         if data_dir.exists():
             for font_file in data_dir.glob("*.ttf"):
-                output_path = output_folder / font_file.name
-                shutil.copy2(font_file, output_path)
+                output_path = self._save_file_font(font_file, output_folder, font_blobs)
                 embedded_fonts.append(str(output_path))
             
             for font_file in data_dir.glob("*.otf"):
-                output_path = output_folder / font_file.name
-                shutil.copy2(font_file, output_path)
+                output_path = self._save_file_font(font_file, output_folder, font_blobs)
                 embedded_fonts.append(str(output_path))
     
-    def _extract_fonts_from_keynote_zip(self, keynote_path: Path, output_folder: Path, embedded_fonts: List[str]):
+    def _extract_fonts_from_keynote_zip(self, keynote_path: Path, output_folder: Path, embedded_fonts: List[str],
+                                        font_blobs: Optional[Dict[str, Dict]] = None):
         """Extract fonts from a compressed Keynote file."""
         try:
             with zipfile.ZipFile(keynote_path, 'r') as zip_ref:
                 # Look for font files in the archive
-                font_files = [f for f in zip_ref.namelist() 
-                             if f.endswith(('.ttf', '.otf', '.TTF', '.OTF'))]
+                font_files = [info for info in zip_ref.infolist()
+                              if info.filename.endswith(('.ttf', '.otf', '.TTF', '.OTF'))]
                 
-                for font_file in font_files:
-                    font_name = os.path.basename(font_file)
-                    output_path = output_folder / font_name
-                    
-                    with zip_ref.open(font_file) as source:
-                        with open(output_path, 'wb') as target:
-                            shutil.copyfileobj(source, target)
-                    
+                for font_info in font_files:
+                    output_path = self._save_zip_font(zip_ref, font_info, output_folder, font_blobs)
                     embedded_fonts.append(str(output_path))
         
         except zipfile.BadZipFile:
             print(f"Warning: {keynote_path} is not a valid zip file")
-    
-    def _extract_font_references_from_keynote(self, keynote_path: Path) -> Set[str]:
-        """Extract font names referenced in Keynote files."""
-        fonts = set()
-        
+
+    def extract_from_pdf(self, pdf_path: str, extract_embedded: bool = False) -> Dict[str, List[str]]:
+        """
+        Find the fonts of a PDF (e.g. a presentation exported by the speaker).
+
+        Only the page tree and the resource and font dictionaries are read;
+        pages are never rendered and content streams never loaded.
+
+        Args:
+            pdf_path: Path to the .pdf file
+            extract_embedded: Also save the embedded font programs (usually
+                subsets with only the glyphs the document uses)
+
+        Returns:
+            Dictionary with 'embedded_fonts' and 'referenced_fonts' lists, plus
+            'pdf_fonts' with per-font details (embedded, subset, pages)
+        """
+        pdf_path = Path(pdf_path)
+        if not pdf_path.exists():
+            raise FileNotFoundError(f"File not found: {pdf_path}")
+
+        output_folder = self._output_folder(pdf_path)
+        output_folder.mkdir(exist_ok=True, parents=True)
+
+        embedded_fonts = []
+        font_blobs = {}
+        pdf_fonts = []
+
         try:
-            # Keynote files can be either packages (directories) or compressed archives
-            if keynote_path.is_dir():
-                # It's a package directory - look for Index files
-                index_files = list(keynote_path.rglob("Index"))
-                for index_file in index_files:
-                    self._parse_keynote_index_file(index_file, fonts)
+            scanner = PDFFontScanner(pdf_path)
+            if extract_embedded:
+                pdf_fonts, programs = scanner.extract()
+                for filename, data in programs:
+                    output_path = output_folder / filename
+                    digest = self._save_decoded_font(data, output_path)
+                    if digest is not None:
+                        font_blobs[filename] = {'sha256': digest, 'size': len(data), 'crc32': None}
+                    embedded_fonts.append(str(output_path))
             else:
-                # It's a compressed file - extract and look for Index files
+                pdf_fonts = scanner.scan()
+
+        except Exception as e:
+            print(f"Error extracting fonts from {pdf_path}: {e}")
+
+        self._record_font_blobs(pdf_path, font_blobs)
+        embedded_font_info = self._describe_embedded_fonts(embedded_fonts, output_folder)
+
+        referenced_fonts = {font['name'] for font in pdf_fonts}
+        system_fonts, commercial_fonts, free_fonts = self._categorize_fonts(referenced_fonts)
+
+        return {
+            'embedded_fonts': embedded_fonts,
+            'embedded_font_info': embedded_font_info,
+            'font_blobs': {name: info['sha256'] for name, info in font_blobs.items()},
+            'referenced_fonts': sorted(referenced_fonts),
+            'font_usage': {},  # text runs would need the content streams
+            'font_codepoints': {},
+            'slide_text': [],
+            'pdf_fonts': [{key: font[key] for key in ('name', 'subtype', 'embedded', 'subset', 'pages')}
+                          for font in pdf_fonts],
+            'system_fonts': sorted(list(system_fonts)),
+            'commercial_fonts': sorted(list(commercial_fonts)),
+            'free_fonts': sorted(list(free_fonts)),
+            'output_folder': str(output_folder)
+        }
+
+    def _save_zip_font(self, zip_ref: zipfile.ZipFile, info: zipfile.ZipInfo, output_folder: Path,
+                       font_blobs: Optional[Dict[str, Dict]] = None) -> Path:
+        """Save a font from a zip archive into the presentation's output folder."""
+        font_name = os.path.basename(info.filename)
+        output_path = output_folder / font_name
+        
+        if self.font_store is None:
+            with zip_ref.open(info) as source:
+                with open(output_path, 'wb') as target:
+                    shutil.copyfileobj(source, target)
+            return output_path
+        
+        digest, size = self.font_store.add_zip_member(zip_ref, info)
+        self.font_store.link_into(digest, output_path)
+        if font_blobs is not None:
+            font_blobs[font_name] = {'sha256': digest, 'size': size, 'crc32': info.CRC}
+        return output_path
+    
+    def _save_file_font(self, font_file: Path, output_folder: Path,
+                        font_blobs: Optional[Dict[str, Dict]] = None) -> Path:
+        """Save a font file from disk into the presentation's output folder."""
+        output_path = output_folder / font_file.name
+        
+        if self.font_store is None:
+            shutil.copy2(font_file, output_path)
+            return output_path
+        
+        digest, size = self.font_store.add_file(font_file)
+        self.font_store.link_into(digest, output_path)
+        if font_blobs is not None:
+            font_blobs[font_file.name] = {'sha256': digest, 'size': size, 'crc32': None}
+        return output_path
+    
+    def _output_folder(self, source_path: Path) -> Path:
+        """Folder for a presentation's fonts, named after it (see file_discovery.output_name)."""
+        with self._output_names_lock:
+            return self.output_dir / output_name(source_path, self._output_names)
+    
+    def _describe_embedded_fonts(self, embedded_fonts: List[str], output_folder: Path) -> List[Dict]:
+        """
+        Identify each embedded font by its name and OS/2 tables.
+        
+        Wrapped or obfuscated fonts (EOT .fntdata, .odttf) that can be decoded
+        are also saved as plain font files next to the originals.
+        """
+        described = []
+        
+        for font_path in embedded_fonts:
+            font_path = Path(font_path)
+            try:
+                info, plain = decode_embedded_font(font_path)
+            except Exception as e:
+                print(f"Warning: Could not read font {font_path.name}: {e}")
+                continue
+            
+            if info is None:
+                described.append({'file': font_path.name, 'family': None})
+                continue
+            
+            entry = {'file': font_path.name}
+            entry.update(info)
+            
+            if plain is not None:
+                extension = '.otf' if info.get('outlines') == 'cff' else '.ttf'
+                stem = re.sub(r'[^\w\s-]', '', f"{info['family']}-{info['style']}").strip().replace(' ', '_')
+                decoded_path = output_folder / f"{stem}{extension}"
                 try:
-                    with zipfile.ZipFile(keynote_path, 'r') as zip_ref:
-                        index_files = [f for f in zip_ref.namelist() if f.endswith('Index')]
-                        for index_file in index_files:
-                            try:
-                                with zip_ref.open(index_file) as f:
-                                    content = f.read()
-                                    self._parse_keynote_binary_content(content, fonts)
-                            except Exception as e:
-                                continue
-                except Exception:
-                    # If it's not a zip file, try to read as binary
-                    try:
-                        with open(keynote_path, 'rb') as f:
-                            content = f.read()
-                            self._parse_keynote_binary_content(content, fonts)
-                    except Exception:
-                        pass
+                    self._save_decoded_font(plain, decoded_path)
+                    entry['decoded_path'] = str(decoded_path)
+                except OSError as e:
+                    print(f"Warning: Could not save decoded font {decoded_path.name}: {e}")
             
-            # Add common fonts that are likely to be used in presentations
-            # This is a fallback for when we can't parse the file properly
-            if not fonts:
-                common_presentation_fonts = {
-                    'Arial', 'Helvetica', 'Times New Roman', 'Georgia', 'Calibri',
-                    'Verdana', 'Tahoma', 'Trebuchet MS', 'Palatino', 'Garamond',
-                    '游ゴシック', 'Yu Gothic', 'YuGothic', 'Hiragino Sans',
-                    'PingFang SC', 'STSong', 'Montserrat', 'Open Sans', 'Lato',
-                    'Roboto', 'DM Sans', 'Source Sans Pro'
-                }
-                fonts.update(common_presentation_fonts)
+            described.append(entry)
         
-        except Exception as e:
-            print(f"Warning: Error extracting font references from Keynote: {e}")
+        return described
+    
+    def _save_decoded_font(self, data: bytes, output_path: Path) -> Optional[str]:
+        """
+        Save decoded font bytes, through the font store when enabled.
         
-        return fonts
+        Returns:
+            The SHA-256 of the stored blob, or None without a font store
+        """
+        if self.font_store is None:
+            with open(output_path, 'wb') as f:
+                f.write(data)
+            return None
+        
+        digest, _ = self.font_store.add_stream(BytesIO(data))
+        self.font_store.link_into(digest, output_path)
+        return digest
     
-    def _parse_keynote_index_file(self, index_file: Path, fonts: Set[str]):
-        """Parse a Keynote Index file for font references."""
+    def _record_font_blobs(self, presentation_path: Path, font_blobs: Dict[str, Dict]):
+        """Record which stored font blobs a presentation uses."""
+        if self.font_store is None or not font_blobs:
+            return
         try:
-            with open(index_file, 'rb') as f:
-                content = f.read()
-                self._parse_keynote_binary_content(content, fonts)
-        except Exception:
-            pass
+            self.font_store.record_deck(str(presentation_path.absolute()), font_blobs)
+        except OSError as e:
+            print(f"Warning: Could not update font manifest: {e}")
     
-    def _parse_keynote_binary_content(self, content: bytes, fonts: Set[str]):
-        """Parse binary content for font names."""
-        # Convert to string and look for font-like patterns
+    def _extract_font_references_from_keynote(self, keynote_path: Path) -> Set[str]:
+        """Extract font names referenced in Keynote files."""
+        fonts = set()
+        archives_found = False
+        
         try:
-            # Try different encodings
-            for encoding in ['utf-8', 'utf-16', 'latin1']:
-                try:
-                    text = content.decode(encoding, errors='ignore')
-                    self._extract_font_names_from_text(text, fonts)
-                    break
-                except:
-                    continue
-        except Exception:
-            pass
-    
-    def _extract_font_names_from_text(self, text: str, fonts: Set[str]):
-        """Extract font names from text content."""
-        # Look for common font patterns
-        import re
+            # Read the character/paragraph style records from the IWA archives
+            for record in KeynoteArchive(keynote_path).font_records():
+                archives_found = True
+                fonts.add(record['font_name'])
+        except zipfile.BadZipFile:
+            print(f"Warning: {keynote_path} is not a valid zip file")
+        except Exception as e:
+            print(f"Warning: Error extracting font references from Keynote: {e}")
         
-        # Pattern for font names (letters, numbers, spaces, hyphens)
-        font_pattern = r'\b[A-Za-z][A-Za-z0-9\s\-\.]{2,30}\b'
-        potential_fonts = re.findall(font_pattern, text)
+        # Add common fonts that are likely to be used in presentations
+        # This is a fallback for when we can't parse the file properly
+        if not fonts and not archives_found:
+            common_presentation_fonts = {
+                'Arial', 'Helvetica', 'Times New Roman', 'Georgia', 'Calibri',
+                'Verdana', 'Tahoma', 'Trebuchet MS', 'Palatino', 'Garamond',
+                '游ゴシック', 'Yu Gothic', 'YuGothic', 'Hiragino Sans',
+                'PingFang SC', 'STSong', 'Montserrat', 'Open Sans', 'Lato',
+                'Roboto', 'DM Sans', 'Source Sans Pro'
+            }
+            fonts.update(common_presentation_fonts)
         
-        for potential_font in potential_fonts:
-            potential_font = potential_font.strip()
-            
-            # Filter out obvious non-fonts
-            if (len(potential_font) > 2 and 
-                not potential_font.lower() in ['the', 'and', 'for', 'with', 'this', 'that', 'from', 'have', 'will', 'been', 'they', 'said', 'each', 'which', 'their', 'time', 'would', 'there', 'could', 'other', 'after', 'first', 'well', 'also', 'new', 'want', 'because', 'any', 'these', 'give', 'day', 'may', 'most', 'over', 'think', 'too', 'just', 'like', 'back', 'here', 'much', 'before', 'right', 'good', 'very', 'make', 'into', 'more', 'only', 'some', 'could', 'them', 'than', 'then', 'its', 'who', 'oil', 'now', 'find', 'long', 'down', 'day', 'did', 'get', 'has', 'him', 'his', 'how', 'man', 'new', 'now', 'old', 'see', 'two', 'way', 'who', 'boy', 'did', 'its', 'let', 'put', 'say', 'she', 'too', 'use'] and
-                not re.match(r'^\d+$', potential_font) and  # Not just numbers
-                not re.match(r'^[A-Z]{2,}$', potential_font)):  # Not all caps acronyms
-                fonts.add(potential_font)
+        return fonts
 
 
 def extract_fonts_from_file(file_path: str, output_dir: str = "extracted_fonts") -> Dict[str, any]:
@@ -371,7 +685,7 @@ def extract_fonts_from_file(file_path: str, output_dir: str = "extracted_fonts")
     Convenience function to extract fonts from a presentation file.
     
     Args:
-        file_path: Path to the presentation file (.pptx or .key)
+        file_path: Path to the presentation file (.pptx, .key or .pdf)
         output_dir: Directory to save extracted fonts
         
     Returns:
@@ -384,6 +698,37 @@ def extract_fonts_from_file(file_path: str, output_dir: str = "extracted_fonts")
         return extractor.extract_from_pptx(str(file_path))
     elif file_path.suffix.lower() in ['.key', '.keynote']:
         return extractor.extract_from_keynote(str(file_path))
+    elif file_path.suffix.lower() == '.pdf':
+        return extractor.extract_from_pdf(str(file_path), extract_embedded=True)
     else:
         raise ValueError(f"Unsupported file format: {file_path.suffix}")
 
+
+
+def merge_font_usage(totals: Dict[str, Dict], font_usage: Dict[str, Dict]) -> Dict[str, Dict]:
+    """
+    Add one presentation's font usage to totals across several presentations.
+    
+    Args:
+        totals: Running totals, updated in place
+        font_usage: The 'font_usage' entry of an extraction result
+        
+    Returns:
+        The updated totals, with 'decks', 'slides' (slide appearances),
+        'runs', 'characters', 'bold', 'italic' and 'styles' per font
+    """
+    for font, stats in font_usage.items():
+        total = totals.setdefault(font, {
+            'decks': 0, 'slides': 0, 'runs': 0, 'characters': 0,
+            'bold': False, 'italic': False, 'styles': []
+        })
+        total['decks'] += 1
+        total['slides'] += len(stats['slides'])
+        total['runs'] += stats['runs']
+        total['characters'] += stats['characters']
+        total['bold'] = total['bold'] or stats['bold']
+        total['italic'] = total['italic'] or stats['italic']
+        total['styles'] = [style for style in RUN_STYLES.values()
+                           if style in total['styles'] or style in stats['styles']]
+    
+    return totals
@@ -5,11 +5,24 @@ Searches across 10 major free font sources and generates acquisition reports.
 
 import os
 import re
-import requests
+import shutil
 from pathlib import Path
-from typing import List, Dict, Set, Optional, Tuple
-from urllib.parse import quote_plus
+from typing import Iterator, List, Dict, Set, Optional, Tuple
+from urllib.parse import quote_plus, urlsplit
 import time
+import threading
+from concurrent.futures import ThreadPoolExecutor, as_completed
+
+from download_cache import FontDownloadCache, get_download_cache
+from font_database import SYSTEM, get_font_database, normalize_font_name
+from font_info import read_font_info
+from font_mirror import FontMirror, get_font_mirror
+from font_names import WEIGHT_WORDS, collapse_font_queries, requested_variants
+from font_registry import FreeFontRegistry, get_free_font_registry
+from hunt_cache import HuntResultCache, get_hunt_result_cache
+from installed_fonts import InstalledFonts, get_installed_fonts
+from google_fonts_catalog import GoogleFontsCatalog, get_google_fonts_catalog, parse_variant, variant_key
+from http_client import DEFAULT_MAX_PER_HOST, DEFAULT_RATE_LIMIT, HTTPClient, stats_delta
 
 
 class FontRepository:
@@ -50,22 +63,133 @@ COMMERCIAL_MARKETPLACES = [
 ]
 
 
+# CSS weight -> style name used in downloaded file names
+WEIGHT_NAMES = {
+    100: 'Thin', 200: 'ExtraLight', 300: 'Light', 400: 'Regular', 500: 'Medium',
+    600: 'SemiBold', 700: 'Bold', 800: 'ExtraBold', 900: 'Black',
+}
+
+
+def _parse_style(style: str) -> Tuple[int, bool]:
+    """Read (weight, italic) from normalized style words ('semibolditalic' -> (600, True))."""
+    weight = next((value for word, value in WEIGHT_WORDS if word in style), 400)
+    return weight, 'italic' in style or 'oblique' in style
+
+
+def _closest_variant(weight: int, italic: bool, available: List[str]) -> str:
+    """Pick the available variant nearest to (weight, italic), keeping the slant if possible."""
+    wanted = variant_key(weight, italic)
+    if wanted in available:
+        return wanted
+
+    def distance(variant):
+        variant_weight, variant_italic = parse_variant(variant)
+        # Like CSS font matching: heavier for bold requests, lighter for light ones
+        heavier_first = variant_weight < weight if weight > 400 else variant_weight > weight
+        return variant_italic != italic, abs(variant_weight - weight), heavier_first
+    return min(available, key=distance)
+
+
+def _variant_file_name(family: str, variant: str, url: str) -> str:
+    """File name for a downloaded variant: Open_Sans-SemiBoldItalic.ttf."""
+    weight, italic = parse_variant(variant)
+    style = WEIGHT_NAMES.get(weight, str(weight))
+    if italic:
+        style = 'Italic' if weight == 400 else f"{style}Italic"
+    safe_name = re.sub(r'[^\w\s-]', '', family).strip().replace(' ', '_')
+    extension = Path(urlsplit(url).path).suffix.lower() or '.ttf'
+    return f"{safe_name}-{style}{extension}"
+
+
 class FontHunter:
     """Hunt for fonts across multiple free repositories."""
     
-    def __init__(self, api_key: Optional[str] = None, output_dir: str = "hunted_fonts"):
+    def __init__(self, api_key: Optional[str] = None, output_dir: str = "hunted_fonts",
+                 catalog: Optional[GoogleFontsCatalog] = None, api_url: Optional[str] = None,
+                 max_workers: int = 8, max_per_host: int = DEFAULT_MAX_PER_HOST,
+                 http: Optional[HTTPClient] = None, download_cache: Optional[FontDownloadCache] = None,
+                 mirror: Optional[FontMirror] = None, installed_fonts: Optional[InstalledFonts] = None,
+                 skip_installed: bool = True, result_cache: Optional[HuntResultCache] = None,
+                 refresh_results: bool = False, registry: Optional[FreeFontRegistry] = None,
+                 deadline: Optional[float] = None, rate_limit: Optional[float] = DEFAULT_RATE_LIMIT):
+        """
+        Args:
+            api_key: Google Fonts API key (defaults to $GOOGLE_FONTS_API_KEY)
+            output_dir: Folder for project folders and reports
+            catalog: Google Fonts catalog to use instead of the shared one
+            api_url: Webfonts API endpoint (defaults to $GOOGLE_FONTS_API_URL
+                or the Google Fonts API)
+            max_workers: Fonts hunted at the same time
+            max_per_host: Concurrent requests allowed per host
+            http: HTTP client to use instead of a new pooled one
+            download_cache: Font download cache to use instead of the shared
+                user-wide one
+            mirror: Local font mirror searched before Google Fonts (defaults
+                to the one in $FONT_MIRROR_DIR, if set)
+            installed_fonts: Installed font inventory to use instead of the
+                shared one over the system font directories
+            skip_installed: Don't hunt fonts that are installed on this machine
+            result_cache: Hunt result cache to use instead of the shared
+                user-wide one
+            refresh_results: Search again instead of reusing remembered
+                results (the new results are still remembered)
+            registry: Free font registry to use instead of the shared one
+                (data/free_font_registry.json plus $FREE_FONT_REGISTRY)
+            deadline: Seconds a whole hunt may spend on network requests;
+                fonts not resolved in time fall back to search links
+            rate_limit: Requests per second per host for the new HTTP
+                client (None for no limit)
+        """
         self.api_key = api_key or os.getenv('GOOGLE_FONTS_API_KEY')
         self.output_dir = Path(output_dir)
         self.output_dir.mkdir(exist_ok=True, parents=True)
-        self.google_fonts_cache = None
+        # Shared by all hunters in the process and cached on disk between runs
+        self.catalog = catalog or get_google_fonts_catalog(api_url)
+        self.max_workers = max(1, max_workers)
+        self.http = http or HTTPClient(max_per_host=max_per_host, rate_limit=rate_limit)
+        self.deadline = deadline
+        self._deadline = None
+        # Fonts downloaded by any project are linked from here instead of fetched again
+        self.download_cache = download_cache or get_download_cache()
+        # Needs no network or API key, so offline machines still get fonts
+        self.mirror = mirror or get_font_mirror()
+        self.installed_fonts = (installed_fonts or get_installed_fonts()) if skip_installed else None
+        # Outcomes of earlier hunts, including "commercial", so recurring names need no requests
+        self.result_cache = result_cache or get_hunt_result_cache()
+        self.refresh_results = refresh_results
+        self.registry = registry or get_free_font_registry()
+        # Fonts found under several names are downloaded once per hunt
+        self._download_locks = {}
+        self._download_locks_guard = threading.Lock()
     
-    def hunt_fonts(self, font_names: List[str], project_name: str = "fonts") -> Dict:
+    def hunt_fonts(self, font_names: List[str], project_name: str = "fonts",
+                   available_fonts: Optional[List[Dict]] = None,
+                   font_usage: Optional[Dict[str, Dict]] = None,
+                   theme_fallback_fonts: Optional[Set[str]] = None) -> Dict:
         """
         Hunt for a list of fonts across all repositories.
         
+        Fonts that are already satisfied, by the presentations' embedded
+        fonts, by fonts previously downloaded into the project or by fonts
+        installed on this machine, are skipped before any network request
+        is made. So are operating system fonts named only in the theme's
+        per-script fallback lists (theme_fallback_fonts).
+        
+        The remaining names are grouped by family ("Montserrat SemiBold" and
+        "Montserrat-Bold" are both Montserrat), and each family is hunted
+        once for all the weights and styles its names and text runs need.
+        
         Args:
             font_names: List of font names to find
             project_name: Name for the output folder
+            available_fonts: Font info dicts (see font_info.read_font_info) of
+                fonts the presentations already embed
+            font_usage: Usage statistics per font name (see
+                font_extractor.merge_font_usage); the most used fonts are
+                hunted first and the report shows where each font is used
+            theme_fallback_fonts: Fonts the presentations name only in their
+                themes' <a:font script=...> fallback lists (see
+                FontExtractor.extract_from_pptx)
             
         Returns:
             Dictionary with results categorized by source
@@ -80,33 +204,96 @@ class FontHunter:
             'google_fonts_downloaded': [],
             'free_fonts_found': [],
             'commercial_fonts': [],
+            'already_available': [],
             'not_found': [],
+            'font_usage': font_usage or {},
             'project_folder': str(project_folder)
         }
         
-        print(f"\n🔍 Hunting for {len(font_names)} fonts across 10 repositories...\n")
+        available = self._index_available_fonts(available_fonts or [], 'embedded')
+        for key, entry in self._index_available_fonts(self._scan_downloaded_fonts(fonts_folder), 'downloaded').items():
+            available.setdefault(key, entry)
+        if self.installed_fonts:
+            # Cheap after the first run: only changed font folders are re-read
+            installed = self.installed_fonts.fonts(revalidate=True)
+            for key, entry in self._index_available_fonts(installed, 'installed').items():
+                available.setdefault(key, entry)
         
-        for i, font_name in enumerate(font_names, 1):
-            print(f"[{i}/{len(font_names)}] Searching for '{font_name}'...")
-            
-            # Try Google Fonts first (can auto-download)
-            google_result = self._search_google_fonts(font_name, fonts_folder)
-            if google_result:
-                results['google_fonts_downloaded'].append(google_result)
-                print(f"  ✅ Found and downloaded from Google Fonts")
-                continue
-            
-            # Search other free repositories
-            free_repo_result = self._search_free_repositories(font_name)
-            if free_repo_result:
-                results['free_fonts_found'].append(free_repo_result)
-                print(f"  ✅ Found on {free_repo_result['repository']}")
-                continue
-            
-            # Not found in free repos - likely commercial
-            commercial_result = self._create_commercial_entry(font_name)
-            results['commercial_fonts'].append(commercial_result)
-            print(f"  ⚠️  Not found in free repositories (likely commercial)")
+        database = get_font_database()
+        theme_fallback_fonts = set(theme_fallback_fonts or ())
+        remaining = []
+        for font_name in font_names:
+            match = available.get(normalize_font_name(font_name))
+            if match:
+                results['already_available'].append({
+                    'font_name': font_name,
+                    'family': match['family'],
+                    'source': match['source'],
+                    'file': match.get('file')
+                })
+            elif font_name in theme_fallback_fonts and database.match(font_name)['category'] == SYSTEM:
+                # Only listed as the theme's fallback for another script ("Angsana New", "DaunPenh")
+                results['already_available'].append({
+                    'font_name': font_name,
+                    'family': database.match(font_name)['family'] or font_name,
+                    'source': 'system',
+                    'file': None
+                })
+            else:
+                remaining.append(font_name)
+        
+        if results['already_available']:
+            print(f"\n✅ {len(results['already_available'])} font(s) already available (embedded, downloaded, installed or system), skipping")
+        
+        # "Montserrat", "Montserrat-Bold" and "Montserrat SemiBold" are one family to look up
+        queries = {query['family']: query for query in collapse_font_queries(remaining, font_usage)}
+        family_usage = {}
+        for family, query in queries.items():
+            family_usage[family] = dict(query['usage'] or {}, variants=query['variants'])
+        # Usage added up over all names of each hunted family, for the report
+        results['family_usage'] = {family: query['usage'] for family, query in queries.items() if query['usage']}
+        font_names = list(queries)
+        
+        if font_usage:
+            # Hunt the most heavily used fonts first
+            font_names = sorted(font_names, key=lambda name: (-family_usage[name].get('characters', 0),
+                                                              -family_usage[name].get('runs', 0)))
+        
+        collapsed = f" ({len(remaining)} names)" if len(remaining) != len(font_names) else ""
+        print(f"\n🔍 Hunting for {len(font_names)} font families{collapsed} across 10 repositories...\n")
+        
+        # Results arrive in completion order; the report keeps the hunt order
+        found = {}
+        http_before = self.http.stats()
+        hunted = self.iter_hunt(font_names, fonts_folder, family_usage)
+        for i, (font_name, category, result) in enumerate(hunted, 1):
+            result['searched_names'] = queries[font_name]['names']
+            found[font_name] = (category, result)
+            remembered = " (remembered from an earlier hunt)" if result.get('remembered') else ""
+            names = queries[font_name]['names']
+            covers = f" ({', '.join(names)})" if names != [font_name] else ""
+            print(f"[{i}/{len(font_names)}] '{font_name}'{covers}{remembered}")
+            if result.get('google_error'):
+                print(f"  ⚠️  Google Fonts unavailable: {result['google_error']}")
+            if result.get('error'):
+                print(f"  ⚠️  Hunt failed: {result['error']}")
+            if category == 'google_fonts_downloaded':
+                print(f"  ✅ Found and downloaded from {result['repository']}")
+            elif category == 'free_fonts_found':
+                print(f"  ✅ Found on {result['repository']}")
+            else:
+                print(f"  ⚠️  Not found in free repositories (likely commercial)")
+        
+        for font_name in font_names:
+            category, result = found[font_name]
+            results[category].append(result)
+        
+        results['http_stats'] = stats_delta(http_before, self.http.stats())
+        totals = results['http_stats']['totals']
+        if totals['retries'] or totals['errors'] or totals['fast_failures']:
+            print(f"\n🌐 {totals['requests']} request(s), {totals['retries']} retried, {totals['errors']} failed, "
+                  f"{totals['fast_failures']} skipped while a server was failing "
+                  f"(average {totals['latency_avg']:.2f}s)")
         
         # Generate HTML report
         report_path = self._generate_html_report(results, project_folder)
@@ -114,136 +301,322 @@ class FontHunter:
         
         return results
     
-    def _search_google_fonts(self, font_name: str, output_folder: Path) -> Optional[Dict]:
-        """Search Google Fonts API and download if found."""
-        if not self.api_key:
+    def iter_hunt(self, font_names: List[str], fonts_folder: Path,
+                  font_usage: Optional[Dict[str, Dict]] = None) -> Iterator[Tuple[str, str, Dict]]:
+        """
+        Hunt fonts concurrently and yield each result as soon as it is ready.
+        
+        Args:
+            font_names: Font names to hunt, most important first
+            fonts_folder: Folder for downloaded fonts
+            font_usage: Usage statistics per font name; the styles used
+                (bold, italic), or an explicit 'variants' list of (weight,
+                italic) pairs, decide which variants are downloaded
+            
+        Yields:
+            Tuples of (font name, results category, result), where the
+            category is 'google_fonts_downloaded', 'free_fonts_found' or
+            'commercial_fonts'; a font whose hunt raised is yielded as
+            commercial with the exception text under 'error'
+        """
+        fonts_folder.mkdir(exist_ok=True, parents=True)
+        # One deadline for the whole hunt, shared by every request of every worker
+        self._deadline = time.monotonic() + self.deadline if self.deadline else None
+        if self.mirror:
+            # Index the mirror once here rather than in the first worker that needs it
+            try:
+                self.mirror.index()
+            except OSError as e:
+                print(f"Warning: Could not index the font mirror: {e}")
+        with ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix='font-hunter') as pool:
+            futures = {pool.submit(self._hunt_font, font_name, fonts_folder, (font_usage or {}).get(font_name)):
+                       font_name for font_name in font_names}
+            for future in as_completed(futures):
+                font_name = futures[future]
+                try:
+                    category, result = future.result()
+                except Exception as e:
+                    # One failing font must not abort the hunt; offer the marketplace searches instead
+                    print(f"Warning: Hunting '{font_name}' failed: {e}")
+                    category, result = 'commercial_fonts', self._create_commercial_entry(font_name)
+                    result['error'] = str(e)
+                yield font_name, category, result
+    
+    def _hunt_font(self, font_name: str, fonts_folder: Path, usage: Optional[Dict] = None) -> Tuple[str, Dict]:
+        """Find one font: local mirror and Google Fonts first (can auto-download), then free repositories."""
+        if self.mirror:
+            mirror_result = self._search_mirror(font_name, fonts_folder, usage)
+            if mirror_result:
+                return 'google_fonts_downloaded', mirror_result
+        
+        if self.result_cache and not self.refresh_results:
+            remembered = self._replay_result(font_name, fonts_folder, usage)
+            if remembered:
+                return remembered
+        
+        match = self._lookup_google_font(font_name)
+        google_error = match.get('error') if match else None
+        if match and match['item']:
+            google_result = self._download_google_font(font_name, match, fonts_folder, usage)
+            if google_result:
+                self._remember(font_name, 'google_fonts_downloaded', {
+                    'item': match['item'],
+                    'match': {key: match[key] for key in ('match', 'score', 'reason', 'candidates', 'style')}
+                })
+                return 'google_fonts_downloaded', google_result
+            google_error = f"found {match['item']['family']} but could not download its files"
+        # Only a catalog that answered "no such family" makes the outcome worth remembering;
+        # a timeout or a rate limited API says nothing about the font
+        definitive = match is not None and match['item'] is None and not google_error
+        
+        free_repo_result = self._search_free_repositories(font_name)
+        if free_repo_result:
+            if definitive:
+                self._remember(font_name, 'free_fonts_found', free_repo_result)
+            elif google_error:
+                free_repo_result['google_error'] = google_error
+            return 'free_fonts_found', free_repo_result
+        
+        # Not found in free repos - likely commercial
+        commercial = self._create_commercial_entry(font_name)
+        if definitive:
+            self._remember(font_name, 'commercial_fonts', commercial)
+        elif google_error:
+            commercial['google_error'] = google_error
+        return 'commercial_fonts', commercial
+    
+    def _replay_result(self, font_name: str, fonts_folder: Path,
+                       usage: Optional[Dict] = None) -> Optional[Tuple[str, Dict]]:
+        """Reuse a remembered outcome; Google families are re-linked from the download cache."""
+        remembered = self.result_cache.get(font_name, self.catalog.api_url)
+        if remembered is None:
             return None
+        category, result = remembered
+        if category == 'google_fonts_downloaded':
+            result = self._download_google_font(font_name, result['match'], fonts_folder, usage,
+                                                item=result['item'])
+            if result is None:
+                return None
+        result['remembered'] = True
+        return category, result
+    
+    def _remember(self, font_name: str, category: str, result: Dict):
+        if self.result_cache:
+            try:
+                self.result_cache.put(font_name, self.catalog.api_url, category, result)
+            except Exception as e:
+                print(f"    Could not remember the result for {font_name}: {e}")
+    
+    def _download(self, url: str) -> Optional[bytes]:
+        """Download a font file; None if the server did not return it."""
+        response = self.http.get(url, deadline=self._deadline)
+        if response.status_code != 200:
+            return None
+        return response.content
+    
+    def _download_lock(self, key: str) -> threading.Lock:
+        with self._download_locks_guard:
+            return self._download_locks.setdefault(key, threading.Lock())
+    
+    def _scan_downloaded_fonts(self, fonts_folder: Path) -> List[Dict]:
+        """Read family names of fonts already downloaded into the project."""
+        found = []
+        for font_file in fonts_folder.iterdir():
+            if font_file.suffix.lower() not in ('.ttf', '.otf'):
+                continue
+            info = read_font_info(font_file)
+            if info:
+                info['file'] = str(font_file)
+                found.append(info)
+        return found
+    
+    def _index_available_fonts(self, fonts: List[Dict], source: str) -> Dict[str, Dict]:
+        """Map every name a font can be referenced by to its family."""
+        index = {}
+        for info in fonts:
+            family = info.get('family')
+            if not family:
+                continue
+            entry = {'family': family, 'source': source, 'file': info.get('file')}
+            names = [family, info.get('full_name'), info.get('postscript_name')]
+            if info.get('style'):
+                names.append(f"{family} {info['style']}")
+            for name in names:
+                if name:
+                    index.setdefault(normalize_font_name(name), entry)
+        return index
+    
+    def _lookup_google_font(self, font_name: str) -> Optional[Dict]:
+        """
+        Match a font name against the Google Fonts catalog.
         
+        Returns:
+            The CatalogIndex.lookup result (its 'item' is None when no family
+            matches), {'item': None, 'error': reason} if the catalog could
+            not be fetched, or None if there is no API key
+        """
+        if not self.api_key:
+            return None
         try:
-            # Cache the full font list
-            if self.google_fonts_cache is None:
-                api_url = f'https://www.googleapis.com/webfonts/v1/webfonts?key={self.api_key}'
-                response = requests.get(api_url, timeout=10)
-                if response.status_code == 200:
-                    self.google_fonts_cache = response.json().get('items', [])
-                else:
-                    return None
+            # Fetched at most once per TTL, even across hunters and runs
+            index = self.catalog.index(self.api_key, session=self.http.with_deadline(self._deadline))
+            if index is None:
+                return {'item': None, 'error': 'the catalog could not be fetched'}
+            return index.lookup(font_name)
+        except Exception as e:
+            print(f"    Error searching Google Fonts: {e}")
+            return {'item': None, 'error': str(e)}
+    
+    def _download_google_font(self, font_name: str, match: Dict, output_folder: Path,
+                              usage: Optional[Dict] = None, item: Optional[Dict] = None) -> Optional[Dict]:
+        """Download the wanted variants of a matched Google Fonts family."""
+        font = item or match['item']
+        try:
+            font_files = font.get('files', {})
+            if not font_files:
+                return None
+            
+            variants = self._wanted_variants(match['style'], usage, list(font_files))
+            if len(variants) > 1:
+                with ThreadPoolExecutor(max_workers=len(variants), thread_name_prefix='font-variant') as pool:
+                    fetched = list(pool.map(lambda v: self._fetch_variant(font, v, output_folder), variants))
+            else:
+                fetched = [self._fetch_variant(font, variants[0], output_folder)]
             
-            # Search for the font (case-insensitive)
-            font_name_lower = font_name.lower()
-            for font in self.google_fonts_cache:
-                if font['family'].lower() == font_name_lower or \
-                   font_name_lower in font['family'].lower():
-                    
-                    # Download the regular variant
-                    font_files = font.get('files', {})
-                    if not font_files:
-                        continue
-                    
-                    # Try to get 'regular' variant, or first available
-                    font_url = font_files.get('regular') or list(font_files.values())[0]
-                    
-                    # Download the font
-                    font_response = requests.get(font_url, timeout=10)
-                    if font_response.status_code == 200:
-                        # Save with original family name
-                        safe_name = re.sub(r'[^\w\s-]', '', font['family']).strip().replace(' ', '_')
-                        file_path = output_folder / f"{safe_name}.ttf"
-                        
-                        with open(file_path, 'wb') as f:
-                            f.write(font_response.content)
-                        
-                        return {
-                            'font_name': font['family'],
-                            'searched_name': font_name,
-                            'repository': 'Google Fonts',
-                            'file_path': str(file_path),
-                            'url': f"https://fonts.google.com/specimen/{quote_plus(font['family'])}",
-                            'variants': list(font_files.keys()),
-                            'downloaded': True
-                        }
+            files = [entry for entry in fetched if entry is not None]
+            if not files:
+                return None
+            
+            return {
+                'font_name': font['family'],
+                'searched_name': font_name,
+                'repository': 'Google Fonts',
+                'file_path': files[0]['file_path'],
+                'files': files,
+                'url': f"https://fonts.google.com/specimen/{quote_plus(font['family'])}",
+                'variants': list(font_files.keys()),
+                'downloaded_variants': [entry['variant'] for entry in files],
+                'downloaded': True,
+                'from_cache': all(entry['from_cache'] for entry in files),
+                'match': {key: match[key] for key in ('match', 'score', 'reason', 'candidates')}
+            }
         
         except Exception as e:
-            print(f"    Error searching Google Fonts: {e}")
+            print(f"    Error downloading from Google Fonts: {e}")
         
         return None
     
+    def _search_mirror(self, font_name: str, output_folder: Path,
+                       usage: Optional[Dict] = None) -> Optional[Dict]:
+        """Find a font in the local mirror and link the variants used into the project."""
+        try:
+            match = self.mirror.index().lookup(font_name)
+        except OSError as e:
+            print(f"    Error searching the font mirror: {e}")
+            return None
+        
+        font = match['item']
+        if font is None or not font['files']:
+            return None
+        
+        files = []
+        for variant in self._wanted_variants(match['style'], usage, list(font['files'])):
+            source = Path(font['files'][variant])
+            # A variable font covers several variants with one file
+            if any(entry['source'] == str(source) for entry in files):
+                continue
+            file_path = output_folder / source.name
+            with self._download_lock(str(file_path)):
+                try:
+                    if not file_path.exists():
+                        tmp_path = file_path.with_name(f".{file_path.name}.tmp")
+                        try:
+                            os.link(source, tmp_path)
+                        except OSError:
+                            shutil.copyfile(source, tmp_path)
+                        os.replace(tmp_path, file_path)
+                except OSError as e:
+                    print(f"    Could not copy {source.name} from the font mirror: {e}")
+                    continue
+            files.append({'variant': variant, 'file_path': str(file_path), 'from_cache': True,
+                          'source': str(source)})
+        
+        if not files:
+            return None
+        
+        return {
+            'font_name': font['family'],
+            'searched_name': font_name,
+            'repository': 'Local mirror',
+            'file_path': files[0]['file_path'],
+            'files': files,
+            'url': Path(files[0]['source']).parent.as_uri(),
+            'variants': font['variants'],
+            'downloaded_variants': [entry['variant'] for entry in files],
+            'downloaded': True,
+            'from_cache': True,
+            'match': {key: match[key] for key in ('match', 'score', 'reason', 'candidates')}
+        }
+    
+    def _wanted_variants(self, style: str, usage: Optional[Dict], available: List[str]) -> List[str]:
+        """Map the requested weights and slants to available Google Fonts variants."""
+        requested = (usage or {}).get('variants')
+        if not requested:
+            # From the named style and the run styles used
+            weight, italic = _parse_style(style)
+            requested = requested_variants(weight, italic, (usage or {}).get('styles'))
+        
+        variants = []
+        for weight, italic in requested:
+            variant = _closest_variant(weight, italic, available)
+            if variant not in variants:
+                variants.append(variant)
+        return variants
+    
+    def _fetch_variant(self, font: Dict, variant: str, output_folder: Path) -> Optional[Dict]:
+        """Place one variant in the project folder, from the download cache or the network."""
+        font_url = font['files'][variant]
+        file_path = output_folder / _variant_file_name(font['family'], variant, font_url)
+        
+        # Another worker may be fetching the same file for another font name
+        with self._download_lock(str(file_path)):
+            from_cache = True
+            if not file_path.exists():
+                fetched = self.download_cache.fetch(font['family'], variant, font.get('lastModified', ''),
+                                                    font_url, file_path, self._download)
+                if fetched is None:
+                    print(f"    Could not download {font['family']} {variant}")
+                    return None
+                from_cache = fetched['cached']
+        
+        return {'variant': variant, 'file_path': str(file_path), 'from_cache': from_cache}
+    
     def _search_free_repositories(self, font_name: str) -> Optional[Dict]:
         """
-        Search other free font repositories with improved detection.
-        Returns first match found.
+        Look a font up in the free font registry.
+        Returns None for names the registry does not know, so they are
+        reported (and remembered) as commercial.
         """
-        # Check specific repositories with known good fonts
-        known_free_fonts = {
-            # Font Squirrel direct links for common fonts
-            'montserrat': {
-                'repository': 'Font Squirrel',
-                'direct_url': 'https://www.fontsquirrel.com/fonts/montserrat',
-                'download_url': 'https://www.fontsquirrel.com/fonts/download/montserrat'
-            },
-            'dm sans': {
-                'repository': 'Google Fonts',
-                'direct_url': 'https://fonts.google.com/specimen/DM+Sans',
-                'download_url': 'https://fonts.google.com/download?family=DM+Sans'
-            },
-            'open sans': {
-                'repository': 'Google Fonts', 
-                'direct_url': 'https://fonts.google.com/specimen/Open+Sans',
-                'download_url': 'https://fonts.google.com/download?family=Open+Sans'
-            },
-            'lato': {
-                'repository': 'Google Fonts',
-                'direct_url': 'https://fonts.google.com/specimen/Lato',
-                'download_url': 'https://fonts.google.com/download?family=Lato'
-            },
-            'roboto': {
-                'repository': 'Google Fonts',
-                'direct_url': 'https://fonts.google.com/specimen/Roboto',
-                'download_url': 'https://fonts.google.com/download?family=Roboto'
-            }
-        }
-        
-        # Check for exact matches first
-        font_key = font_name.lower().strip()
-        if font_key in known_free_fonts:
-            return {
+        match = self.registry.lookup(font_name)
+        if match:
+            if match['match'] == 'prefix':
+                note = f"Found similar font: {match['family']} (check it is the same design)"
+            else:
+                note = 'Direct link to verified free font'
+            result = {
                 'font_name': font_name,
-                'repository': known_free_fonts[font_key]['repository'],
-                'direct_url': known_free_fonts[font_key]['direct_url'],
-                'download_url': known_free_fonts[font_key]['download_url'],
+                'repository': match['repository'],
+                'direct_url': match['direct_url'],
                 'downloaded': False,
-                'note': 'Direct link to verified free font'
+                'note': note,
+                'match': {'match': match['match'], 'score': match['score'], 'family': match['family']}
             }
+            if match['download_url']:
+                result['download_url'] = match['download_url']
+            return result
         
-        # Check for partial matches
-        for known_font, info in known_free_fonts.items():
-            if known_font in font_key or font_key in known_font:
-                return {
-                    'font_name': font_name,
-                    'repository': info['repository'],
-                    'direct_url': info['direct_url'],
-                    'download_url': info['download_url'],
-                    'downloaded': False,
-                    'note': f'Found similar font: {known_font.title()}'
-                }
-        
-        # If no known match, provide search links for top repositories only
-        return {
-            'font_name': font_name,
-            'repository': 'Multiple Sources',
-            'search_links': [
-                {
-                    'source': 'Google Fonts',
-                    'url': f"https://fonts.google.com/?query={quote_plus(font_name)}"
-                },
-                {
-                    'source': 'Font Squirrel',
-                    'url': f"https://www.fontsquirrel.com/fonts/list/find_fonts?q={quote_plus(font_name)}"
-                }
-            ],
-            'downloaded': False,
-            'note': 'Please search these repositories manually'
-        }
+        # Not a known free family: the hunt falls through to the commercial entry
+        return None
     
     def _create_commercial_entry(self, font_name: str) -> Dict:
         """Create entry for likely commercial font."""
@@ -260,6 +633,45 @@ class FontHunter:
             'search_links': search_links
         }
     
+    def _usage_html(self, results: Dict, font_name: str) -> str:
+        """Describe where a font is used, for the HTML report."""
+        stats = results.get('family_usage', {}).get(font_name) or results.get('font_usage', {}).get(font_name)
+        if not stats:
+            return ""
+        styles = ", ".join(stats.get('styles', []))
+        # A single deck lists slide numbers; merged totals count slide appearances
+        slides = len(stats['slides']) if isinstance(stats['slides'], list) else stats['slides']
+        return (f'            <div class="font-details">📊 Used in {stats["runs"]} text run(s), '
+                f'{stats["characters"]} characters, {slides} slide(s)'
+                f'{" (" + styles + ")" if styles else ""}</div>\n')
+    
+    def _names_html(self, font: Dict) -> str:
+        """List the font names a family result covers, for the HTML report."""
+        names = font.get('searched_names', [])
+        if len(names) < 2 and font['font_name'] in names:
+            return ""
+        return f'            <div class="font-details">🏷️ Referenced as: {", ".join(names)}</div>\n'
+    
+    def _match_html(self, font: Dict) -> str:
+        """Explain how a searched name was matched to a catalog family, for the HTML report."""
+        match = font.get('match')
+        if not match or match['match'] == 'exact':
+            return ""
+        others = ", ".join(f"{c['family']} ({c['score']:.2f})" for c in match.get('candidates', []))
+        return (f'            <div class="font-details">🔎 Matched "{font["searched_name"]}": {match["reason"]}'
+                f'{"; other candidates: " + others if others else ""}</div>\n')
+    
+    def _google_error_html(self, font: Dict) -> str:
+        """Warn that Google Fonts, or the whole hunt, failed for a font, for the HTML report."""
+        html = ""
+        if font.get('google_error'):
+            html += (f'            <div class="font-details">⚠️ Google Fonts could not be checked '
+                     f'({font["google_error"]}); hunt again later</div>\n')
+        if font.get('error'):
+            html += (f'            <div class="font-details">⚠️ The hunt for this font failed '
+                     f'({font["error"]}); hunt again later</div>\n')
+        return html
+    
     def _generate_html_report(self, results: Dict, output_folder: Path) -> Path:
         """Generate comprehensive HTML report."""
         report_path = output_folder / "font_acquisition_report.html"
@@ -454,6 +866,10 @@ class FontHunter:
                     <div class="summary-number">{len(results['commercial_fonts'])}</div>
                     <div class="summary-label">Commercial</div>
                 </div>
+                <div class="summary-item">
+                    <div class="summary-number">{len(results.get('already_available', []))}</div>
+                    <div class="summary-label">Already Available</div>
+                </div>
             </div>
         </div>
 """
@@ -462,20 +878,22 @@ class FontHunter:
         if results['google_fonts_downloaded']:
             html += """
         <h2>✅ Auto-Downloaded Fonts (Ready to Install)</h2>
-        <p>These fonts were automatically downloaded from Google Fonts and are ready to use.</p>
+        <p>These fonts were automatically downloaded from Google Fonts (or copied from the local font mirror) and are ready to use.</p>
 """
             for font in results['google_fonts_downloaded']:
                 variants = ", ".join(font.get('variants', []))
+                files = ", ".join(f"<code>{Path(entry['file_path']).name}</code>"
+                                  for entry in font.get('files', [{'file_path': font['file_path']}]))
                 html += f"""
         <div class="font-item section-downloaded">
             <div class="font-name">
                 {font['font_name']}
                 <span class="badge badge-success">DOWNLOADED</span>
             </div>
-            <div class="font-details">📁 File: <code>{Path(font['file_path']).name}</code></div>
-            <div class="font-details">🔤 Variants available: {variants}</div>
+            <div class="font-details">📁 Files: {files}</div>
+{self._names_html(font)}{self._usage_html(results, font.get('searched_name', font['font_name']))}{self._match_html(font)}            <div class="font-details">🔤 Variants available: {variants}</div>
             <div class="links">
-                <a href="{font['url']}" class="link-button" target="_blank">View on Google Fonts</a>
+                <a href="{font['url']}" class="link-button" target="_blank">View on {font.get('repository', 'Google Fonts')}</a>
             </div>
         </div>
 """
@@ -499,7 +917,7 @@ class FontHunter:
             </div>
             <div class="font-details">📍 Source: {font['repository']}</div>
             <div class="font-details">ℹ️ {font.get('note', '')}</div>
-            <div class="links">
+{self._names_html(font)}{self._usage_html(results, font['font_name'])}{self._google_error_html(font)}            <div class="links">
 """
                 
                 # Handle different link types
@@ -518,6 +936,23 @@ class FontHunter:
         </div>
 """
         
+        # Already available fonts section
+        if results.get('already_available'):
+            html += """
+        <h2>📦 Already Available (Not Hunted)</h2>
+        <p>These fonts are embedded in the presentations, were downloaded earlier, are installed on this machine or are operating system fonts no text uses, so no search was needed.</p>
+"""
+            for font in results['already_available']:
+                html += f"""
+        <div class="font-item section-downloaded">
+            <div class="font-name">
+                {font['font_name']}
+                <span class="badge badge-success">{font['source'].upper()}</span>
+            </div>
+            <div class="font-details">🔤 Family: {font['family']}</div>
+        </div>
+"""
+        
         # Commercial fonts section
         if results['commercial_fonts']:
             html += """
@@ -539,7 +974,7 @@ class FontHunter:
                 {font['font_name']}
                 <span class="badge badge-warning">COMMERCIAL</span>
             </div>
-            <div class="font-details">🔍 Search on these marketplaces:</div>
+{self._names_html(font)}{self._usage_html(results, font['font_name'])}{self._google_error_html(font)}            <div class="font-details">🔍 Search on these marketplaces:</div>
             <div class="links">
                 {links_html}
             </div>
@@ -0,0 +1,264 @@
+"""
+Lightweight font identification.
+Reads family, style and weight from font files, including the embedded
+(.fntdata / EOT) and obfuscated (.odttf) forms used inside presentations.
+"""
+
+import re
+import struct
+from io import BytesIO
+from pathlib import Path
+from typing import Dict, Optional, Tuple, Union
+
+try:
+    from fontTools.ttLib import TTFont
+except ImportError:  # fontTools is optional for EOT header parsing
+    TTFont = None
+
+
+SFNT_SIGNATURES = (b'\x00\x01\x00\x00', b'OTTO', b'true', b'typ1', b'ttcf', b'wOFF', b'wOF2')
+
+# Embedded OpenType flags
+EOT_MAGIC = 0x504C
+EOT_FLAG_COMPRESSED = 0x00000004
+EOT_FLAG_XOR_ENCRYPTED = 0x10000000
+EOT_XOR_KEY = 0x50
+
+GUID_PATTERN = re.compile(r'\{?([0-9A-Fa-f]{8})-?([0-9A-Fa-f]{4})-?([0-9A-Fa-f]{4})-?'
+                          r'([0-9A-Fa-f]{4})-?([0-9A-Fa-f]{12})\}?')
+
+
+def is_sfnt(data: bytes) -> bool:
+    """Check whether data starts with a TrueType/OpenType/WOFF signature."""
+    return data[:4] in SFNT_SIGNATURES
+
+
+def deobfuscate_odttf(data: bytes, guid: str) -> Optional[bytes]:
+    """
+    Undo Office font obfuscation (ECMA-376 Part 2, section 12).
+
+    The first 32 bytes of the font are XORed with the font key GUID in
+    reversed byte order.
+
+    Args:
+        data: Obfuscated font bytes
+        guid: Font key GUID, with or without braces and dashes
+
+    Returns:
+        Plain font bytes, or None if the GUID is malformed
+    """
+    match = GUID_PATTERN.search(guid or '')
+    if not match or len(data) < 32:
+        return None
+
+    key = bytes.fromhex(''.join(match.groups()))[::-1]
+    head = bytes(data[i] ^ key[i % 16] for i in range(32))
+    return head + data[32:]
+
+
+def parse_eot_header(data: bytes) -> Optional[Dict]:
+    """
+    Parse an Embedded OpenType header.
+
+    Returns:
+        Dictionary with names, weight, italic flag and the font data offset,
+        or None if data is not an EOT file
+    """
+    if len(data) < 82:
+        return None
+
+    eot_size, font_data_size, version, flags = struct.unpack_from('<IIII', data, 0)
+    italic, weight = struct.unpack_from('<BI', data, 27)
+    magic = struct.unpack_from('<H', data, 34)[0]
+    if magic != EOT_MAGIC or version not in (0x00010000, 0x00020001, 0x00020002):
+        return None
+    if eot_size > len(data) or font_data_size > eot_size:
+        return None
+
+    # Variable-length names follow the fixed 80-byte header:
+    # Padding, FamilyName, Padding, StyleName, Padding, VersionName, Padding, FullName
+    names = []
+    offset = 80
+    try:
+        for _ in range(4):
+            offset += 2  # padding
+            size = struct.unpack_from('<H', data, offset)[0]
+            offset += 2
+            names.append(data[offset:offset + size].decode('utf-16-le', errors='ignore'))
+            offset += size
+    except struct.error:
+        return None
+
+    return {
+        'family': names[0],
+        'style': names[1],
+        'full_name': names[3],
+        'weight': weight,
+        'italic': bool(italic),
+        'compressed': bool(flags & EOT_FLAG_COMPRESSED),
+        'xor_encrypted': bool(flags & EOT_FLAG_XOR_ENCRYPTED),
+        'font_data_offset': eot_size - font_data_size,
+        'font_data_size': font_data_size,
+    }
+
+
+def unwrap_font(data: bytes, filename: Optional[str] = None,
+                font_key: Optional[str] = None) -> Tuple[Optional[bytes], Optional[Dict], str]:
+    """
+    Recover plain font bytes from an embedded font where the format allows it.
+
+    Handles plain sfnt data, uncompressed EOT (optionally XOR-encrypted) and
+    Office GUID obfuscation. MicroType Express compressed EOT data cannot be
+    decoded, but its header still carries the font names.
+
+    Args:
+        data: Font file contents
+        filename: Original part name (its GUID is the key for .odttf files)
+        font_key: Explicit obfuscation key GUID
+
+    Returns:
+        Tuple of (plain font bytes or None, EOT header or None, format name)
+    """
+    if is_sfnt(data):
+        return data, None, 'sfnt'
+
+    eot = parse_eot_header(data)
+    if eot:
+        if eot['compressed']:
+            return None, eot, 'eot-compressed'
+        start = eot['font_data_offset']
+        font_data = data[start:start + eot['font_data_size']]
+        if eot['xor_encrypted']:
+            font_data = bytes(b ^ EOT_XOR_KEY for b in font_data)
+        if is_sfnt(font_data):
+            return font_data, eot, 'eot'
+        return None, eot, 'eot'
+
+    for key in (font_key, Path(filename).stem if filename else None):
+        if not key:
+            continue
+        plain = deobfuscate_odttf(data, key)
+        if plain and is_sfnt(plain):
+            return plain, None, 'odttf'
+
+    return None, None, 'unknown'
+
+
+def read_font_info(source: Union[str, Path, bytes], filename: Optional[str] = None,
+                   font_key: Optional[str] = None) -> Optional[Dict]:
+    """
+    Identify a font without decoding its glyph outlines.
+
+    Only the table directory and the 'name' and 'OS/2' tables are read,
+    using fontTools' lazy table loading.
+
+    Args:
+        source: Path to a font file, or its contents
+        filename: Original file name, used for de-obfuscation when source is bytes
+        font_key: Explicit obfuscation key GUID
+
+    Returns:
+        Dictionary with family, style, full_name, postscript_name, weight,
+        bold, italic, format and decoded, or None if the font could not be
+        identified
+    """
+    return decode_embedded_font(source, filename, font_key)[0]
+
+
+def decode_embedded_font(source: Union[str, Path, bytes], filename: Optional[str] = None,
+                         font_key: Optional[str] = None) -> Tuple[Optional[Dict], Optional[bytes]]:
+    """
+    Identify a font and recover its plain sfnt bytes if it was wrapped.
+
+    Returns:
+        Tuple of (font info or None, plain font bytes or None). The bytes are
+        only returned when the source was EOT-wrapped or obfuscated and could
+        be decoded; plain font files need no conversion.
+    """
+    if isinstance(source, (str, Path)):
+        path = Path(source)
+        filename = filename or path.name
+        with open(path, 'rb') as f:
+            head = f.read(4)
+            if head in SFNT_SIGNATURES:
+                # Let fontTools seek into the file instead of reading it all
+                info = _read_sfnt_info(str(path), 'sfnt')
+                if info is not None:
+                    info['decoded'] = True
+                return info, None
+            data = head + f.read()
+    else:
+        data = bytes(source)
+
+    plain, eot, font_format = unwrap_font(data, filename, font_key)
+
+    info = None
+    if plain is not None:
+        info = _read_sfnt_info(BytesIO(plain), font_format)
+
+    if info is None and eot and eot['family']:
+        weight = eot['weight'] or 400
+        info = {
+            'family': eot['family'],
+            'style': eot['style'] or 'Regular',
+            'full_name': eot['full_name'] or eot['family'],
+            'postscript_name': None,
+            'weight': weight,
+            'bold': weight >= 600,
+            'italic': eot['italic'],
+            'format': font_format,
+            'outlines': None,
+        }
+
+    if info is not None:
+        info['decoded'] = plain is not None
+
+    return info, (plain if font_format != 'sfnt' else None)
+
+
+def _read_sfnt_info(source, font_format: str) -> Optional[Dict]:
+    """Read naming and weight info from an sfnt font using lazy table loading."""
+    if TTFont is None:
+        return None
+
+    try:
+        font = TTFont(source, lazy=True, fontNumber=0)
+    except Exception:
+        return None
+
+    try:
+        name_table = font['name'] if 'name' in font else None
+        if name_table is None:
+            return None
+
+        family = name_table.getBestFamilyName()
+        style = name_table.getBestSubFamilyName() or 'Regular'
+        full_name = name_table.getBestFullName() or family
+        postscript_name = name_table.getDebugName(6)
+
+        weight = 400
+        italic = 'italic' in style.lower() or 'oblique' in style.lower()
+        if 'OS/2' in font:
+            os2 = font['OS/2']
+            weight = os2.usWeightClass
+            italic = italic or bool(os2.fsSelection & 0x01)
+
+        if not family:
+            return None
+
+        return {
+            'family': family,
+            'style': style,
+            'full_name': full_name,
+            'postscript_name': postscript_name,
+            'weight': weight,
+            'bold': weight >= 600 or 'bold' in style.lower(),
+            'italic': italic,
+            'format': font_format,
+            'outlines': 'cff' if 'CFF ' in font or 'CFF2' in font else 'truetype',
+        }
+    except Exception:
+        return None
+    finally:
+        font.close()
+
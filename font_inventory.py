@@ -0,0 +1,253 @@
+"""
+Cross-deck font inventory.
+A persistent SQLite index from fonts to the presentations, slides and text
+runs that use them, updated incrementally as presentations are analyzed.
+"""
+
+import os
+import time
+import sqlite3
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+from font_database import normalize_font_name
+
+
+DEFAULT_INVENTORY_PATH = Path.home() / ".cache" / "presentation-toolkit" / "font_inventory.sqlite"
+
+SCHEMA_VERSION = 1
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS decks (
+    id INTEGER PRIMARY KEY,
+    path TEXT UNIQUE NOT NULL,
+    size INTEGER NOT NULL,
+    mtime_ns INTEGER NOT NULL,
+    indexed_at REAL NOT NULL
+);
+CREATE TABLE IF NOT EXISTS deck_fonts (
+    deck_id INTEGER NOT NULL REFERENCES decks(id) ON DELETE CASCADE,
+    font TEXT NOT NULL,
+    font_key TEXT NOT NULL,
+    category TEXT,
+    embedded INTEGER NOT NULL DEFAULT 0,
+    slides TEXT NOT NULL DEFAULT '',
+    slide_count INTEGER NOT NULL DEFAULT 0,
+    runs INTEGER NOT NULL DEFAULT 0,
+    characters INTEGER NOT NULL DEFAULT 0,
+    styles TEXT NOT NULL DEFAULT '',
+    PRIMARY KEY (deck_id, font)
+);
+CREATE INDEX IF NOT EXISTS deck_fonts_key ON deck_fonts (font_key);
+"""
+
+
+def file_signature(path: Path) -> Tuple[int, int]:
+    """
+    Return (size, mtime_ns) used to detect changed presentations.
+
+    Keynote packages are directories whose own mtime does not change when
+    a document inside is saved, so their top-level entries are included.
+    """
+    stat = path.stat()
+    if not path.is_dir():
+        return stat.st_size, stat.st_mtime_ns
+
+    size, mtime_ns = 0, stat.st_mtime_ns
+    with os.scandir(path) as entries:
+        for entry in entries:
+            entry_stat = entry.stat(follow_symlinks=False)
+            size += entry_stat.st_size
+            mtime_ns = max(mtime_ns, entry_stat.st_mtime_ns)
+    return size, mtime_ns
+
+
+def _like_pattern(pattern: str) -> str:
+    """Turn a glob pattern (or a plain substring) into a LIKE pattern."""
+    escaped = pattern.replace('\\', '\\\\').replace('%', '\\%').replace('_', '\\_')
+    if '*' not in pattern and '?' not in pattern:
+        return f"%{escaped}%"
+    return escaped.replace('*', '%').replace('?', '_')
+
+
+class FontInventory:
+    """
+    Inverted index of fonts to presentations.
+
+    Each analyzed presentation replaces its previous rows, keyed by its
+    absolute path; unchanged files (same size and mtime) can be skipped.
+    Font lookups use the normalized font name, so "Gotham" finds
+    "Gotham-Bold" and "Gotham Medium" through an index range scan.
+    """
+
+    def __init__(self, db_path: Optional[str] = None):
+        self.db_path = Path(db_path) if db_path else DEFAULT_INVENTORY_PATH
+        self.db_path.parent.mkdir(exist_ok=True, parents=True)
+        self._conn = sqlite3.connect(str(self.db_path), timeout=30)
+        self._conn.row_factory = sqlite3.Row
+        self._conn.execute("PRAGMA foreign_keys = ON")
+        self._conn.execute("PRAGMA journal_mode = WAL")
+        self._conn.execute("PRAGMA synchronous = NORMAL")
+        self._conn.executescript(SCHEMA)
+        self._conn.execute(f"PRAGMA user_version = {SCHEMA_VERSION}")
+
+    def close(self):
+        self._conn.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def is_current(self, presentation_path: str) -> bool:
+        """Check whether a presentation is indexed and unchanged since."""
+        path = Path(presentation_path).absolute()
+        row = self._conn.execute("SELECT size, mtime_ns FROM decks WHERE path = ?", (str(path),)).fetchone()
+        if row is None:
+            return False
+        try:
+            return (row['size'], row['mtime_ns']) == file_signature(path)
+        except OSError:
+            return False
+
+    def record(self, presentation_path: str, result: Dict):
+        """
+        Store the fonts of one analyzed presentation, replacing earlier rows.
+
+        Args:
+            presentation_path: Path to the .pptx, .key or .pdf file
+            result: Extraction result from FontExtractor
+        """
+        path = Path(presentation_path).absolute()
+        size, mtime_ns = file_signature(path)
+
+        categories = {}
+        for category in ('system', 'commercial', 'free'):
+            for font in result.get(f'{category}_fonts', []):
+                categories[font] = category
+
+        embedded_keys = set()
+        for info in result.get('embedded_font_info', []):
+            for name in (info.get('family'), info.get('full_name'), info.get('postscript_name')):
+                if name:
+                    embedded_keys.add(normalize_font_name(name))
+        for font in result.get('pdf_fonts', []):
+            if font['embedded']:
+                embedded_keys.add(normalize_font_name(font['name']))
+
+        usage = result.get('font_usage', {})
+        rows = []
+        for font in set(result.get('referenced_fonts', [])) | set(usage):
+            stats = usage.get(font, {})
+            slides = stats.get('slides', [])
+            font_key = normalize_font_name(font)
+            rows.append((
+                font, font_key, categories.get(font), int(font_key in embedded_keys),
+                ','.join(map(str, slides)), len(slides), stats.get('runs', 0),
+                stats.get('characters', 0), ','.join(stats.get('styles', [])),
+            ))
+
+        with self._conn:
+            self._conn.execute("DELETE FROM decks WHERE path = ?", (str(path),))
+            deck_id = self._conn.execute(
+                "INSERT INTO decks (path, size, mtime_ns, indexed_at) VALUES (?, ?, ?, ?)",
+                (str(path), size, mtime_ns, time.time())
+            ).lastrowid
+            self._conn.executemany(
+                "INSERT INTO deck_fonts (deck_id, font, font_key, category, embedded, slides, "
+                "slide_count, runs, characters, styles) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                [(deck_id,) + row for row in rows]
+            )
+
+    def prune(self, root: Optional[str] = None) -> int:
+        """
+        Drop presentations that no longer exist on disk.
+
+        Args:
+            root: Only consider presentations below this folder
+
+        Returns:
+            Number of presentations removed
+        """
+        query = "SELECT id, path FROM decks"
+        params = ()
+        if root:
+            prefix = str(Path(root).absolute()).rstrip(os.sep) + os.sep
+            query += " WHERE substr(path, 1, ?) = ?"
+            params = (len(prefix), prefix)
+
+        missing = [(row['id'],) for row in self._conn.execute(query, params) if not Path(row['path']).exists()]
+        with self._conn:
+            self._conn.executemany("DELETE FROM decks WHERE id = ?", missing)
+        return len(missing)
+
+    def decks_for_font(self, font_name: str, exact: bool = False) -> List[Dict]:
+        """
+        Find the presentations that use a font.
+
+        Args:
+            font_name: Font or family name ("Gotham", "Gotham Bold")
+            exact: Only match the full name, not names starting with it
+
+        Returns:
+            One dictionary per (presentation, font) with 'deck', 'font',
+            'category', 'embedded', 'slides', 'runs', 'characters' and
+            'styles', most used first
+        """
+        key = normalize_font_name(font_name)
+        if not key:
+            return []
+        if exact:
+            where, params = "f.font_key = ?", (key,)
+        else:
+            # Prefix range on the index: every key starting with `key`
+            where, params = "f.font_key >= ? AND f.font_key < ?", (key, key + '\U0010ffff')
+
+        rows = self._conn.execute(
+            "SELECT d.path, f.* FROM deck_fonts f JOIN decks d ON d.id = f.deck_id "
+            f"WHERE {where} ORDER BY f.characters DESC, f.runs DESC, d.path", params
+        )
+        return [{
+            'deck': row['path'],
+            'font': row['font'],
+            'category': row['category'],
+            'embedded': bool(row['embedded']),
+            'slides': [int(s) for s in row['slides'].split(',') if s],
+            'runs': row['runs'],
+            'characters': row['characters'],
+            'styles': [s for s in row['styles'].split(',') if s],
+        } for row in rows]
+
+    def fonts_for_decks(self, pattern: Optional[str] = None) -> List[Dict]:
+        """
+        Summarize the fonts needed by a set of presentations.
+
+        Args:
+            pattern: Glob for the presentation paths ("*/Room B/*"), or a
+                plain substring of the path; all presentations if omitted
+
+        Returns:
+            One dictionary per font with 'font', 'category', 'decks',
+            'embedded_in', 'slides', 'runs' and 'characters'; fonts used in
+            text runs come before theme-only ones, then by number of decks
+        """
+        where, params = "", ()
+        if pattern:
+            where, params = "WHERE d.path LIKE ? ESCAPE '\\'", (_like_pattern(pattern),)
+
+        rows = self._conn.execute(
+            "SELECT f.font, MAX(f.category) AS category, COUNT(*) AS decks, SUM(f.embedded) AS embedded_in, "
+            "SUM(f.slide_count) AS slides, SUM(f.runs) AS runs, SUM(f.characters) AS characters "
+            f"FROM deck_fonts f JOIN decks d ON d.id = f.deck_id {where} "
+            "GROUP BY f.font ORDER BY runs > 0 DESC, decks DESC, characters DESC, f.font", params
+        )
+        return [dict(row) for row in rows]
+
+    def stats(self) -> Dict:
+        """Return the number of indexed presentations, fonts and font references."""
+        decks = self._conn.execute("SELECT COUNT(*) FROM decks").fetchone()[0]
+        fonts, references = self._conn.execute(
+            "SELECT COUNT(DISTINCT font_key), COUNT(*) FROM deck_fonts"
+        ).fetchone()
+        return {'decks': decks, 'fonts': fonts, 'references': references}
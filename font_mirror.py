@@ -0,0 +1,286 @@
+"""
+Local font mirror.
+Lets the font hunter work without a network by resolving fonts from a
+directory of font files, such as a checkout of the google/fonts repository
+copied onto a show network machine.
+"""
+
+import os
+import re
+import time
+import json
+import hashlib
+import tempfile
+import threading
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing import get_context
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+from font_info import read_font_info
+from google_fonts_catalog import CatalogIndex, parse_variant, variant_key
+
+
+# Use this mirror when no mirror is given explicitly
+MIRROR_DIR_ENV = 'FONT_MIRROR_DIR'
+
+DEFAULT_INDEX_DIR = Path.home() / ".cache" / "presentation-toolkit"
+
+INDEX_FORMAT = 2
+
+MIRROR_EXTENSIONS = ('.ttf', '.otf', '.ttc', '.otc')
+
+# Below this many new or changed files, parsing in-process beats starting workers
+PARALLEL_THRESHOLD = 32
+
+# google/fonts names variable fonts after their axes: "Inter[opsz,wght].ttf"
+VARIABLE_FONT_PATTERN = re.compile(r'\[[^\]]*wght[^\]]*\]', re.IGNORECASE)
+
+
+def _read_mirror_font(path: str) -> Optional[Dict]:
+    """Read the name table fields the index keeps (runs in worker processes)."""
+    try:
+        info = read_font_info(path)
+    except Exception:
+        return None
+    if not info or not info.get('family'):
+        return None
+    return {
+        'file': os.path.basename(path),
+        'family': info['family'],
+        'style': info.get('style'),
+        'full_name': info.get('full_name'),
+        'postscript_name': info.get('postscript_name'),
+        'weight': info.get('weight') or 400,
+        'italic': bool(info.get('italic')),
+        'variable': bool(VARIABLE_FONT_PATTERN.search(os.path.basename(path))),
+    }
+
+
+class FontMirror:
+    """
+    A directory tree of font files, indexed by family name.
+
+    The index is built from the fonts' name tables, parsing only the table
+    directory and the name and OS/2 tables, in parallel worker processes.
+    It is cached on disk and revalidated incrementally: a directory whose
+    mtime has not changed keeps its cached entries and subdirectory list,
+    so checking an unchanged mirror of thousands of families costs one
+    stat() per directory. Files overwritten in place keep their old entry
+    until their directory changes.
+
+    Families are exposed in the same shape as Google Fonts catalog entries
+    ('family', 'variants', 'files'), with local paths instead of URLs, so
+    they are looked up with a CatalogIndex like the online catalog.
+    """
+
+    def __init__(self, root: str, index_path: Optional[str] = None, max_workers: Optional[int] = None):
+        """
+        Args:
+            root: Mirror directory (e.g. a google/fonts checkout)
+            index_path: Where to cache the index; defaults to a file per
+                mirror in the user cache directory
+            max_workers: Worker processes for parsing fonts
+        """
+        self.root = Path(root).resolve()
+        if index_path:
+            self.index_path = Path(index_path)
+        else:
+            digest = hashlib.sha1(str(self.root).encode('utf-8')).hexdigest()[:12]
+            self.index_path = DEFAULT_INDEX_DIR / f"font_mirror-{digest}.json"
+        self.max_workers = max_workers
+        self._lock = threading.Lock()
+        self._dirs = None  # relative dir -> {'mtime_ns', 'subdirs', 'fonts'}
+        self._index = None
+
+    def index(self, revalidate: bool = False) -> CatalogIndex:
+        """
+        Return the lookup index over the mirror's families.
+
+        The mirror is scanned on first use in this process, or again when
+        revalidate is True.
+        """
+        with self._lock:
+            if self._index is None or revalidate:
+                self._refresh()
+            return self._index
+
+    def fonts(self, revalidate: bool = False) -> List[Dict]:
+        """
+        Return the name table info of every indexed font file.
+
+        Returns:
+            List of dicts with 'file' (absolute path), 'family', 'style',
+            'full_name', 'postscript_name', 'weight', 'italic' and 'variable'
+        """
+        with self._lock:
+            if self._index is None or revalidate:
+                self._refresh()
+            return [dict(info, file=str(self.root / rel_dir / info['file']))
+                    for rel_dir, entry in self._dirs.items() for info in entry['fonts']]
+
+    def refresh(self) -> Dict[str, int]:
+        """
+        Bring the index up to date with the mirror directory.
+
+        Returns:
+            Dictionary with the number of directories, changed directories,
+            fonts parsed and fonts indexed
+        """
+        with self._lock:
+            return self._refresh()
+
+    def _refresh(self) -> Dict[str, int]:
+        if not self.root.is_dir():
+            raise FileNotFoundError(f"Font mirror not found: {self.root}")
+
+        if self._dirs is None:
+            self._dirs = self._load()
+
+        dirs, changed, to_parse = self._scan()
+        parsed = self._parse([str(self.root / rel_dir / name) for rel_dir, name in to_parse])
+        for (rel_dir, name), info in zip(to_parse, parsed):
+            if info is not None:
+                dirs[rel_dir]['fonts'].append(info)
+
+        # Adding, removing or renaming anything changes its directory's mtime
+        if changed or self._index is None:
+            self._dirs = dirs
+            self._index = CatalogIndex(self._build_items())
+        if changed:
+            self._save()
+
+        return {
+            'directories': len(dirs),
+            'changed': changed,
+            'parsed': len(to_parse),
+            'fonts': sum(len(entry['fonts']) for entry in dirs.values()),
+        }
+
+    def _scan(self) -> Tuple[Dict[str, Dict], int, List[Tuple[str, str]]]:
+        """Walk the mirror, reusing cached directories whose mtime is unchanged."""
+        dirs = {}
+        changed = 0
+        to_parse = []
+        stack = [('', os.stat(self.root).st_mtime_ns)]
+        while stack:
+            rel_dir, mtime_ns = stack.pop()
+            cached = self._dirs.get(rel_dir)
+            path = self.root / rel_dir
+
+            if cached is not None and cached['mtime_ns'] == mtime_ns:
+                dirs[rel_dir] = cached
+                for name in cached['subdirs']:
+                    try:
+                        stack.append((os.path.join(rel_dir, name), os.stat(path / name).st_mtime_ns))
+                    except OSError:
+                        pass
+                continue
+
+            changed += 1
+            entry = {'mtime_ns': mtime_ns, 'subdirs': [], 'fonts': []}
+            dirs[rel_dir] = entry
+            try:
+                with os.scandir(path) as it:
+                    for item in it:
+                        if item.name.startswith('.'):
+                            continue
+                        if item.is_dir(follow_symlinks=False):
+                            entry['subdirs'].append(item.name)
+                            stack.append((os.path.join(rel_dir, item.name), item.stat().st_mtime_ns))
+                        elif os.path.splitext(item.name)[1].lower() in MIRROR_EXTENSIONS:
+                            to_parse.append((rel_dir, item.name))
+            except OSError as e:
+                print(f"Warning: Could not read mirror directory {path}: {e}")
+        return dirs, changed, to_parse
+
+    def _parse(self, paths: List[str]) -> List[Optional[Dict]]:
+        if len(paths) < PARALLEL_THRESHOLD:
+            return [_read_mirror_font(path) for path in paths]
+        # Forking while other threads hold locks can deadlock the workers
+        context = None if threading.current_thread() is threading.main_thread() else get_context('spawn')
+        with ProcessPoolExecutor(max_workers=self.max_workers, mp_context=context) as pool:
+            return list(pool.map(_read_mirror_font, paths, chunksize=16))
+
+    def _build_items(self) -> List[Dict]:
+        """Group indexed fonts into catalog-style family entries."""
+        families = {}
+        for rel_dir in sorted(self._dirs):
+            for info in sorted(self._dirs[rel_dir]['fonts'], key=lambda font: font['file']):
+                item = families.setdefault(info['family'], {'family': info['family'], 'variants': [], 'files': {}})
+                path = str(self.root / rel_dir / info['file'])
+                italic = info['italic']
+                if info['variable']:
+                    # One file covers every weight of its slant; static files win
+                    weights = range(100, 1000, 100)
+                else:
+                    weights = [min(900, max(100, int(round(info['weight'] / 100.0)) * 100))]
+                for weight in weights:
+                    variant = variant_key(weight, italic)
+                    if variant not in item['files'] or not info['variable']:
+                        item['files'][variant] = path
+
+        items = []
+        for item in families.values():
+            item['variants'] = sorted(item['files'], key=lambda v: parse_variant(v)[::-1])
+            items.append(item)
+        return items
+
+    def _load(self) -> Dict[str, Dict]:
+        try:
+            # Plain JSON: an index shared or tampered with can't run code when loaded
+            with open(self.index_path, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+        except FileNotFoundError:
+            return {}
+        except Exception as e:
+            print(f"Warning: Ignoring unreadable font mirror index: {e}")
+            return {}
+        if (not isinstance(data, dict) or data.get('format') != INDEX_FORMAT or data.get('root') != str(self.root)
+                or not isinstance(data.get('dirs'), dict)):
+            return {}
+        return data['dirs']
+
+    def _save(self):
+        """Write the index atomically, so concurrent processes never read a partial file."""
+        data = {'format': INDEX_FORMAT, 'root': str(self.root), 'dirs': self._dirs, 'saved_at': time.time()}
+        try:
+            self.index_path.parent.mkdir(exist_ok=True, parents=True)
+            fd, tmp_name = tempfile.mkstemp(dir=self.index_path.parent, prefix='.mirror-')
+            try:
+                with os.fdopen(fd, 'w', encoding='utf-8') as f:
+                    json.dump(data, f, separators=(',', ':'))
+                os.replace(tmp_name, self.index_path)
+            finally:
+                if os.path.exists(tmp_name):
+                    os.unlink(tmp_name)
+        except OSError as e:
+            print(f"Warning: Could not write the font mirror index: {e}")
+
+
+_mirrors = {}
+_mirrors_lock = threading.Lock()
+
+
+def get_font_mirror(root: Optional[str] = None) -> Optional[FontMirror]:
+    """
+    Return the mirror shared by every FontHunter in this process.
+
+    Args:
+        root: Mirror directory; defaults to $FONT_MIRROR_DIR
+
+    Returns:
+        The mirror, or None if no mirror is configured or it does not exist
+    """
+    root = root or os.getenv(MIRROR_DIR_ENV)
+    if not root:
+        return None
+    if not Path(root).is_dir():
+        print(f"Warning: Font mirror {root} is not a directory, ignoring it")
+        return None
+    key = str(Path(root).resolve())
+    with _mirrors_lock:
+        mirror = _mirrors.get(key)
+        if mirror is None:
+            mirror = _mirrors[key] = FontMirror(key)
+        return mirror
@@ -0,0 +1,192 @@
+"""
+Font name parsing.
+Splits the names presentations use for fonts ("Montserrat SemiBold
+Italic", "OpenSans-BoldItalic", "MinionPro-It") into a family and the
+weight, slant and width they ask for, so the hunter can look up each
+family once.
+"""
+
+import re
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from font_database import normalize_font_name
+
+
+# Weight words in font names, checked in this order so "semibold" is not read as "bold"
+WEIGHT_WORDS = (
+    ('extralight', 200), ('ultralight', 200), ('hairline', 100), ('thin', 100),
+    ('semibold', 600), ('demibold', 600), ('extrabold', 800), ('ultrabold', 800),
+    ('light', 300), ('medium', 500), ('bold', 700), ('black', 900), ('heavy', 900),
+    ('demi', 600), ('book', 400), ('regular', 400),
+)
+
+WEIGHTS = dict(WEIGHT_WORDS, normal=400, roman=400, ultra=800, semilight=300, demilight=300,
+               extrablack=900, ultrablack=900)
+
+ITALIC_WORDS = ('italic', 'oblique')
+
+WIDTH_WORDS = ('condensed', 'cond', 'narrow', 'compressed', 'extended', 'expanded', 'wide')
+
+# Combine with the next word: "Semi Bold", "Extra Condensed"
+MODIFIERS = ('semi', 'demi', 'extra', 'ultra')
+
+# Longest first, so fused words ("semibolditalic") split the right way
+_VOCABULARY = sorted(set(WEIGHTS) | set(ITALIC_WORDS) | set(WIDTH_WORDS) | set(MODIFIERS), key=len, reverse=True)
+
+# Words of a name, with camel case split: "OpenSans-SemiBoldItalic" -> Open Sans SemiBold Italic
+_WORD_PATTERN = re.compile(r'[A-Z]+(?![a-z])|[A-Z]?[a-z]+|\d+')
+
+
+def _style_words(token: str) -> Optional[List[str]]:
+    """Split a lowercase token into style words, or None if it is not made of them."""
+    words = []
+    while token:
+        for word in _VOCABULARY:
+            if token.startswith(word):
+                words.append(word)
+                token = token[len(word):]
+                break
+        else:
+            return None
+    return words
+
+
+def parse_font_name(name: str) -> Dict:
+    """
+    Split a font name into its family and style.
+
+    Style words are only taken from the end of the name, so families that
+    contain them elsewhere ("Black Ops One") keep their name. Width words
+    stay part of the family, since foundries ship widths as families of
+    their own ("Roboto Condensed", "Barlow Semi Condensed").
+
+    Args:
+        name: Font name as referenced by a presentation
+
+    Returns:
+        Dictionary with 'family', 'weight' (CSS weight), 'italic', 'width'
+        (e.g. 'semicondensed', or None) and 'style' (the style words found)
+    """
+    name = name.strip()
+    hyphen = name.find('-') if ' ' not in name else -1
+    tokens = list(_WORD_PATTERN.finditer(name))
+
+    # Peel style words off the end of the name
+    cut = len(tokens)
+    words = []
+    for position in range(len(tokens) - 1, 0, -1):
+        token = tokens[position]
+        lowered = token.group().lower()
+        # Adobe's PostScript names abbreviate italic: "MinionPro-BoldIt"
+        found = ['italic'] if lowered == 'it' and 0 <= hyphen < token.start() else _style_words(lowered)
+        if found is None:
+            break
+        words[:0] = found
+        cut = position
+
+    weight, italic, width = 400, False, None
+    index = 0
+    while index < len(words):
+        word = words[index]
+        following = words[index + 1] if index + 1 < len(words) else None
+        if word in MODIFIERS and following in WIDTH_WORDS:
+            width = word + following
+            index += 2
+            continue
+        if word in MODIFIERS and following in WEIGHTS and word + following in WEIGHTS:
+            weight = WEIGHTS[word + following]
+            index += 2
+            continue
+        if word in ITALIC_WORDS:
+            italic = True
+        elif word in WIDTH_WORDS:
+            width = word
+        elif word in WEIGHTS:
+            weight = WEIGHTS[word]
+        elif word in MODIFIERS:
+            weight = 800 if word in ('extra', 'ultra') else 600
+        index += 1
+
+    if cut == len(tokens):
+        return {'family': name, 'weight': weight, 'italic': italic, 'width': width, 'style': ''}
+
+    family = name[:tokens[cut].start()].strip(' -_,')
+    if width:
+        # Keep the width in the family name, in the name's own spelling
+        width_text = re.search(r'(?i)(semi|demi|extra|ultra)?[\s_-]*(' + '|'.join(WIDTH_WORDS) + r')',
+                               name[tokens[cut].start():])
+        family = f"{family} {width_text.group().strip()}" if width_text else family
+    return {'family': family, 'weight': weight, 'italic': italic, 'width': width, 'style': ' '.join(words)}
+
+
+def requested_variants(weight: int, italic: bool, run_styles: Optional[Iterable[str]] = None) -> List[Tuple[int, bool]]:
+    """
+    The (weight, italic) pairs a font name needs, given the styles of its text runs.
+
+    Bold runs need at least weight 700 and italic runs the italic face.
+    """
+    variants = []
+    for run_style in run_styles or ['regular']:
+        run_weight = 700 if 'bold' in run_style and weight < 700 else weight
+        variant = (run_weight, italic or 'italic' in run_style)
+        if variant not in variants:
+            variants.append(variant)
+    return variants
+
+
+def collapse_font_queries(font_names: Iterable[str], font_usage: Optional[Dict[str, Dict]] = None) -> List[Dict]:
+    """
+    Group font names by family, so each family is hunted once.
+
+    Args:
+        font_names: Font names to hunt
+        font_usage: Usage statistics per font name (see
+            font_extractor.merge_font_usage)
+
+    Returns:
+        One dict per family, in order of first appearance, with 'family',
+        'names' (the font names it covers), 'variants' ((weight, italic)
+        pairs the names and their runs need) and 'usage' (the names'
+        usage statistics added up, or None without usage)
+    """
+    font_usage = font_usage or {}
+    queries = {}
+    for font_name in font_names:
+        parsed = parse_font_name(font_name)
+        key = normalize_font_name(parsed['family']) or normalize_font_name(font_name)
+        query = queries.get(key)
+        if query is None:
+            query = queries[key] = {'family': parsed['family'], 'names': [], 'variants': [], 'usage': None}
+        elif ' ' in parsed['family'] and ' ' not in query['family']:
+            # "Open Sans" reads better than the PostScript "OpenSans"
+            query['family'] = parsed['family']
+        query['names'].append(font_name)
+
+        stats = font_usage.get(font_name)
+        for variant in requested_variants(parsed['weight'], parsed['italic'], (stats or {}).get('styles')):
+            if variant not in query['variants']:
+                query['variants'].append(variant)
+        if stats:
+            query['usage'] = _add_usage(query['usage'], stats)
+    return list(queries.values())
+
+
+def _add_usage(total: Optional[Dict], stats: Dict) -> Dict:
+    """Add up the usage statistics of two names of one family."""
+    if total is None:
+        return dict(stats, slides=list(stats['slides']) if isinstance(stats['slides'], list) else stats['slides'],
+                    styles=list(stats.get('styles', [])))
+    total = dict(total)
+    total['runs'] += stats['runs']
+    total['characters'] += stats['characters']
+    total['bold'] = total.get('bold', False) or stats.get('bold', False)
+    total['italic'] = total.get('italic', False) or stats.get('italic', False)
+    # A single deck lists slide numbers; merged totals count slide appearances
+    if isinstance(total['slides'], list):
+        total['slides'] = sorted(set(total['slides']) | set(stats['slides']))
+    else:
+        total['slides'] += stats['slides']
+    if 'decks' in total:
+        total['decks'] = max(total['decks'], stats.get('decks', 0))
+    total['styles'] = total['styles'] + [style for style in stats.get('styles', []) if style not in total['styles']]
+    return total
@@ -0,0 +1,155 @@
+"""
+Free font registry.
+Loads the known free font families and where to get them from JSON files
+and matches font names against them through an exact index and a token
+index, so the free font list can grow without code changes.
+"""
+
+import os
+import re
+import json
+import threading
+from pathlib import Path
+from typing import Dict, List, Optional
+from urllib.parse import quote_plus
+
+from font_database import normalize_font_name
+from font_names import parse_font_name
+
+
+DEFAULT_REGISTRY_PATH = Path(__file__).parent / "data" / "free_font_registry.json"
+
+# Extra registry files (os.pathsep-separated), loaded after the built-in one
+REGISTRY_ENV = 'FREE_FONT_REGISTRY'
+
+
+def _tokens(name: str) -> tuple:
+    return tuple(re.findall(r'[a-z0-9]+', name.casefold()))
+
+
+class FreeFontRegistry:
+    """
+    Known free font families and the repository each one is published in.
+
+    A registry file lists repositories, each with a display name, URL
+    templates and its families:
+
+        {"repositories": {"google_fonts": {
+            "name": "Google Fonts",
+            "direct_url": "https://fonts.google.com/specimen/{family_plus}",
+            "download_url": "https://fonts.google.com/download?family={family_plus}",
+            "families": ["Lato", {"family": "Source Sans 3", "aliases": ["Source Sans Pro"]}]
+        }}}
+
+    Templates may use {family}, {family_plus} (URL-encoded) and {slug}
+    ("source-sans-3"); a family object may give its own 'direct_url' and
+    'download_url'. Later files override families of earlier ones.
+
+    Matching, best first: the family name or an alias ('exact'), the
+    family followed by style words ('family+style', "Lato Bold Italic"),
+    then the longest family whose words start the name ('prefix', "Open
+    Sans Hebrew" -> Open Sans). Words must match whole, so "Lato" never
+    matches "Latoya Script" and "Sans" matches nothing.
+    """
+
+    def __init__(self, datas: List[Dict]):
+        self._exact = {}    # normalized name -> entry
+        self._by_first = {}  # first token -> [(tokens, entry)], longest first
+        self._memo = {}
+
+        for data in datas:
+            for repository in data.get('repositories', {}).values():
+                for family in repository.get('families', []):
+                    self._add(repository, family if isinstance(family, dict) else {'family': family})
+
+        for candidates in self._by_first.values():
+            candidates.sort(key=lambda candidate: len(candidate[0]), reverse=True)
+
+    @classmethod
+    def load(cls, paths: Optional[List[str]] = None) -> 'FreeFontRegistry':
+        """
+        Load the registry from JSON files.
+
+        Args:
+            paths: Registry files; defaults to the built-in registry plus
+                any files in $FREE_FONT_REGISTRY
+        """
+        if paths is None:
+            paths = [DEFAULT_REGISTRY_PATH] + [p for p in os.getenv(REGISTRY_ENV, '').split(os.pathsep) if p]
+        datas = []
+        for path in paths:
+            try:
+                with open(path, 'r', encoding='utf-8') as f:
+                    datas.append(json.load(f))
+            except (OSError, ValueError) as e:
+                print(f"Warning: Could not load font registry {path}: {e}")
+        return cls(datas)
+
+    def __len__(self) -> int:
+        return len({id(entry) for entry in self._exact.values()})
+
+    def lookup(self, font_name: str) -> Optional[Dict]:
+        """
+        Find the registry family for a font name.
+
+        Returns:
+            Dictionary with 'family', 'repository', 'direct_url',
+            'download_url' (may be None), 'match' ('exact', 'family+style'
+            or 'prefix') and 'score' (share of the name's words the family
+            covers), or None if no family matches
+        """
+        key = normalize_font_name(font_name)
+        if key not in self._memo:
+            self._memo[key] = self._lookup(font_name, key)
+        return self._memo[key]
+
+    def _lookup(self, font_name: str, key: str) -> Optional[Dict]:
+        entry = self._exact.get(key)
+        if entry:
+            return dict(entry, match='exact', score=1.0)
+
+        entry = self._exact.get(normalize_font_name(parse_font_name(font_name)['family']))
+        if entry:
+            return dict(entry, match='family+style', score=1.0)
+
+        tokens = _tokens(font_name)
+        for family_tokens, entry in self._by_first.get(tokens[0] if tokens else '', ()):
+            if len(family_tokens) < len(tokens) and tokens[:len(family_tokens)] == family_tokens:
+                return dict(entry, match='prefix', score=round(len(family_tokens) / len(tokens), 3))
+        return None
+
+    def _add(self, repository: Dict, family: Dict):
+        name = family['family']
+        values = {
+            'family': name,
+            'family_plus': quote_plus(name),
+            'slug': '-'.join(_tokens(name)),
+        }
+        direct_url = family.get('direct_url') or repository.get('direct_url', '')
+        download_url = family.get('download_url') or repository.get('download_url')
+        entry = {
+            'family': name,
+            'repository': repository.get('name', 'Unknown'),
+            'direct_url': direct_url.format(**values),
+            'download_url': download_url.format(**values) if download_url else None,
+        }
+        for alias in [name] + family.get('aliases', []):
+            self._exact[normalize_font_name(alias)] = entry
+            alias_tokens = _tokens(alias)
+            if alias_tokens:
+                candidates = self._by_first.setdefault(alias_tokens[0], [])
+                candidates[:] = [c for c in candidates if c[0] != alias_tokens]
+                candidates.append((alias_tokens, entry))
+
+
+_default_registry = None
+_default_registry_lock = threading.Lock()
+
+
+def get_free_font_registry() -> FreeFontRegistry:
+    """Return the shared default registry, loading it on first use."""
+    global _default_registry
+    with _default_registry_lock:
+        if _default_registry is None:
+            _default_registry = FreeFontRegistry.load()
+        return _default_registry
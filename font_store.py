@@ -0,0 +1,205 @@
+"""
+Content-addressed storage for extracted font files.
+Identical font files are stored once and linked into each presentation folder.
+"""
+
+import os
+import json
+import shutil
+import hashlib
+import tempfile
+import zipfile
+from pathlib import Path
+from typing import BinaryIO, Dict, Optional, Tuple
+
+
+CHUNK_SIZE = 1024 * 1024
+
+
+class FontStore:
+    """
+    Store font files by SHA-256 so each unique font is written to disk once.
+
+    Blobs live under ``<root>/blobs/<xx>/<sha256>``. Presentation folders get
+    hardlinks to the blobs (or copies where hardlinks are not supported), and
+    ``manifest.jsonl`` records which blobs each presentation uses.
+    """
+
+    def __init__(self, root_dir: str):
+        self.root_dir = Path(root_dir)
+        self.blobs_dir = self.root_dir / "blobs"
+        self.blobs_dir.mkdir(exist_ok=True, parents=True)
+        self.manifest_path = self.root_dir / "manifest.jsonl"
+        # (size, crc32) -> sha256 of blobs seen before, used to skip writes
+        self._crc_index = None
+
+    def blob_path(self, digest: str) -> Path:
+        """Return the path of the blob with the given SHA-256 digest."""
+        return self.blobs_dir / digest[:2] / digest
+
+    def has_blob(self, digest: str) -> bool:
+        """Check whether a blob is already stored."""
+        return self.blob_path(digest).exists()
+
+    def add_stream(self, source: BinaryIO) -> Tuple[str, int]:
+        """
+        Store the contents of a binary stream.
+
+        The stream is hashed while it is written to a temporary file; the
+        temporary file is discarded if a blob with the same hash exists.
+
+        Returns:
+            Tuple of (sha256 hex digest, size in bytes)
+        """
+        sha = hashlib.sha256()
+        size = 0
+        fd, tmp_name = tempfile.mkstemp(dir=self.blobs_dir, prefix='.incoming-')
+        try:
+            with os.fdopen(fd, 'wb') as target:
+                while True:
+                    chunk = source.read(CHUNK_SIZE)
+                    if not chunk:
+                        break
+                    sha.update(chunk)
+                    target.write(chunk)
+                    size += len(chunk)
+
+            digest = sha.hexdigest()
+            final_path = self.blob_path(digest)
+            if final_path.exists():
+                os.unlink(tmp_name)
+            else:
+                final_path.parent.mkdir(exist_ok=True)
+                os.replace(tmp_name, final_path)
+        except BaseException:
+            if os.path.exists(tmp_name):
+                os.unlink(tmp_name)
+            raise
+
+        return digest, size
+
+    def add_file(self, file_path: Path) -> Tuple[str, int]:
+        """Store a font file from disk."""
+        with open(file_path, 'rb') as source:
+            return self.add_stream(source)
+
+    def add_zip_member(self, zip_ref: zipfile.ZipFile, info: zipfile.ZipInfo) -> Tuple[str, int]:
+        """
+        Store a font file from a zip archive.
+
+        If a blob with the same size and CRC-32 was stored before, the member
+        is only hashed to confirm the match and nothing is written.
+        """
+        candidate = self._lookup_crc(info.file_size, info.CRC)
+        if candidate and self.has_blob(candidate):
+            sha = hashlib.sha256()
+            with zip_ref.open(info) as source:
+                for chunk in iter(lambda: source.read(CHUNK_SIZE), b''):
+                    sha.update(chunk)
+            if sha.hexdigest() == candidate:
+                return candidate, info.file_size
+
+        with zip_ref.open(info) as source:
+            digest, size = self.add_stream(source)
+        self._remember_crc(size, info.CRC, digest)
+        return digest, size
+
+    def link_into(self, digest: str, target_path: Path) -> Path:
+        """
+        Make a blob available at target_path.
+
+        Uses a hardlink so no bytes are duplicated, falling back to a copy
+        when the filesystem does not support links.
+        """
+        blob = self.blob_path(digest)
+        target_path = Path(target_path)
+
+        if target_path.exists():
+            try:
+                if os.path.samefile(blob, target_path):
+                    return target_path
+            except OSError:
+                pass
+
+        tmp_target = target_path.with_name(f".{target_path.name}.tmp")
+        if tmp_target.exists():
+            tmp_target.unlink()
+        try:
+            os.link(blob, tmp_target)
+        except OSError:
+            shutil.copyfile(blob, tmp_target)
+        os.replace(tmp_target, target_path)
+        return target_path
+
+    def record_deck(self, deck_path: str, fonts: Dict[str, Dict]):
+        """
+        Append a deck's font mapping to the manifest.
+
+        Args:
+            deck_path: Path of the presentation
+            fonts: Mapping of font file name to {'sha256', 'size', 'crc32'}
+        """
+        entry = {'deck': str(deck_path), 'fonts': fonts}
+        with open(self.manifest_path, 'a', encoding='utf-8') as f:
+            f.write(json.dumps(entry, ensure_ascii=False) + '\n')
+
+        if self._crc_index is not None:
+            for info in fonts.values():
+                if info.get('crc32') is not None:
+                    self._crc_index[(info['size'], info['crc32'])] = info['sha256']
+
+    def load_manifest(self) -> Dict[str, Dict[str, Dict]]:
+        """
+        Load the manifest as {deck path: {font file name: blob info}}.
+
+        Later entries for the same deck replace earlier ones.
+        """
+        decks = {}
+        if not self.manifest_path.exists():
+            return decks
+
+        with open(self.manifest_path, 'r', encoding='utf-8') as f:
+            for line in f:
+                line = line.strip()
+                if not line:
+                    continue
+                try:
+                    entry = json.loads(line)
+                except ValueError:
+                    continue
+                decks[entry['deck']] = entry.get('fonts', {})
+
+        return decks
+
+    def stats(self) -> Dict[str, int]:
+        """Summarize unique blobs versus font references across all decks."""
+        decks = self.load_manifest()
+        unique = {}
+        references = 0
+        referenced_bytes = 0
+        for fonts in decks.values():
+            for info in fonts.values():
+                unique[info['sha256']] = info['size']
+                references += 1
+                referenced_bytes += info['size']
+
+        return {
+            'decks': len(decks),
+            'font_references': references,
+            'unique_fonts': len(unique),
+            'referenced_bytes': referenced_bytes,
+            'stored_bytes': sum(unique.values()),
+        }
+
+    def _lookup_crc(self, size: int, crc: int) -> Optional[str]:
+        if self._crc_index is None:
+            self._crc_index = {}
+            for fonts in self.load_manifest().values():
+                for info in fonts.values():
+                    if info.get('crc32') is not None:
+                        self._crc_index[(info['size'], info['crc32'])] = info['sha256']
+        return self._crc_index.get((size, crc))
+
+    def _remember_crc(self, size: int, crc: int, digest: str):
+        if self._crc_index is not None:
+            self._crc_index[(size, crc)] = digest
@@ -0,0 +1,208 @@
+"""
+Font subsetting for show-kit delivery.
+Cuts fonts down to the characters the presentations actually use, producing
+small delivery copies next to the full originals.
+"""
+
+import os
+import shutil
+import hashlib
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Tuple
+
+try:
+    from fontTools import subset as ft_subset
+    from fontTools.ttLib import TTFont
+except ImportError:
+    ft_subset = None
+    TTFont = None
+
+from font_database import get_font_database, normalize_font_name
+from font_info import read_font_info
+from font_names import parse_font_name
+
+
+# Always kept so small text edits on the show machine still render
+BASIC_LATIN = range(0x20, 0x7F)
+
+DEFAULT_CACHE_DIR = Path.home() / ".cache" / "presentation-toolkit" / "subsets"
+
+
+def _hash_file(path: Path) -> str:
+    sha = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for chunk in iter(lambda: f.read(1024 * 1024), b''):
+            sha.update(chunk)
+    return sha.hexdigest()
+
+
+def _hash_codepoints(codepoints: List[int]) -> str:
+    return hashlib.sha256(','.join(map(str, codepoints)).encode('ascii')).hexdigest()
+
+
+def _font_suffix(font_path: Path) -> str:
+    """Delivery file extension: keep .ttf/.otf, use .ttf for .fntdata and similar."""
+    suffix = font_path.suffix.lower()
+    return suffix if suffix in ('.ttf', '.otf') else '.ttf'
+
+
+def _subset_worker(font_path: str, codepoints: List[int], output_path: str) -> int:
+    """Subset one font in a worker process. Returns the subset size in bytes."""
+    options = ft_subset.Options()
+    options.layout_features = ['*']
+    options.name_IDs = ['*']
+    options.name_languages = ['*']
+    options.notdef_outline = True
+    options.glyph_names = False
+    options.symbol_cmap = True
+    options.legacy_cmap = True
+
+    font = TTFont(font_path, fontNumber=0, lazy=False)
+    try:
+        subsetter = ft_subset.Subsetter(options=options)
+        subsetter.populate(unicodes=codepoints)
+        subsetter.subset(font)
+
+        tmp_path = output_path + '.tmp'
+        font.save(tmp_path)
+        os.replace(tmp_path, output_path)
+    finally:
+        font.close()
+
+    return os.path.getsize(output_path)
+
+
+def plan_subset_jobs(font_files: Iterable[str],
+                     font_codepoints: Dict[str, Iterable[int]]) -> List[Tuple[str, List[int]]]:
+    """
+    Pair font files with the code points of the font names that resolve to them.
+
+    A name matches a file by family, full or PostScript name, or when it is
+    the family followed only by weight and slant words that match the
+    file's own ("Montserrat SemiBold" -> Montserrat SemiBold, but not
+    "Latoya Script" or "Lato Hairline" -> Lato Regular).
+    Files no presentation text uses are left out.
+    """
+    names = [(normalize_font_name(name), parse_font_name(name), codepoints)
+             for name, codepoints in font_codepoints.items()]
+    database = get_font_database()
+    jobs = []
+
+    for font_file in font_files:
+        info = read_font_info(font_file)
+        if not info:
+            continue
+        keys = {normalize_font_name(n) for n in (info.get('full_name'), info.get('postscript_name')) if n}
+        family_key = normalize_font_name(info['family'])
+
+        used = set()
+        for name_key, parsed, codepoints in names:
+            if name_key in keys or name_key == family_key:
+                used.update(codepoints)
+            elif (name_key.startswith(family_key) and
+                  database.is_style_suffix(name_key[len(family_key):], widths=False) and
+                  parsed['weight'] == info.get('weight', parsed['weight']) and
+                  parsed['italic'] == bool(info.get('italic'))):
+                # "Lato Bold Italic" text only needs the bold italic file
+                used.update(codepoints)
+        if used:
+            jobs.append((str(font_file), sorted(used)))
+
+    return jobs
+
+
+class FontSubsetter:
+    """
+    Produce subset copies of fonts in a process pool.
+
+    Subsets are cached by (font file hash, code point set hash), so the same
+    font used with the same text is only subset once across projects.
+    """
+
+    def __init__(self, cache_dir: Optional[str] = None, max_workers: Optional[int] = None,
+                 keep_basic_latin: bool = True):
+        if ft_subset is None:
+            raise RuntimeError("fontTools is required for font subsetting: pip install fonttools")
+        self.cache_dir = Path(cache_dir) if cache_dir else DEFAULT_CACHE_DIR
+        self.cache_dir.mkdir(exist_ok=True, parents=True)
+        self.max_workers = max_workers
+        self.keep_basic_latin = keep_basic_latin
+
+    def subset_fonts(self, jobs: Iterable[tuple], output_dir: Optional[str] = None) -> List[Dict]:
+        """
+        Subset fonts to the given code points.
+
+        All jobs share one process pool, so fonts of many decks can be
+        subset in a single call.
+
+        Args:
+            jobs: (font file path, code points used) pairs, or (font file
+                path, code points used, output folder) triples
+            output_dir: Folder for the subset delivery fonts of jobs that
+                do not name their own
+
+        Returns:
+            One dictionary per job with 'font', 'subset_path', 'original_size',
+            'subset_size', 'codepoints', 'cached' and 'error'
+        """
+        results = []
+        pending = []
+        for job in jobs:
+            font_path, codepoints = Path(job[0]), job[1]
+            job_dir = Path(job[2] if len(job) > 2 else output_dir)
+            job_dir.mkdir(exist_ok=True, parents=True)
+            codepoints = set(codepoints)
+            if self.keep_basic_latin:
+                codepoints.update(BASIC_LATIN)
+            codepoints = sorted(codepoints)
+
+            result = {
+                'font': str(font_path),
+                'subset_path': str(job_dir / (font_path.stem + _font_suffix(font_path))),
+                'original_size': font_path.stat().st_size,
+                'subset_size': None,
+                'codepoints': len(codepoints),
+                'cached': False,
+                'error': None,
+            }
+            results.append(result)
+
+            cache_path = self._cache_path(font_path, codepoints)
+            if cache_path.exists():
+                result['cached'] = True
+                result['subset_size'] = cache_path.stat().st_size
+                self._deliver(cache_path, Path(result['subset_path']))
+            else:
+                pending.append((result, str(font_path), codepoints, cache_path))
+
+        if pending:
+            with ProcessPoolExecutor(max_workers=self.max_workers) as pool:
+                futures = {
+                    pool.submit(_subset_worker, font_path, codepoints, str(cache_path)): (result, cache_path)
+                    for result, font_path, codepoints, cache_path in pending
+                }
+                for future in as_completed(futures):
+                    result, cache_path = futures[future]
+                    try:
+                        result['subset_size'] = future.result()
+                        self._deliver(cache_path, Path(result['subset_path']))
+                    except Exception as e:
+                        result['error'] = str(e)
+                        print(f"Warning: Could not subset {Path(result['font']).name}: {e}")
+
+        return results
+
+    def _cache_path(self, font_path: Path, codepoints: List[int]) -> Path:
+        font_hash = _hash_file(font_path)
+        key = f"{font_hash[:32]}-{_hash_codepoints(codepoints)[:32]}"
+        return self.cache_dir / f"{key}{_font_suffix(font_path)}"
+
+    def _deliver(self, cache_path: Path, target_path: Path):
+        """Hardlink (or copy) a cached subset into the delivery folder."""
+        if target_path.exists():
+            target_path.unlink()
+        try:
+            os.link(cache_path, target_path)
+        except OSError:
+            shutil.copyfile(cache_path, target_path)
@@ -0,0 +1,209 @@
+"""
+Glyph coverage checks.
+Compares the characters each font renders in a presentation against the
+cmap of the embedded, downloaded or installed font that will display them.
+"""
+
+import copy
+import os
+import sys
+import unicodedata
+from pathlib import Path
+from typing import Dict, Iterable, Iterator, List, Optional
+
+from font_database import normalize_font_name
+from font_info import read_font_info
+
+try:
+    from fontTools.ttLib import TTFont
+except ImportError:
+    TTFont = None
+
+
+FONT_EXTENSIONS = ('.ttf', '.otf', '.ttc', '.otc')
+
+
+def system_font_dirs() -> List[Path]:
+    """Return the standard font directories for this platform."""
+    home = Path.home()
+    if sys.platform == 'darwin':
+        dirs = [Path('/System/Library/Fonts'), Path('/Library/Fonts'), home / 'Library' / 'Fonts']
+    elif sys.platform.startswith('win'):
+        windir = Path(os.environ.get('WINDIR', 'C:\\Windows'))
+        dirs = [windir / 'Fonts', home / 'AppData' / 'Local' / 'Microsoft' / 'Windows' / 'Fonts']
+    else:
+        dirs = [Path('/usr/share/fonts'), Path('/usr/local/share/fonts'),
+                home / '.fonts', home / '.local' / 'share' / 'fonts']
+    return [d for d in dirs if d.is_dir()]
+
+
+def codepoint_bits(codepoints: Iterable[int]) -> int:
+    """Pack code points into an integer bitset (bit n set = U+n present)."""
+    codepoints = list(codepoints)
+    if not codepoints:
+        return 0
+    bitmap = bytearray((max(codepoints) >> 3) + 1)
+    for cp in codepoints:
+        bitmap[cp >> 3] |= 1 << (cp & 7)
+    return int.from_bytes(bitmap, 'little')
+
+
+def iter_bits(bits: int) -> Iterator[int]:
+    """Yield the code points set in a bitset, lowest first."""
+    while bits:
+        lowest = bits & -bits
+        yield lowest.bit_length() - 1
+        bits ^= lowest
+
+
+def needs_glyph(cp: int) -> bool:
+    """Whether a code point must be drawn by the font (not whitespace or a control)."""
+    if cp < 0x20 or 0x7F <= cp <= 0x9F:
+        return False
+    char = chr(cp)
+    return not (char.isspace() or unicodedata.category(char) == 'Cf')
+
+
+class GlyphCoverageChecker:
+    """
+    Check whether fonts have glyphs for the text that uses them.
+
+    Font files are indexed by family, full and PostScript name on first use;
+    each file's cmap is read once (lazily, without glyph outlines) and kept
+    as an integer bitset so checks are a single AND-NOT per font.
+    """
+
+    def __init__(self, font_dirs: Optional[List[str]] = None, include_system_fonts: bool = True):
+        self._sources = []
+        for font_dir in font_dirs or []:
+            self._sources.append(('downloaded', Path(font_dir)))
+        if include_system_fonts:
+            for font_dir in system_font_dirs():
+                self._sources.append(('installed', font_dir))
+
+        self._index = None
+        self._cmap_cache = {}
+
+    def add_font_file(self, font_path: str, source: str = 'embedded', info: Optional[Dict] = None):
+        """Register a font file (e.g. an extracted embedded font) for lookups."""
+        self._ensure_index()
+        info = info or read_font_info(font_path)
+        if info:
+            self._register(Path(font_path), source, info, prefer=True)
+
+    def overlay(self) -> 'GlyphCoverageChecker':
+        """
+        Return a checker for one presentation.
+
+        It shares this checker's font index and cmap cache, but fonts added
+        with add_font_file stay in the overlay and never reach other decks.
+        """
+        self._ensure_index()
+        overlay = copy.copy(self)
+        overlay._index = dict(self._index)
+        return overlay
+
+    def check(self, font_codepoints: Dict[str, Iterable[int]]) -> List[Dict]:
+        """
+        Check each font's code points against the font that will render them.
+
+        Args:
+            font_codepoints: Code points used per font name (the
+                'font_codepoints' entry of an extraction result)
+
+        Returns:
+            One dictionary per font with 'font', 'status' ('ok', 'missing_glyphs'
+            or 'font_unavailable'), 'source', 'file', 'checked' and 'missing'
+        """
+        self._ensure_index()
+        report = []
+
+        for font_name, codepoints in sorted(font_codepoints.items()):
+            used = codepoint_bits(cp for cp in codepoints if needs_glyph(cp))
+            entry = {
+                'font': font_name,
+                'status': 'font_unavailable',
+                'source': None,
+                'file': None,
+                'checked': bin(used).count('1'),
+                'missing': [],
+            }
+
+            match = self._index.get(normalize_font_name(font_name))
+            if match:
+                source, font_path = match
+                cmap = self._cmap_bits(font_path)
+                if cmap is not None:
+                    missing = used & ~cmap
+                    entry['source'] = source
+                    entry['file'] = str(font_path)
+                    entry['missing'] = [chr(cp) for cp in iter_bits(missing)]
+                    entry['status'] = 'missing_glyphs' if missing else 'ok'
+
+            report.append(entry)
+
+        return report
+
+    def _ensure_index(self):
+        if self._index is not None:
+            return
+        self._index = {}
+        for source, font_dir in self._sources:
+            for font_path in _walk_fonts(font_dir):
+                info = read_font_info(font_path)
+                if info:
+                    self._register(font_path, source, info)
+
+    def _register(self, font_path: Path, source: str, info: Dict, prefer: bool = False):
+        names = [info.get('family'), info.get('full_name'), info.get('postscript_name')]
+        if info.get('family') and info.get('style'):
+            names.append(f"{info['family']} {info['style']}")
+
+        is_regular = (info.get('style') or '').lower() in ('regular', 'book', 'normal', 'roman')
+        for name in names:
+            if not name:
+                continue
+            key = normalize_font_name(name)
+            # Embedded fonts win; otherwise prefer the regular style of a family
+            if prefer or key not in self._index or (is_regular and name == info.get('family')):
+                self._index[key] = (source, font_path)
+
+    def _cmap_bits(self, font_path: Path) -> Optional[int]:
+        try:
+            stat = font_path.stat()
+        except OSError:
+            return None
+        cache_key = (str(font_path), stat.st_mtime_ns, stat.st_size)
+        if cache_key in self._cmap_cache:
+            return self._cmap_cache[cache_key]
+
+        bits = None
+        if TTFont is not None:
+            try:
+                font = TTFont(str(font_path), lazy=True, fontNumber=0)
+                try:
+                    cmap = font['cmap'].getBestCmap() or {}
+                    bits = codepoint_bits(cmap.keys())
+                finally:
+                    font.close()
+            except Exception as e:
+                print(f"Warning: Could not read cmap of {font_path.name}: {e}")
+
+        self._cmap_cache[cache_key] = bits
+        return bits
+
+
+def _walk_fonts(font_dir: Path) -> Iterator[Path]:
+    """Yield font files below a directory using os.scandir."""
+    stack = [str(font_dir)]
+    while stack:
+        current = stack.pop()
+        try:
+            with os.scandir(current) as entries:
+                for entry in entries:
+                    if entry.is_dir(follow_symlinks=False):
+                        stack.append(entry.path)
+                    elif entry.name.lower().endswith(FONT_EXTENSIONS):
+                        yield Path(entry.path)
+        except OSError:
+            continue
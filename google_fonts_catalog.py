@@ -0,0 +1,345 @@
+"""
+Google Fonts catalog cache and lookup.
+Keeps the webfonts catalog in memory for the whole process and on disk
+between runs, revalidating it with ETag / If-Modified-Since once it is
+older than its time-to-live, and indexes its family names for lookups.
+"""
+
+import os
+import re
+import json
+import time
+import hashlib
+import tempfile
+import threading
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+import requests
+
+from font_database import get_font_database, normalize_font_name
+from http_client import DeadlineExceeded
+
+
+GOOGLE_FONTS_API_URL = 'https://www.googleapis.com/webfonts/v1/webfonts'
+
+# Point the hunter at a mirror or a local stand-in server
+API_URL_ENV = 'GOOGLE_FONTS_API_URL'
+
+DEFAULT_CATALOG_PATH = Path.home() / ".cache" / "presentation-toolkit" / "google_fonts_catalog.json"
+
+# The catalog changes a few times a week; a day old copy is fresh enough
+DEFAULT_TTL = 24 * 60 * 60
+
+CACHE_FORMAT = 2
+
+# After a failed request, don't try again for this long, so an offline hunt
+# does not wait for a timeout on every font
+RETRY_AFTER_FAILURE = 5 * 60
+
+# Only the fields the hunter uses are kept, which makes the cache several
+# times smaller than the API response and quick to load
+CATALOG_FIELDS = ('family', 'category', 'variants', 'files', 'lastModified')
+
+# Fuzzy matches scoring lower are reported as candidates but never chosen
+FUZZY_THRESHOLD = 0.8
+MAX_CANDIDATES = 5
+
+
+def parse_variant(variant: str) -> Tuple[int, bool]:
+    """Read (weight, italic) from a Google Fonts variant ('700italic' -> (700, True))."""
+    digits = re.match(r'\d+', variant)
+    return (int(digits.group()) if digits else 400), 'italic' in variant
+
+
+def variant_key(weight: int, italic: bool) -> str:
+    """Google Fonts variant name for (weight, italic): 'regular', 'italic', '700', '700italic'."""
+    if weight == 400:
+        return 'italic' if italic else 'regular'
+    return f"{weight}italic" if italic else str(weight)
+
+
+def _trigrams(key: str) -> set:
+    """Trigrams of a normalized name, padded so short names and word edges count."""
+    padded = f"^{key}$"
+    return {padded[i:i + 3] for i in range(len(padded) - 2)}
+
+
+class CatalogIndex:
+    """
+    Lookup of catalog families by font name.
+
+    Exact normalized names and family-plus-style names ("Roboto Mono
+    Bold", "OpenSans-SemiboldItalic") are resolved through a hash map.
+    Anything else is ranked by trigram similarity (Dice coefficient) using
+    an inverted trigram index, and only chosen above FUZZY_THRESHOLD, so a
+    query like "Sans" no longer picks the first family containing it.
+    """
+
+    def __init__(self, items: List[Dict]):
+        self.items = items
+        self._exact = {}
+        self._postings = {}  # trigram -> indexes of items
+        self._sizes = []
+        self._memo = {}
+
+        for position, item in enumerate(items):
+            key = normalize_font_name(item['family'])
+            self._exact.setdefault(key, position)
+            grams = _trigrams(key)
+            self._sizes.append(len(grams))
+            for gram in grams:
+                self._postings.setdefault(gram, []).append(position)
+
+    def lookup(self, font_name: str) -> Dict:
+        """
+        Find the catalog family for a font name.
+
+        Returns:
+            Dictionary with 'item' (the chosen catalog entry or None),
+            'family', 'match' ('exact', 'family+style', 'fuzzy' or None),
+            'score' (0-1), 'reason', 'candidates' (ranked
+            {'family', 'score'} alternatives) and 'style' (the normalized
+            style words after the family name, e.g. 'semibolditalic')
+        """
+        key = normalize_font_name(font_name)
+        cached = self._memo.get(key)
+        if cached is None:
+            cached = self._memo[key] = self._lookup_key(key)
+        return cached
+
+    def _lookup_key(self, key: str) -> Dict:
+        if not key:
+            return self._result(None, None, 0.0, "empty font name", [], '')
+
+        position = self._exact.get(key)
+        if position is not None:
+            return self._result(position, 'exact', 1.0, "normalized name equals the family name", [], '')
+
+        # Longest catalog family followed only by weight and slant words; a width
+        # ("Barlow Condensed") is a family of its own, not a style of Barlow
+        database = get_font_database()
+        for end in range(len(key) - 1, 0, -1):
+            position = self._exact.get(key[:end])
+            if position is not None and database.is_style_suffix(key[end:], widths=False):
+                return self._result(position, 'family+style', 1.0,
+                                    f"family name followed by style words ('{key[end:]}')", [], key[end:])
+
+        # Rank by trigram similarity of the name without its style words
+        base = key
+        for start in range(3, len(key)):
+            if database.is_style_suffix(key[start:], widths=False):
+                base = key[:start]
+                break
+        grams = _trigrams(base)
+        shared = {}
+        for gram in grams:
+            for position in self._postings.get(gram, ()):
+                shared[position] = shared.get(position, 0) + 1
+
+        ranked = sorted(((2 * count / (len(grams) + self._sizes[position]), position)
+                         for position, count in shared.items()),
+                        key=lambda pair: (-pair[0], len(self.items[pair[1]]['family']), pair[1]))
+        candidates = [{'family': self.items[position]['family'], 'score': round(score, 3)}
+                      for score, position in ranked[:MAX_CANDIDATES]]
+
+        if ranked and ranked[0][0] >= FUZZY_THRESHOLD:
+            score, position = ranked[0]
+            if len(ranked) > 1 and ranked[1][0] == score:
+                return self._result(None, None, score, "several families are equally similar", candidates,
+                                    key[len(base):])
+            return self._result(position, 'fuzzy', score,
+                                f"closest family by trigram similarity ({score:.2f})", candidates[1:],
+                                key[len(base):])
+        best = f" (best {ranked[0][0]:.2f})" if ranked else ""
+        return self._result(None, None, ranked[0][0] if ranked else 0.0,
+                            f"no family is similar enough{best}", candidates, key[len(base):])
+
+    def _result(self, position: Optional[int], match: Optional[str], score: float, reason: str,
+                 candidates: List[Dict], style: str) -> Dict:
+        item = self.items[position] if position is not None else None
+        return {
+            'item': item,
+            'family': item['family'] if item else None,
+            'match': match,
+            'score': round(score, 3),
+            'reason': reason,
+            'candidates': candidates,
+            'style': style,
+        }
+
+
+class GoogleFontsCatalog:
+    """
+    The Google Fonts family list, cached in memory and on disk.
+
+    A fresh cache (younger than ttl) is used without any request. A stale
+    one is revalidated with a conditional request; if the catalog has not
+    changed (304) or the API cannot be reached, the cached copy is kept,
+    and no new request is made for RETRY_AFTER_FAILURE seconds.
+    """
+
+    def __init__(self, cache_path: Optional[str] = None, ttl: float = DEFAULT_TTL,
+                 api_url: str = GOOGLE_FONTS_API_URL):
+        self.api_url = api_url
+        if cache_path:
+            self.cache_path = Path(cache_path)
+        elif api_url == GOOGLE_FONTS_API_URL:
+            self.cache_path = DEFAULT_CATALOG_PATH
+        else:
+            # Catalogs of other endpoints are cached separately
+            digest = hashlib.sha1(api_url.encode('utf-8')).hexdigest()[:12]
+            self.cache_path = DEFAULT_CATALOG_PATH.with_name(f"google_fonts_catalog-{digest}.json")
+        self.ttl = ttl
+        self._lock = threading.Lock()
+        self._items = None
+        self._etag = None
+        self._last_modified = None
+        self._fetched_at = 0.0
+        self._failed_at = None
+        self._index = None
+
+    def families(self, api_key: str, timeout: float = 10, session=None) -> Optional[List[Dict]]:
+        """
+        Return the catalog entries, fetching or revalidating only when needed.
+
+        Args:
+            api_key: Google Fonts API key
+            timeout: Request timeout in seconds
+            session: Object with a requests-style get() (e.g. an HTTPClient)
+                to send the request through
+
+        Returns:
+            List of family dicts ('family', 'category', 'variants', 'files',
+            'lastModified'), or None if there is no catalog at all
+        """
+        with self._lock:
+            if self._items is None:
+                self._load()
+            if self._items is not None and time.time() - self._fetched_at < self.ttl:
+                return self._items
+            if self._failed_at is not None and time.time() - self._failed_at < RETRY_AFTER_FAILURE:
+                return self._items
+            self._refresh(api_key, timeout, session or requests)
+            return self._items
+
+    def index(self, api_key: str, timeout: float = 10, session=None) -> Optional[CatalogIndex]:
+        """Return the lookup index over the current catalog, rebuilt when it changes."""
+        items = self.families(api_key, timeout, session)
+        if items is None:
+            return None
+        with self._lock:
+            if self._index is None or self._index.items is not items:
+                self._index = CatalogIndex(items)
+            return self._index
+
+    def invalidate(self):
+        """Drop the cached catalog, in memory and on disk."""
+        with self._lock:
+            self._items = None
+            self._etag = self._last_modified = None
+            self._fetched_at = 0.0
+            self._failed_at = None
+            try:
+                self.cache_path.unlink()
+            except FileNotFoundError:
+                pass
+
+    def _refresh(self, api_key: str, timeout: float, session):
+        headers = {}
+        if self._items is not None:
+            if self._etag:
+                headers['If-None-Match'] = self._etag
+            if self._last_modified:
+                headers['If-Modified-Since'] = self._last_modified
+
+        try:
+            response = session.get(self.api_url, params={'key': api_key}, headers=headers, timeout=timeout)
+        except DeadlineExceeded:
+            # The caller ran out of time; the API may be fine
+            return
+        except requests.RequestException as e:
+            if self._items is not None:
+                print(f"Warning: Could not revalidate the Google Fonts catalog, using cached copy: {e}")
+            else:
+                print(f"Warning: Could not download the Google Fonts catalog: {e}")
+            self._failed_at = time.time()
+            return
+
+        if response.status_code == 304 and self._items is not None:
+            self._fetched_at = time.time()
+            self._failed_at = None
+            self._save()
+            return
+        if response.status_code != 200:
+            if self._items is None:
+                print(f"Warning: Google Fonts API returned status {response.status_code}")
+            self._failed_at = time.time()
+            return
+
+        self._items = [{field: item[field] for field in CATALOG_FIELDS if field in item}
+                       for item in response.json().get('items', [])]
+        self._etag = response.headers.get('ETag')
+        self._last_modified = response.headers.get('Last-Modified')
+        self._fetched_at = time.time()
+        self._failed_at = None
+        self._save()
+
+    def _load(self):
+        try:
+            # Plain JSON: a cache file shared or tampered with can't run code when loaded
+            with open(self.cache_path, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+        except FileNotFoundError:
+            return
+        except Exception as e:
+            print(f"Warning: Ignoring unreadable Google Fonts catalog cache: {e}")
+            return
+        if not isinstance(data, dict) or data.get('format') != CACHE_FORMAT or not isinstance(data.get('items'), list):
+            return
+        self._items = data['items']
+        self._etag = data.get('etag')
+        self._last_modified = data.get('last_modified')
+        self._fetched_at = data.get('fetched_at', 0.0)
+
+    def _save(self):
+        """Write the cache atomically, so concurrent processes never read a partial file."""
+        data = {
+            'format': CACHE_FORMAT,
+            'items': self._items,
+            'etag': self._etag,
+            'last_modified': self._last_modified,
+            'fetched_at': self._fetched_at,
+        }
+        try:
+            self.cache_path.parent.mkdir(exist_ok=True, parents=True)
+            fd, tmp_name = tempfile.mkstemp(dir=self.cache_path.parent, prefix='.catalog-')
+            try:
+                with os.fdopen(fd, 'w', encoding='utf-8') as f:
+                    json.dump(data, f, separators=(',', ':'))
+                os.replace(tmp_name, self.cache_path)
+            finally:
+                if os.path.exists(tmp_name):
+                    os.unlink(tmp_name)
+        except OSError as e:
+            print(f"Warning: Could not write the Google Fonts catalog cache: {e}")
+
+
+_catalogs = {}
+_catalogs_lock = threading.Lock()
+
+
+def get_google_fonts_catalog(api_url: Optional[str] = None) -> GoogleFontsCatalog:
+    """
+    Return the catalog shared by every FontHunter in this process.
+
+    Args:
+        api_url: Webfonts API endpoint; defaults to $GOOGLE_FONTS_API_URL or
+            the Google Fonts API
+    """
+    api_url = api_url or os.getenv(API_URL_ENV) or GOOGLE_FONTS_API_URL
+    with _catalogs_lock:
+        catalog = _catalogs.get(api_url)
+        if catalog is None:
+            catalog = _catalogs[api_url] = GoogleFontsCatalog(api_url=api_url)
+        return catalog
@@ -0,0 +1,313 @@
+"""
+Shared HTTP client.
+One pooled, keep-alive requests session for all font lookups and
+downloads, with per-host concurrency and rate limits, retries with
+jittered backoff, a circuit breaker per host and request deadlines.
+"""
+
+import time
+import random
+import threading
+from email.utils import parsedate_to_datetime
+from typing import Dict, Optional
+from urllib.parse import urlsplit
+
+import requests
+from requests.adapters import HTTPAdapter
+
+
+DEFAULT_TIMEOUT = 10
+DEFAULT_MAX_PER_HOST = 4
+
+# Requests per second per host, with bursts of up to RATE_BURST requests
+DEFAULT_RATE_LIMIT = 10.0
+RATE_BURST = 10
+
+DEFAULT_MAX_RETRIES = 3
+BACKOFF_BASE = 0.5
+BACKOFF_MAX = 8.0
+
+# Statuses worth retrying: rate limited or a temporary server problem
+RETRY_STATUSES = (429, 500, 502, 503, 504)
+
+# After this many failures in a row a host is skipped for BREAKER_COOLDOWN seconds
+BREAKER_THRESHOLD = 5
+BREAKER_COOLDOWN = 30.0
+
+USER_AGENT = 'presentation-toolkit (font hunter)'
+
+COUNTERS = ('requests', 'retries', 'errors', 'fast_failures', 'throttled_seconds', 'latency_seconds')
+
+
+class CircuitOpenError(requests.RequestException):
+    """Raised without sending a request while a host's circuit breaker is open."""
+
+
+class DeadlineExceeded(requests.Timeout):
+    """Raised when a request cannot finish before its deadline."""
+
+
+class _HostState:
+    """Limits, breaker state and counters of one host."""
+
+    def __init__(self, max_concurrent: int, rate: Optional[float]):
+        self.slots = threading.BoundedSemaphore(max_concurrent)
+        self.rate = rate
+        self.lock = threading.Lock()
+        self.tokens = float(RATE_BURST)
+        self.refilled_at = time.monotonic()
+        self.failures = 0
+        self.open_until = 0.0
+        self.probing = False
+        self.counters = dict.fromkeys(COUNTERS, 0)
+        self.latency_max = 0.0
+
+    def take_token(self, deadline: Optional[float]):
+        """Wait for a token from the host's token bucket."""
+        if not self.rate:
+            return
+        while True:
+            with self.lock:
+                now = time.monotonic()
+                self.tokens = min(RATE_BURST, self.tokens + (now - self.refilled_at) * self.rate)
+                self.refilled_at = now
+                if self.tokens >= 1:
+                    self.tokens -= 1
+                    return
+                wait = (1 - self.tokens) / self.rate
+                self.counters['throttled_seconds'] += wait
+            if deadline is not None and time.monotonic() + wait > deadline:
+                raise DeadlineExceeded("Deadline reached while waiting for the rate limit")
+            time.sleep(wait)
+
+    def admit(self, host: str):
+        """Fail fast while the breaker is open; let one probe through once it cools down."""
+        with self.lock:
+            if self.open_until == 0.0:
+                return
+            if time.monotonic() < self.open_until or self.probing:
+                self.counters['fast_failures'] += 1
+                raise CircuitOpenError(f"{host} is failing, not retrying for now")
+            self.probing = True
+
+    def end_probe(self):
+        with self.lock:
+            self.probing = False
+
+    def record(self, ok: bool, host: str):
+        with self.lock:
+            self.probing = False
+            if ok:
+                self.failures = 0
+                self.open_until = 0.0
+                return
+            self.failures += 1
+            if self.failures >= BREAKER_THRESHOLD:
+                if self.open_until == 0.0 or time.monotonic() >= self.open_until:
+                    print(f"Warning: {host} failed {self.failures} times in a row, pausing requests for "
+                          f"{BREAKER_COOLDOWN:.0f}s")
+                self.open_until = time.monotonic() + BREAKER_COOLDOWN
+
+
+class HTTPClient:
+    """
+    Thread-safe GET client with connection pooling and per-host protection.
+
+    Connections are kept alive in the session's pool, so hunting many
+    fonts costs one TLS handshake per host and worker instead of one per
+    request. Per host, at most max_per_host requests run at a time and a
+    token bucket spaces them to rate_limit per second.
+
+    Connection errors, timeouts and retryable statuses (429, 5xx) are
+    retried with exponential backoff and full jitter, honoring Retry-After.
+    After BREAKER_THRESHOLD failures in a row a host's circuit breaker
+    opens: requests to it fail at once with CircuitOpenError until the
+    cooldown has passed and a probe request succeeds.
+    """
+
+    def __init__(self, max_per_host: int = DEFAULT_MAX_PER_HOST, timeout: float = DEFAULT_TIMEOUT,
+                 host_limits: Optional[Dict[str, int]] = None, rate_limit: Optional[float] = DEFAULT_RATE_LIMIT,
+                 max_retries: int = DEFAULT_MAX_RETRIES):
+        """
+        Args:
+            max_per_host: Concurrent requests allowed per host
+            timeout: Default request timeout in seconds
+            host_limits: Per-host overrides of max_per_host ({'fonts.gstatic.com': 8})
+            rate_limit: Requests per second per host (None for no limit)
+            max_retries: Retries after the first attempt of a request
+        """
+        self.max_per_host = max_per_host
+        self.timeout = timeout
+        self.host_limits = dict(host_limits or {})
+        self.rate_limit = rate_limit
+        self.max_retries = max_retries
+        self._hosts = {}
+        self._hosts_lock = threading.Lock()
+
+        pool_size = max([max_per_host] + list(self.host_limits.values()))
+        self.session = requests.Session()
+        self.session.headers['User-Agent'] = USER_AGENT
+        adapter = HTTPAdapter(pool_connections=16, pool_maxsize=pool_size)
+        self.session.mount('https://', adapter)
+        self.session.mount('http://', adapter)
+
+    def get(self, url: str, deadline: Optional[float] = None, **kwargs) -> requests.Response:
+        """
+        Send a GET request through the pool (same arguments as requests.get).
+
+        Args:
+            url: URL to fetch
+            deadline: time.monotonic() value by which the request, including
+                retries, must be done
+
+        Returns:
+            The response; after the last retry this may still be a 429/5xx
+
+        Raises:
+            CircuitOpenError: The host's circuit breaker is open
+            DeadlineExceeded: The deadline passed before a response arrived
+            requests.RequestException: The request failed on every attempt
+        """
+        host = urlsplit(url).netloc.lower()
+        state = self._host(host)
+        timeout = kwargs.pop('timeout', self.timeout)
+
+        attempt = 0
+        while True:
+            if deadline is not None and deadline <= time.monotonic():
+                raise DeadlineExceeded(f"Deadline reached before requesting {url}")
+            state.take_token(deadline)
+            state.admit(host)
+            attempt_timeout = timeout if deadline is None else min(timeout, deadline - time.monotonic())
+
+            response, error = None, None
+            started = time.monotonic()
+            try:
+                with state.slots:
+                    response = self.session.get(url, timeout=max(attempt_timeout, 0.001), **kwargs)
+            except (requests.ConnectionError, requests.Timeout) as e:
+                error = e
+            except BaseException:
+                # Not the host's fault (e.g. an invalid URL): don't count it against the breaker
+                state.end_probe()
+                raise
+            finally:
+                self._count(state, time.monotonic() - started, failed=response is None)
+
+            retryable = response is None or response.status_code in RETRY_STATUSES
+            state.record(not retryable, host)
+            if not retryable:
+                return response
+
+            delay = self._retry_delay(attempt, response)
+            give_up = attempt >= self.max_retries or (deadline is not None and time.monotonic() + delay >= deadline)
+            if give_up:
+                if response is not None:
+                    return response
+                if deadline is not None and time.monotonic() >= deadline:
+                    raise DeadlineExceeded(f"Deadline reached while requesting {url}") from error
+                raise error
+
+            with state.lock:
+                state.counters['retries'] += 1
+            time.sleep(delay)
+            attempt += 1
+
+    def with_deadline(self, deadline: Optional[float]) -> '_DeadlineSession':
+        """Return a requests-style object whose get() always uses this deadline."""
+        return _DeadlineSession(self, deadline)
+
+    def stats(self) -> Dict:
+        """
+        Return request counters per host and in total.
+
+        Returns:
+            Dictionary with 'hosts' ({host: counters}) and 'totals'; counters
+            are 'requests', 'retries', 'errors' (connection errors and
+            timeouts), 'fast_failures' (refused by an open breaker),
+            'throttled_seconds', 'latency_seconds' (summed), 'latency_avg'
+            and, per host, 'latency_max' and 'circuit_open'
+        """
+        with self._hosts_lock:
+            hosts = dict(self._hosts)
+        now = time.monotonic()
+        result = {'hosts': {}, 'totals': dict.fromkeys(COUNTERS, 0)}
+        for host, state in hosts.items():
+            with state.lock:
+                counters = dict(state.counters, latency_max=round(state.latency_max, 3),
+                                circuit_open=state.open_until > now)
+            for key in COUNTERS:
+                result['totals'][key] += counters[key]
+            result['hosts'][host] = _with_average(counters)
+        result['totals'] = _with_average(result['totals'])
+        return result
+
+    def close(self):
+        self.session.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def _host(self, host: str) -> _HostState:
+        with self._hosts_lock:
+            state = self._hosts.get(host)
+            if state is None:
+                state = _HostState(self.host_limits.get(host, self.max_per_host), self.rate_limit)
+                self._hosts[host] = state
+            return state
+
+    @staticmethod
+    def _count(state: _HostState, latency: float, failed: bool):
+        with state.lock:
+            state.counters['requests'] += 1
+            state.counters['latency_seconds'] += latency
+            state.latency_max = max(state.latency_max, latency)
+            if failed:
+                state.counters['errors'] += 1
+
+    @staticmethod
+    def _retry_delay(attempt: int, response: Optional[requests.Response]) -> float:
+        """Retry-After if the server sent one, else exponential backoff with full jitter."""
+        if response is not None and response.headers.get('Retry-After'):
+            value = response.headers['Retry-After']
+            try:
+                return min(BACKOFF_MAX, max(0.0, float(value)))
+            except ValueError:
+                try:
+                    return min(BACKOFF_MAX, max(0.0, parsedate_to_datetime(value).timestamp() - time.time()))
+                except (TypeError, ValueError):
+                    pass
+        return random.uniform(0, min(BACKOFF_MAX, BACKOFF_BASE * 2 ** attempt))
+
+
+class _DeadlineSession:
+    def __init__(self, client: HTTPClient, deadline: Optional[float]):
+        self.client = client
+        self.deadline = deadline
+
+    def get(self, url: str, **kwargs) -> requests.Response:
+        return self.client.get(url, deadline=self.deadline, **kwargs)
+
+
+def _with_average(counters: Dict) -> Dict:
+    counters['throttled_seconds'] = round(counters['throttled_seconds'], 3)
+    counters['latency_avg'] = round(counters['latency_seconds'] / counters['requests'], 3) if counters['requests'] else 0.0
+    counters['latency_seconds'] = round(counters['latency_seconds'], 3)
+    return counters
+
+
+def stats_delta(before: Dict, after: Dict) -> Dict:
+    """Counters of HTTPClient.stats() accumulated between two snapshots."""
+    def subtract(new: Dict, old: Dict) -> Dict:
+        delta = {key: round(new[key] - old.get(key, 0), 3) for key in COUNTERS}
+        return _with_average(delta)
+
+    hosts = {}
+    for host, counters in after['hosts'].items():
+        delta = subtract(counters, before['hosts'].get(host, {}))
+        if delta['requests'] or delta['fast_failures']:
+            hosts[host] = dict(delta, latency_max=counters['latency_max'], circuit_open=counters['circuit_open'])
+    return {'hosts': hosts, 'totals': subtract(after['totals'], before['totals'])}
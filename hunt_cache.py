@@ -0,0 +1,152 @@
+"""
+Hunt result cache.
+Remembers how each font name was resolved (a Google Fonts family, a free
+repository link, or commercial) so recurring templates are not searched
+again on every hunt.
+"""
+
+import json
+import time
+import sqlite3
+import threading
+from pathlib import Path
+from typing import Dict, Optional, Tuple
+
+from font_database import normalize_font_name
+
+
+DEFAULT_RESULTS_PATH = Path.home() / ".cache" / "presentation-toolkit" / "hunt_results.sqlite"
+
+DAY = 24 * 60 * 60
+
+# How long each outcome is trusted. Google Fonts families rarely disappear;
+# free repository links and "commercial" verdicts are checked again sooner
+# in case a family was added to Google Fonts.
+DEFAULT_TTLS = {
+    'google_fonts_downloaded': 30 * DAY,
+    'free_fonts_found': 7 * DAY,
+    'commercial_fonts': 14 * DAY,
+}
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS results (
+    name_key TEXT NOT NULL,
+    source TEXT NOT NULL,
+    category TEXT NOT NULL,
+    result TEXT NOT NULL,
+    created_at REAL NOT NULL,
+    expires_at REAL NOT NULL,
+    PRIMARY KEY (name_key, source)
+);
+CREATE INDEX IF NOT EXISTS results_expires_at ON results (expires_at);
+"""
+
+
+class HuntResultCache:
+    """
+    Persistent map from normalized font names to hunt outcomes.
+
+    Entries are keyed by the normalized name and the catalog source (the
+    webfonts API URL), so a mirror or test server never answers for the
+    real API. Each outcome category has its own time-to-live; expired
+    entries are ignored and pruned. Results are stored as JSON.
+    """
+
+    def __init__(self, db_path: Optional[str] = None, ttls: Optional[Dict[str, float]] = None):
+        """
+        Args:
+            db_path: SQLite file; defaults to the user cache directory
+            ttls: Seconds to keep each category, overriding DEFAULT_TTLS
+        """
+        self.db_path = Path(db_path) if db_path else DEFAULT_RESULTS_PATH
+        self.db_path.parent.mkdir(exist_ok=True, parents=True)
+        self.ttls = dict(DEFAULT_TTLS, **(ttls or {}))
+
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(str(self.db_path), timeout=30, check_same_thread=False)
+        self._conn.row_factory = sqlite3.Row
+        self._conn.execute("PRAGMA journal_mode = WAL")
+        self._conn.execute("PRAGMA synchronous = NORMAL")
+        self._conn.executescript(SCHEMA)
+
+    def close(self):
+        self._conn.close()
+
+    def get(self, font_name: str, source: str) -> Optional[Tuple[str, Dict]]:
+        """
+        Look up a remembered outcome.
+
+        Returns:
+            Tuple of (category, result), or None if the name is unknown or
+            its entry has expired
+        """
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT category, result FROM results WHERE name_key = ? AND source = ? AND expires_at > ?",
+                (normalize_font_name(font_name), source, time.time())
+            ).fetchone()
+        if row is None:
+            return None
+        return row['category'], json.loads(row['result'])
+
+    def put(self, font_name: str, source: str, category: str, result: Dict):
+        """Remember an outcome for the category's time-to-live."""
+        ttl = self.ttls.get(category)
+        if not ttl:
+            return
+        now = time.time()
+        with self._lock, self._conn:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO results (name_key, source, category, result, created_at, expires_at) "
+                "VALUES (?, ?, ?, ?, ?, ?)",
+                (normalize_font_name(font_name), source, category, json.dumps(result), now, now + ttl)
+            )
+
+    def forget(self, font_name: Optional[str] = None) -> int:
+        """
+        Drop remembered outcomes for one font name, or all of them.
+
+        Returns:
+            Number of entries removed
+        """
+        with self._lock, self._conn:
+            if font_name is None:
+                cursor = self._conn.execute("DELETE FROM results")
+            else:
+                cursor = self._conn.execute("DELETE FROM results WHERE name_key = ?",
+                                            (normalize_font_name(font_name),))
+            return cursor.rowcount
+
+    def prune(self) -> int:
+        """Delete expired entries; returns how many were removed."""
+        with self._lock, self._conn:
+            return self._conn.execute("DELETE FROM results WHERE expires_at <= ?", (time.time(),)).rowcount
+
+    def stats(self) -> Dict[str, int]:
+        """Return the number of live entries per category and of expired ones."""
+        now = time.time()
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT category, SUM(expires_at > ?) AS live, SUM(expires_at <= ?) AS expired "
+                "FROM results GROUP BY category", (now, now)
+            ).fetchall()
+        stats = {category: 0 for category in self.ttls}
+        stats['expired'] = 0
+        for row in rows:
+            stats[row['category']] = row['live']
+            stats['expired'] += row['expired']
+        return stats
+
+
+_default_cache = None
+_default_cache_lock = threading.Lock()
+
+
+def get_hunt_result_cache() -> HuntResultCache:
+    """Return the result cache shared by every FontHunter in this process."""
+    global _default_cache
+    with _default_cache_lock:
+        if _default_cache is None:
+            _default_cache = HuntResultCache()
+            _default_cache.prune()
+        return _default_cache
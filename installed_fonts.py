@@ -0,0 +1,95 @@
+"""
+Installed font inventory.
+Knows which fonts are installed on this machine, so the font hunter does
+not search the web for fonts the playback machine already has.
+"""
+
+import hashlib
+import threading
+from pathlib import Path
+from typing import Dict, List, Optional
+
+from font_mirror import DEFAULT_INDEX_DIR, FontMirror
+from glyph_coverage import system_font_dirs
+
+
+class InstalledFonts:
+    """
+    Fonts in the system font directories and any extra folders.
+
+    Each directory is indexed like a font mirror: name and OS/2 tables
+    only, parsed in parallel worker processes, cached on disk and
+    rescanned incrementally from directory mtimes, so checking an
+    unchanged system costs a stat() per directory.
+    """
+
+    def __init__(self, extra_dirs: Optional[List[str]] = None, include_system_fonts: bool = True,
+                 max_workers: Optional[int] = None):
+        """
+        Args:
+            extra_dirs: Additional font folders (e.g. a show's font share)
+            include_system_fonts: Whether to index the platform's font directories
+            max_workers: Worker processes for parsing fonts
+        """
+        dirs = list(system_font_dirs()) if include_system_fonts else []
+        dirs += [Path(d) for d in extra_dirs or []]
+
+        self.mirrors = []
+        seen = set()
+        for font_dir in dirs:
+            if not font_dir.is_dir():
+                print(f"Warning: Font folder {font_dir} does not exist, skipping")
+                continue
+            root = font_dir.resolve()
+            if root in seen:
+                continue
+            seen.add(root)
+            digest = hashlib.sha1(str(root).encode('utf-8')).hexdigest()[:12]
+            self.mirrors.append(FontMirror(root, index_path=DEFAULT_INDEX_DIR / f"installed_fonts-{digest}.json",
+                                           max_workers=max_workers))
+
+    @property
+    def dirs(self) -> List[Path]:
+        return [mirror.root for mirror in self.mirrors]
+
+    def fonts(self, revalidate: bool = False) -> List[Dict]:
+        """
+        Return the info of every installed font file (see FontMirror.fonts).
+
+        Directories are scanned on first use, or rescanned for changes when
+        revalidate is True.
+        """
+        found = []
+        for mirror in self.mirrors:
+            try:
+                found.extend(mirror.fonts(revalidate))
+            except OSError as e:
+                print(f"Warning: Could not index fonts in {mirror.root}: {e}")
+        return found
+
+    def refresh(self) -> Dict[str, int]:
+        """Rescan all font directories; returns the summed FontMirror.refresh counts."""
+        totals = {'directories': 0, 'changed': 0, 'parsed': 0, 'fonts': 0}
+        for mirror in self.mirrors:
+            try:
+                stats = mirror.refresh()
+            except OSError as e:
+                print(f"Warning: Could not index fonts in {mirror.root}: {e}")
+                continue
+            for key in totals:
+                totals[key] += stats[key]
+        return totals
+
+
+_installed = {}
+_installed_lock = threading.Lock()
+
+
+def get_installed_fonts(extra_dirs: Optional[List[str]] = None) -> InstalledFonts:
+    """Return the installed font inventory shared by every FontHunter in this process."""
+    key = tuple(str(Path(d).resolve()) for d in extra_dirs or [])
+    with _installed_lock:
+        installed = _installed.get(key)
+        if installed is None:
+            installed = _installed[key] = InstalledFonts(list(key))
+        return installed
@@ -0,0 +1,321 @@
+"""
+Keynote IWA (iWork Archive) reader.
+Decodes the snappy-framed protobuf archives inside Keynote documents and
+pulls font names out of the character and paragraph style records.
+"""
+
+import os
+import zipfile
+from pathlib import Path
+from typing import Dict, Iterator, Optional, Set, Tuple
+
+try:
+    import snappy as _snappy
+except ImportError:  # pure-Python fallback below
+    _snappy = None
+
+
+# TSP registry message types that carry character properties
+CHARACTER_STYLE_ARCHIVE = 2021  # TSWP.CharacterStyleArchive
+PARAGRAPH_STYLE_ARCHIVE = 2022  # TSWP.ParagraphStyleArchive
+STYLE_ARCHIVE_TYPES = {CHARACTER_STYLE_ARCHIVE, PARAGRAPH_STYLE_ARCHIVE}
+
+# Field numbers
+STYLE_CHAR_PROPERTIES = 11      # {Character,Paragraph}StyleArchive.char_properties
+CHAR_PROPERTY_BOLD = 1          # CharacterStylePropertiesArchive.bold
+CHAR_PROPERTY_ITALIC = 2        # CharacterStylePropertiesArchive.italic
+CHAR_PROPERTY_FONT_NAME = 5     # CharacterStylePropertiesArchive.font_name
+
+ARCHIVE_INFO_IDENTIFIER = 1     # ArchiveInfo.identifier
+ARCHIVE_INFO_MESSAGE_INFOS = 2  # ArchiveInfo.message_infos
+MESSAGE_INFO_TYPE = 1           # MessageInfo.type
+MESSAGE_INFO_LENGTH = 3         # MessageInfo.length
+
+# Protobuf wire types
+WIRE_VARINT = 0
+WIRE_FIXED64 = 1
+WIRE_LENGTH_DELIMITED = 2
+WIRE_FIXED32 = 5
+
+
+class IWAError(ValueError):
+    """Raised when an IWA archive is malformed."""
+
+
+def read_varint(data: bytes, pos: int) -> Tuple[int, int]:
+    """Read a protobuf varint, returning (value, new position)."""
+    result = 0
+    shift = 0
+    while True:
+        if pos >= len(data):
+            raise IWAError("Truncated varint")
+        byte = data[pos]
+        pos += 1
+        result |= (byte & 0x7F) << shift
+        if not byte & 0x80:
+            return result, pos
+        shift += 7
+        if shift > 63:
+            raise IWAError("Varint too long")
+
+
+def snappy_decompress(data: bytes) -> bytes:
+    """Decompress a raw snappy block (python-snappy is used when installed)."""
+    if _snappy is not None:
+        return _snappy.uncompress(data)
+
+    expected, pos = read_varint(data, 0)
+    out = bytearray()
+    end = len(data)
+
+    while pos < end:
+        tag = data[pos]
+        pos += 1
+        kind = tag & 0x03
+
+        if kind == 0:
+            # Literal
+            length = tag >> 2
+            if length >= 60:
+                extra = length - 59
+                length = int.from_bytes(data[pos:pos + extra], 'little')
+                pos += extra
+            length += 1
+            out += data[pos:pos + length]
+            pos += length
+            continue
+
+        if kind == 1:
+            length = ((tag >> 2) & 0x07) + 4
+            offset = ((tag >> 5) << 8) | data[pos]
+            pos += 1
+        elif kind == 2:
+            length = (tag >> 2) + 1
+            offset = int.from_bytes(data[pos:pos + 2], 'little')
+            pos += 2
+        else:
+            length = (tag >> 2) + 1
+            offset = int.from_bytes(data[pos:pos + 4], 'little')
+            pos += 4
+
+        if offset == 0 or offset > len(out):
+            raise IWAError("Invalid snappy copy offset")
+
+        start = len(out) - offset
+        if offset >= length:
+            out += out[start:start + length]
+        else:
+            # Overlapping copy repeats the last `offset` bytes
+            pattern = out[start:]
+            out += (pattern * (length // offset + 1))[:length]
+
+    if len(out) != expected:
+        raise IWAError("Snappy length mismatch")
+    return bytes(out)
+
+
+def decompress_iwa(data: bytes) -> bytes:
+    """
+    Undo IWA chunk framing.
+
+    Each chunk is a 0x00 byte, a 3-byte little-endian length and a snappy
+    block (without the CRC used by the standard snappy framing format).
+    """
+    chunks = []
+    pos = 0
+    end = len(data)
+    while pos < end:
+        if end - pos < 4 or data[pos] != 0:
+            raise IWAError("Invalid IWA chunk header")
+        length = int.from_bytes(data[pos + 1:pos + 4], 'little')
+        pos += 4
+        chunks.append(snappy_decompress(data[pos:pos + length]))
+        pos += length
+    return b''.join(chunks)
+
+
+def iter_fields(data: bytes) -> Iterator[Tuple[int, int, object]]:
+    """
+    Iterate over the fields of a protobuf message without a schema.
+
+    Yields:
+        Tuples of (field number, wire type, value); value is an int for
+        varints and bytes for everything else
+    """
+    pos = 0
+    end = len(data)
+    while pos < end:
+        key, pos = read_varint(data, pos)
+        field_number = key >> 3
+        wire_type = key & 0x07
+
+        if wire_type == WIRE_VARINT:
+            value, pos = read_varint(data, pos)
+        elif wire_type == WIRE_LENGTH_DELIMITED:
+            length, pos = read_varint(data, pos)
+            value = data[pos:pos + length]
+            pos += length
+        elif wire_type == WIRE_FIXED64:
+            value = data[pos:pos + 8]
+            pos += 8
+        elif wire_type == WIRE_FIXED32:
+            value = data[pos:pos + 4]
+            pos += 4
+        else:
+            raise IWAError(f"Unsupported wire type {wire_type}")
+
+        if pos > end:
+            raise IWAError("Truncated protobuf field")
+        yield field_number, wire_type, value
+
+
+def iter_objects(data: bytes) -> Iterator[Tuple[int, int, bytes]]:
+    """
+    Iterate over the objects in a decompressed IWA stream.
+
+    The stream is a sequence of archives: a varint-prefixed ArchiveInfo
+    (object identifier and MessageInfos) followed by the payloads listed
+    in its MessageInfos.
+
+    Yields:
+        Tuples of (object identifier, message type, payload bytes)
+    """
+    pos = 0
+    end = len(data)
+    while pos < end:
+        info_length, pos = read_varint(data, pos)
+        archive_info = data[pos:pos + info_length]
+        pos += info_length
+
+        identifier = 0
+        for field_number, wire_type, value in iter_fields(archive_info):
+            if field_number == ARCHIVE_INFO_IDENTIFIER and wire_type == WIRE_VARINT:
+                identifier = value
+                continue
+            if field_number != ARCHIVE_INFO_MESSAGE_INFOS or wire_type != WIRE_LENGTH_DELIMITED:
+                continue
+
+            message_type = 0
+            message_length = 0
+            for info_field, _, info_value in iter_fields(value):
+                if info_field == MESSAGE_INFO_TYPE:
+                    message_type = info_value
+                elif info_field == MESSAGE_INFO_LENGTH:
+                    message_length = info_value
+
+            yield identifier, message_type, data[pos:pos + message_length]
+            pos += message_length
+
+
+def iter_messages(data: bytes) -> Iterator[Tuple[int, bytes]]:
+    """
+    Iterate over the messages in a decompressed IWA stream.
+
+    Yields:
+        Tuples of (message type, payload bytes)
+    """
+    for _, message_type, payload in iter_objects(data):
+        yield message_type, payload
+
+
+def read_font_records(iwa_data: bytes) -> Iterator[Dict]:
+    """
+    Extract font records from a compressed .iwa file.
+
+    Yields:
+        Dictionaries with 'font_name', 'bold', 'italic' and 'style_type'
+        for every style that sets a font
+    """
+    for message_type, payload in iter_messages(decompress_iwa(iwa_data)):
+        if message_type not in STYLE_ARCHIVE_TYPES:
+            continue
+
+        for field_number, wire_type, value in iter_fields(payload):
+            if field_number != STYLE_CHAR_PROPERTIES or wire_type != WIRE_LENGTH_DELIMITED:
+                continue
+
+            record = {'font_name': None, 'bold': None, 'italic': None, 'style_type': message_type}
+            for prop_field, prop_wire, prop_value in iter_fields(value):
+                if prop_field == CHAR_PROPERTY_FONT_NAME and prop_wire == WIRE_LENGTH_DELIMITED:
+                    record['font_name'] = prop_value.decode('utf-8', errors='replace').strip()
+                elif prop_field == CHAR_PROPERTY_BOLD and prop_wire == WIRE_VARINT:
+                    record['bold'] = bool(prop_value)
+                elif prop_field == CHAR_PROPERTY_ITALIC and prop_wire == WIRE_VARINT:
+                    record['italic'] = bool(prop_value)
+
+            if record['font_name']:
+                yield record
+
+
+class KeynoteArchive:
+    """
+    Stream the IWA archives of a Keynote document.
+
+    Supports single-file (.key zip) documents and package directories with
+    either an Index.zip or an Index/ folder. Media under Data/ is never read.
+    """
+
+    def __init__(self, keynote_path: str):
+        self.path = Path(keynote_path)
+
+    def iter_iwa_files(self, only: Optional[Set[str]] = None) -> Iterator[Tuple[str, bytes]]:
+        """
+        Yield (name, raw bytes) for every .iwa file in the document.
+
+        Args:
+            only: If given, only archives with these file names
+                (e.g. {'Document.iwa'}) are read
+        """
+        if self.path.is_dir():
+            yield from self._iter_package(only)
+        else:
+            with zipfile.ZipFile(self.path, 'r') as zip_ref:
+                yield from self._iter_zip(zip_ref, only)
+
+    def font_records(self) -> Iterator[Dict]:
+        """Yield font records from every archive, skipping unreadable ones."""
+        for name, data in self.iter_iwa_files():
+            try:
+                for record in read_font_records(data):
+                    record['archive'] = name
+                    yield record
+            except IWAError as e:
+                print(f"Warning: Could not decode {name}: {e}")
+
+    def font_names(self) -> Set[str]:
+        """Return the exact font names used by the document's styles."""
+        return {record['font_name'] for record in self.font_records()}
+
+    def _iter_zip(self, zip_ref: zipfile.ZipFile, only: Optional[Set[str]] = None) -> Iterator[Tuple[str, bytes]]:
+        for info in zip_ref.infolist():
+            name = info.filename
+            if not name.endswith('.iwa') or name.startswith('Data/'):
+                continue
+            if only is None or name.rsplit('/', 1)[-1] in only:
+                yield name, zip_ref.read(info)
+
+    def _iter_package(self, only: Optional[Set[str]] = None) -> Iterator[Tuple[str, bytes]]:
+        index_zip = None
+        iwa_paths = []
+
+        # One scandir walk over the package; Data/ holds media and is skipped
+        stack = [self.path]
+        while stack:
+            current = stack.pop()
+            with os.scandir(current) as entries:
+                for entry in entries:
+                    if entry.is_dir(follow_symlinks=False):
+                        if entry.name != 'Data':
+                            stack.append(entry.path)
+                    elif entry.name == 'Index.zip':
+                        index_zip = entry.path
+                    elif entry.name.endswith('.iwa') and (only is None or entry.name in only):
+                        iwa_paths.append(entry.path)
+
+        for iwa_path in sorted(iwa_paths):
+            with open(iwa_path, 'rb') as f:
+                yield os.path.relpath(iwa_path, self.path), f.read()
+
+        if index_zip:
+            with zipfile.ZipFile(index_zip, 'r') as zip_ref:
+                yield from self._iter_zip(zip_ref, only)
@@ -0,0 +1,222 @@
+"""
+Keynote slide previews.
+Streams the preview images Keynote stores inside every document (the
+document preview and the per-slide thumbnails) without rendering anything.
+"""
+
+import os
+import re
+import shutil
+import zipfile
+from pathlib import Path
+from typing import Dict, List
+
+from keynote_iwa import (IWAError, KeynoteArchive, WIRE_LENGTH_DELIMITED, WIRE_VARINT,
+                         decompress_iwa, iter_fields, iter_objects)
+
+
+SLIDE_NODE_ARCHIVE = 4  # KN.SlideNodeArchive
+
+# Document-level previews, best first (Keynote 6+ and Keynote '09 QuickLook)
+DOCUMENT_PREVIEWS = ('preview.jpg', 'preview-web.jpg', 'preview-micro.jpg',
+                     'QuickLook/Preview.jpg', 'QuickLook/Thumbnail.jpg')
+
+# Data/st-<uuid>-<data id>.jpg (Keynote 6+) and thumbs/st<index>.tiff (Keynote '09)
+SLIDE_THUMBNAIL = re.compile(r'^Data/st-.*-(\d+)\.\w+$')
+LEGACY_SLIDE_THUMBNAIL = re.compile(r'^thumbs/st(\d+)\.\w+$')
+
+
+def _references(payload: bytes) -> List[int]:
+    """
+    Return the identifiers of the reference fields of a message, in order.
+
+    References (TSP.Reference, TSP.DataReference) are embedded messages
+    holding only field 1 with an identifier, so they can be found without
+    the schema.
+    """
+    references = []
+    for _, wire_type, value in iter_fields(payload):
+        if wire_type != WIRE_LENGTH_DELIMITED or not value:
+            continue
+        try:
+            fields = list(iter_fields(value))
+        except IWAError:
+            continue
+        if len(fields) == 1 and fields[0][0] == 1 and fields[0][1] == WIRE_VARINT:
+            references.append(fields[0][2])
+    return references
+
+
+class KeynotePreviews:
+    """
+    List and extract the preview images of a Keynote document.
+
+    Works on single-file (.key zip) documents and package directories. Only
+    the preview entries themselves and Document.iwa (for the slide order)
+    are read; slide thumbnails are matched to slide numbers by walking the
+    slide tree. Thumbnails that cannot be placed keep slide None.
+    """
+
+    def __init__(self, keynote_path: str):
+        self.path = Path(keynote_path)
+        self._entries = None
+
+    def list_previews(self) -> List[Dict]:
+        """
+        List the preview images in the document.
+
+        Returns:
+            Dictionaries with 'name' (entry name), 'kind' ('document' or
+            'slide'), 'slide' (1-based number or None) and 'size', document
+            previews first, then slides in order
+        """
+        entries = self._list_entries()
+        previews = []
+
+        for name in DOCUMENT_PREVIEWS:
+            if name in entries:
+                previews.append({'name': name, 'kind': 'document', 'slide': None, 'size': entries[name]})
+
+        thumbnails = {}  # data id or legacy index -> entry names
+        legacy = False
+        for name in entries:
+            match = SLIDE_THUMBNAIL.match(name)
+            if not match:
+                match = LEGACY_SLIDE_THUMBNAIL.match(name)
+                legacy = legacy or bool(match)
+            if match:
+                thumbnails.setdefault(int(match.group(1)), []).append(name)
+
+        if legacy:
+            # Keynote '09 numbers thumbnails in slide order
+            slide_numbers = {index: index + 1 for index in thumbnails}
+        else:
+            slide_numbers = self._slide_numbers(set(thumbnails))
+
+        # Several sizes may exist for one slide; keep the largest
+        groups = {}
+        for key, names in thumbnails.items():
+            slide = slide_numbers.get(key)
+            groups.setdefault(('slide', slide) if slide else ('data', key), []).extend(names)
+
+        slides = []
+        for (kind, key), names in groups.items():
+            name = max(names, key=lambda n: entries[n])
+            slides.append({'name': name, 'kind': 'slide', 'slide': key if kind == 'slide' else None,
+                           'size': entries[name]})
+
+        slides.sort(key=lambda p: (p['slide'] is None, p['slide'] or 0, p['name']))
+        return previews + slides
+
+    def read(self, name: str) -> bytes:
+        """Return the bytes of one preview entry."""
+        if name not in self._list_entries():
+            raise KeyError(f"No preview named {name}")
+        if self.path.is_dir():
+            with open(self.path / name, 'rb') as f:
+                return f.read()
+        with zipfile.ZipFile(self.path, 'r') as zip_ref:
+            return zip_ref.read(name)
+
+    def extract(self, output_dir: str) -> List[Dict]:
+        """
+        Write the previews to a folder as document-preview.jpg, slide-001.jpg, ...
+
+        Returns:
+            The list_previews() entries with an added 'path'
+        """
+        output_dir = Path(output_dir)
+        output_dir.mkdir(exist_ok=True, parents=True)
+        previews = self.list_previews()
+
+        zip_ref = None if self.path.is_dir() else zipfile.ZipFile(self.path, 'r')
+        try:
+            for index, preview in enumerate(previews):
+                suffix = Path(preview['name']).suffix.lower()
+                if preview['kind'] == 'document':
+                    filename = f"document-{Path(preview['name']).stem.lower()}{suffix}"
+                elif preview['slide'] is not None:
+                    filename = f"slide-{preview['slide']:03d}{suffix}"
+                else:
+                    filename = f"thumbnail-{index:03d}{suffix}"
+                target = output_dir / filename
+
+                if zip_ref is None:
+                    shutil.copyfile(self.path / preview['name'], target)
+                else:
+                    with zip_ref.open(preview['name']) as source, open(target, 'wb') as f:
+                        shutil.copyfileobj(source, f)
+                preview['path'] = str(target)
+        finally:
+            if zip_ref is not None:
+                zip_ref.close()
+
+        return previews
+
+    def _list_entries(self) -> Dict[str, int]:
+        """Map entry names (relative, '/'-separated) to sizes, from the listing only."""
+        if self._entries is not None:
+            return self._entries
+
+        entries = {}
+        if self.path.is_dir():
+            stack = [self.path]
+            while stack:
+                current = stack.pop()
+                with os.scandir(current) as scan:
+                    for entry in scan:
+                        if entry.is_dir(follow_symlinks=False):
+                            stack.append(entry.path)
+                        else:
+                            name = Path(os.path.relpath(entry.path, self.path)).as_posix()
+                            entries[name] = entry.stat(follow_symlinks=False).st_size
+        else:
+            with zipfile.ZipFile(self.path, 'r') as zip_ref:
+                for info in zip_ref.infolist():
+                    if not info.is_dir():
+                        entries[info.filename] = info.file_size
+
+        self._entries = entries
+        return entries
+
+    def _slide_numbers(self, thumbnail_ids: set) -> Dict[int, int]:
+        """Map thumbnail data ids to slide numbers through the slide tree in Document.iwa."""
+        if not thumbnail_ids:
+            return {}
+
+        nodes = {}  # slide node id -> references in field order
+        try:
+            for name, data in KeynoteArchive(self.path).iter_iwa_files(only={'Document.iwa'}):
+                for identifier, message_type, payload in iter_objects(decompress_iwa(data)):
+                    if message_type == SLIDE_NODE_ARCHIVE:
+                        nodes[identifier] = _references(payload)
+        except (IWAError, OSError, zipfile.BadZipFile) as e:
+            print(f"Warning: Could not read the slide order of {self.path.name}: {e}")
+            return {}
+
+        children = {ref for refs in nodes.values() for ref in refs if ref in nodes}
+        roots = sorted(node for node in nodes if node not in children)
+
+        slide_numbers = {}
+        slide_count = 0
+        visited = set()
+        stack = list(reversed(roots))
+        while stack:
+            node = stack.pop()
+            if node in visited:
+                continue
+            visited.add(node)
+            refs = nodes[node]
+            thumbnails = [ref for ref in refs if ref in thumbnail_ids and ref not in slide_numbers]
+            if thumbnails:
+                slide_count += 1
+                for thumbnail in thumbnails:
+                    slide_numbers[thumbnail] = slide_count
+            stack.extend(reversed([ref for ref in refs if ref in nodes]))
+
+        return slide_numbers
+
+
+def extract_keynote_previews(keynote_path: str, output_dir: str) -> List[Dict]:
+    """Convenience function: write the previews of a Keynote document to a folder."""
+    return KeynotePreviews(keynote_path).extract(output_dir)
@@ -0,0 +1,322 @@
+"""
+Memory-mapped access to presentation packages.
+Opens .pptx/.key zip files by their central directory only, so analysis
+never reads the bytes of large media entries such as embedded video.
+"""
+
+import os
+import mmap
+import zlib
+import struct
+import zipfile
+import xml.etree.ElementTree as ET
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Dict, Iterator, List, Optional, Tuple
+
+
+# Entries font analysis never needs to read
+MEDIA_PREFIXES = ('ppt/media/',)
+
+P_NS = '{http://schemas.openxmlformats.org/presentationml/2006/main}'
+P_SLD_ID = P_NS + 'sldId'
+P_SLD_SZ = P_NS + 'sldSz'
+
+EMU_PER_INCH = 914400
+
+# Common slide aspect ratios, for readable summaries
+ASPECT_RATIOS = {'16:9': 16 / 9, '16:10': 16 / 10, '4:3': 4 / 3}
+
+LARGEST_PARTS = 5
+
+# Zip record layouts (APPNOTE 4.3.7, 4.3.12, 4.3.16)
+LOCAL_HEADER = struct.Struct('<4s5H3L2H')
+CENTRAL_HEADER = struct.Struct('<4s6H3L5H2L')
+EOCD = struct.Struct('<4s4H2LH')
+
+
+class PackageZipFile(zipfile.ZipFile):
+    """ZipFile that refuses to open media entries."""
+
+    def __init__(self, file, media_prefixes: Tuple[str, ...] = MEDIA_PREFIXES):
+        self.media_prefixes = media_prefixes
+        super().__init__(file, 'r')
+
+    def open(self, name, mode='r', pwd=None, *, force_zip64=False):
+        filename = name.filename if isinstance(name, zipfile.ZipInfo) else name
+        if mode == 'r' and self.media_prefixes and filename.startswith(self.media_prefixes):
+            raise PermissionError(f"Media entry not read during analysis: {filename}")
+        return super().open(name, mode, pwd, force_zip64=force_zip64)
+
+
+class _MappedFile:
+    """Minimal read-only file object over an mmap (mmap lacks seekable())."""
+
+    def __init__(self, mapped: mmap.mmap):
+        self._mapped = mapped
+
+    def read(self, size: int = -1) -> bytes:
+        return self._mapped.read(size)
+
+    def seek(self, offset: int, whence: int = 0) -> int:
+        self._mapped.seek(offset, whence)
+        return self._mapped.tell()
+
+    def tell(self) -> int:
+        return self._mapped.tell()
+
+    def seekable(self) -> bool:
+        return True
+
+
+@contextmanager
+def open_package(path: str, media_prefixes: Tuple[str, ...] = MEDIA_PREFIXES) -> Iterator[PackageZipFile]:
+    """
+    Open a zip package through a read-only memory map.
+
+    Only the end-of-central-directory record and the central directory are
+    read up front; entry data is paged in on demand when an entry is opened.
+    Falls back to regular file reads if the file cannot be mapped.
+
+    Args:
+        path: Path to the .pptx or .key file
+        media_prefixes: Entry prefixes that may not be opened
+
+    Yields:
+        PackageZipFile for the package
+    """
+    with open(Path(path), 'rb') as f:
+        try:
+            mapped = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        except (ValueError, OSError):
+            mapped = None
+
+        if mapped is not None and hasattr(mmap, 'MADV_RANDOM'):
+            # Entries are read sparsely; don't read ahead into neighbouring media
+            mapped.madvise(mmap.MADV_RANDOM)
+
+        try:
+            with PackageZipFile(_MappedFile(mapped) if mapped is not None else f, media_prefixes) as zip_ref:
+                yield zip_ref
+        finally:
+            if mapped is not None:
+                mapped.close()
+
+
+def _media_type(name: str) -> str:
+    """Media type key for summaries: the lowercase file extension."""
+    return Path(name).suffix.lower().lstrip('.') or 'other'
+
+
+def _aspect_ratio(width: int, height: int) -> Optional[str]:
+    if not width or not height:
+        return None
+    for label, ratio in ASPECT_RATIOS.items():
+        if abs(width / height - ratio) < 0.01:
+            return label
+    return None
+
+
+def _new_summary(path: Path) -> Dict:
+    return {
+        'file': path.name,
+        'path': str(path.absolute()),
+        'type': path.suffix.lower(),
+        'size': 0,
+        'slides': None,
+        'slide_width': None,   # EMU (914400 per inch)
+        'slide_height': None,
+        'aspect_ratio': None,
+        'media': {},           # type -> {'count', 'bytes'}
+        'media_bytes': 0,
+        'embedded_fonts': 0,
+        'embedded_font_bytes': 0,
+        'largest_parts': [],
+        'error': None,
+    }
+
+
+def _add_part(summary: Dict, parts: List[Tuple[int, str]], name: str, size: int,
+              media_prefix: str, font_prefix: Optional[str] = None):
+    parts.append((size, name))
+    if name.startswith(media_prefix):
+        media = summary['media'].setdefault(_media_type(name), {'count': 0, 'bytes': 0})
+        media['count'] += 1
+        media['bytes'] += size
+        summary['media_bytes'] += size
+    elif font_prefix and name.startswith(font_prefix):
+        summary['embedded_fonts'] += 1
+        summary['embedded_font_bytes'] += size
+
+
+def _finish_parts(summary: Dict, parts: List[Tuple[int, str]]):
+    parts.sort(reverse=True)
+    summary['largest_parts'] = [{'name': name, 'size': size} for size, name in parts[:LARGEST_PARTS]]
+
+
+def read_central_directory(data) -> Optional[List[Tuple[str, int, int, int, int, int]]]:
+    """
+    Parse a zip central directory straight from a buffer (e.g. an mmap).
+
+    Much cheaper than building ZipInfo objects when only names and sizes
+    are needed. Zip64 archives are not handled here.
+
+    Returns:
+        List of (name, compressed size, file size, compression method,
+        flags, local header offset) tuples, or None if the archive needs
+        the full zipfile reader
+    """
+    size = len(data)
+    eocd = data.rfind(b'PK\x05\x06', max(0, size - EOCD.size - 0xFFFF), size)
+    if eocd < 0:
+        raise zipfile.BadZipFile("End of central directory not found")
+    _, disk, _, _, total, cd_size, cd_offset, _ = EOCD.unpack_from(data, eocd)
+    if disk or total == 0xFFFF or cd_offset == 0xFFFFFFFF or cd_offset + cd_size > eocd:
+        return None
+
+    entries = []
+    pos = cd_offset
+    for _ in range(total):
+        (signature, _, _, flags, method, _, _, _, compressed_size, file_size,
+         name_length, extra_length, comment_length, _, _, _, header_offset) = CENTRAL_HEADER.unpack_from(data, pos)
+        if signature != b'PK\x01\x02':
+            raise zipfile.BadZipFile("Bad central directory entry")
+        if 0xFFFFFFFF in (compressed_size, file_size, header_offset):
+            return None
+        pos += CENTRAL_HEADER.size
+        raw_name = data[pos:pos + name_length]
+        if flags & 0x800:
+            name = raw_name.decode('utf-8')
+        elif raw_name.isascii():
+            name = raw_name.decode('ascii')  # fast path; cp437 decoding is pure Python
+        else:
+            name = raw_name.decode('cp437')
+        entries.append((name, compressed_size, file_size, method, flags, header_offset))
+        pos += name_length + extra_length + comment_length
+    return entries
+
+
+def _iter_entry_data(data, entry: Tuple[str, int, int, int, int, int], chunk_size: int = 16 * 1024) -> Iterator[bytes]:
+    """Yield the decompressed data of a zip entry in chunks (stored or deflated only)."""
+    _, compressed_size, _, method, flags, header_offset = entry
+    if flags & 0x1:
+        raise zipfile.BadZipFile("Encrypted entries are not supported")
+    signature, *_, name_length, extra_length = LOCAL_HEADER.unpack_from(data, header_offset)
+    if signature != b'PK\x03\x04':
+        raise zipfile.BadZipFile("Bad local file header")
+    start = header_offset + LOCAL_HEADER.size + name_length + extra_length
+    end = start + compressed_size
+
+    if method == zipfile.ZIP_STORED:
+        for pos in range(start, end, chunk_size):
+            yield bytes(data[pos:min(pos + chunk_size, end)])
+    elif method == zipfile.ZIP_DEFLATED:
+        decompressor = zlib.decompressobj(-15)
+        for pos in range(start, end, chunk_size):
+            yield decompressor.decompress(data[pos:min(pos + chunk_size, end)])
+    else:
+        raise zipfile.BadZipFile(f"Unsupported compression method {method}")
+
+
+def summarize_package(path: str) -> Dict:
+    """
+    Summarize a presentation without extracting anything.
+
+    For .pptx files only the zip central directory and the beginning of
+    ppt/presentation.xml are read, so the cost does not depend on how much
+    media a deck holds. Keynote documents are summarized from their archive
+    listing (or the package directory listing); their slide size is not
+    reported.
+
+    Returns:
+        Dictionary with 'file', 'path', 'type', 'size', 'slides',
+        'slide_width' and 'slide_height' (EMU), 'aspect_ratio', 'media'
+        (count and bytes per file type), 'media_bytes', 'embedded_fonts',
+        'embedded_font_bytes', 'largest_parts' and 'error'
+    """
+    path = Path(path)
+    summary = _new_summary(path)
+    parts = []
+
+    try:
+        if path.is_dir():
+            _summarize_keynote_package(path, summary, parts)
+        else:
+            _summarize_zip(path, summary, parts)
+    except Exception as e:
+        summary['error'] = str(e)
+
+    _finish_parts(summary, parts)
+    return summary
+
+
+def _summarize_zip(path: Path, summary: Dict, parts: List[Tuple[int, str]]):
+    is_pptx = summary['type'] == '.pptx'
+    media_prefix, font_prefix = ('ppt/media/', 'ppt/fonts/') if is_pptx else ('Data/', None)
+
+    with open(path, 'rb') as f:
+        summary['size'] = os.fstat(f.fileno()).st_size
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+            entries = read_central_directory(mapped)
+            if entries is None:
+                # Zip64 or otherwise unusual archive: use the full reader
+                with PackageZipFile(_MappedFile(mapped)) as zip_ref:
+                    entries = [(info.filename, info.compress_size, info.file_size, info.compress_type,
+                                info.flag_bits, info.header_offset) for info in zip_ref.infolist()]
+
+            slides = 0
+            presentation_entry = None
+            for entry in entries:
+                name = entry[0]
+                if name.endswith('/'):
+                    continue
+                _add_part(summary, parts, name, entry[2], media_prefix, font_prefix)
+                if name == 'ppt/presentation.xml':
+                    presentation_entry = entry
+                elif name.startswith('Index/Slide') and name.endswith('.iwa'):
+                    slides += 1
+
+            if is_pptx:
+                if presentation_entry is None:
+                    raise zipfile.BadZipFile("ppt/presentation.xml not found")
+                _read_presentation_xml(_iter_entry_data(mapped, presentation_entry), summary)
+            else:
+                summary['slides'] = slides or None
+
+
+def _read_presentation_xml(chunks: Iterator[bytes], summary: Dict):
+    """Read the slide list and slide size; stops before the text styles."""
+    slides = 0
+    parser = ET.XMLPullParser(events=('end',))
+    for chunk in chunks:
+        parser.feed(chunk)
+        for _, elem in parser.read_events():
+            if elem.tag == P_SLD_ID:
+                slides += 1
+            elif elem.tag == P_SLD_SZ:
+                summary['slide_width'] = int(elem.get('cx', 0)) or None
+                summary['slide_height'] = int(elem.get('cy', 0)) or None
+                # sldSz follows sldIdLst; nothing after it is needed
+                summary['slides'] = slides
+                summary['aspect_ratio'] = _aspect_ratio(summary['slide_width'], summary['slide_height'])
+                return
+    summary['slides'] = slides
+
+
+def _summarize_keynote_package(path: Path, summary: Dict, parts: List[Tuple[int, str]]):
+    slides = 0
+    stack = [path]
+    while stack:
+        current = stack.pop()
+        with os.scandir(current) as entries:
+            for entry in entries:
+                if entry.is_dir(follow_symlinks=False):
+                    stack.append(entry.path)
+                    continue
+                name = Path(os.path.relpath(entry.path, path)).as_posix()
+                size = entry.stat(follow_symlinks=False).st_size
+                summary['size'] += size
+                _add_part(summary, parts, name, size, 'Data/')
+                if name.startswith('Index/Slide') and name.endswith('.iwa'):
+                    slides += 1
+    summary['slides'] = slides or None
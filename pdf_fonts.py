@@ -0,0 +1,653 @@
+"""
+PDF font detection.
+Lists the fonts a PDF uses by following only the page tree, resource and
+font dictionaries through the cross-reference table. Content streams are
+never loaded; embedded font programs are decoded only when asked for.
+"""
+
+import re
+import mmap
+import zlib
+from pathlib import Path
+from typing import Dict, Iterator, List, Optional, Tuple
+
+
+class PDFError(ValueError):
+    """Raised when a PDF cannot be parsed."""
+
+
+class PDFName(str):
+    """A PDF name object (/Name), as opposed to a string."""
+
+
+class PDFRef(tuple):
+    """An indirect reference (object number, generation)."""
+
+    def __new__(cls, num: int, gen: int):
+        return super().__new__(cls, (num, gen))
+
+
+class PDFStream:
+    """A stream object: its dictionary plus the location of its raw data."""
+
+    __slots__ = ('attrs', 'start', 'length')
+
+    def __init__(self, attrs: Dict, start: int, length: int):
+        self.attrs = attrs
+        self.start = start
+        self.length = length
+
+
+WHITESPACE = b' \t\r\n\f\x00'
+DELIMITERS = b'()<>[]{}/%'
+REGULAR_END = re.compile(rb'[\s()<>\[\]{}/%\x00]')
+NUMBER = re.compile(rb'[+-]?(?:\d+\.?\d*|\.\d+)$')
+REF_TAIL = re.compile(rb'\s+(\d+)\s+R(?=[\s()<>\[\]{}/%]|$)')
+OBJ_HEADER = re.compile(rb'\s*(\d+)\s+(\d+)\s+obj\b')
+XREF_ENTRY = re.compile(rb'(\d{10}) (\d{5}) ([nf])')
+SUBSET_PREFIX = re.compile(r'^[A-Z]{6}\+')
+
+STRING_ESCAPES = {ord('n'): b'\n', ord('r'): b'\r', ord('t'): b'\t', ord('b'): b'\b', ord('f'): b'\f',
+                  ord('('): b'(', ord(')'): b')', ord('\\'): b'\\'}
+
+# FontDescriptor keys holding the embedded font program
+FONT_FILE_KEYS = ('FontFile2', 'FontFile3', 'FontFile')
+
+
+def _skip_whitespace(data, pos: int) -> int:
+    end = len(data)
+    while pos < end:
+        c = data[pos]
+        if c in WHITESPACE:
+            pos += 1
+        elif c == 0x25:  # % comment
+            while pos < end and data[pos] not in b'\r\n':
+                pos += 1
+        else:
+            break
+    return pos
+
+
+def _decode_name(raw: bytes) -> PDFName:
+    if b'#' in raw:
+        raw = re.sub(rb'#([0-9A-Fa-f]{2})', lambda m: bytes([int(m.group(1), 16)]), raw)
+    return PDFName(raw.decode('latin-1'))
+
+
+def parse_object(data, pos: int) -> Tuple[object, int]:
+    """
+    Parse one PDF object starting at pos.
+
+    Returns:
+        Tuple of (value, position after the value). Dictionaries become
+        dicts keyed by name, arrays lists, strings bytes, names PDFName and
+        indirect references PDFRef.
+    """
+    pos = _skip_whitespace(data, pos)
+    if pos >= len(data):
+        raise PDFError("Unexpected end of data")
+    c = data[pos]
+
+    if c == 0x2F:  # /Name
+        match = REGULAR_END.search(data, pos + 1)
+        end = match.start() if match else len(data)
+        return _decode_name(data[pos + 1:end]), end
+
+    if c == 0x3C:  # < or <<
+        if data[pos + 1:pos + 2] == b'<':
+            result = {}
+            pos += 2
+            while True:
+                pos = _skip_whitespace(data, pos)
+                if data[pos:pos + 2] == b'>>':
+                    return result, pos + 2
+                key, pos = parse_object(data, pos)
+                value, pos = parse_object(data, pos)
+                if isinstance(key, PDFName):
+                    result[key] = value
+        end = data.find(b'>', pos)
+        if end < 0:
+            raise PDFError("Unterminated hex string")
+        digits = re.sub(rb'\s', b'', bytes(data[pos + 1:end]))
+        if len(digits) % 2:
+            digits += b'0'
+        return bytes.fromhex(digits.decode('ascii')), end + 1
+
+    if c == 0x5B:  # [
+        result = []
+        pos += 1
+        while True:
+            pos = _skip_whitespace(data, pos)
+            if data[pos:pos + 1] == b']':
+                return result, pos + 1
+            value, pos = parse_object(data, pos)
+            result.append(value)
+
+    if c == 0x28:  # (literal string)
+        return _parse_literal_string(data, pos)
+
+    match = REGULAR_END.search(data, pos)
+    end = match.start() if match else len(data)
+    token = bytes(data[pos:end])
+    if not token:
+        raise PDFError(f"Unexpected delimiter at offset {pos}")
+
+    if NUMBER.match(token):
+        if b'.' not in token:
+            ref = REF_TAIL.match(data, end)
+            if ref:
+                return PDFRef(int(token), int(ref.group(1))), ref.end()
+            return int(token), end
+        return float(token), end
+    if token == b'true':
+        return True, end
+    if token == b'false':
+        return False, end
+    if token == b'null':
+        return None, end
+    # Other keywords (obj, endobj, stream, R, ...) are returned as bytes
+    return token, end
+
+
+def _parse_literal_string(data, pos: int) -> Tuple[bytes, int]:
+    out = bytearray()
+    depth = 0
+    pos += 1
+    end = len(data)
+    while pos < end:
+        c = data[pos]
+        if c == 0x5C:  # backslash
+            pos += 1
+            esc = data[pos]
+            if esc in STRING_ESCAPES:
+                out += STRING_ESCAPES[esc]
+                pos += 1
+            elif 0x30 <= esc <= 0x37:
+                digits = bytes(data[pos:pos + 3])
+                length = 1
+                while length < len(digits) and 0x30 <= digits[length] <= 0x37:
+                    length += 1
+                out.append(int(digits[:length], 8) & 0xFF)
+                pos += length
+            elif esc in b'\r\n':
+                pos += 2 if data[pos:pos + 2] == b'\r\n' else 1
+            else:
+                out.append(esc)
+                pos += 1
+            continue
+        if c == 0x28:
+            depth += 1
+        elif c == 0x29:
+            if depth == 0:
+                return bytes(out), pos + 1
+            depth -= 1
+        out.append(c)
+        pos += 1
+    raise PDFError("Unterminated string")
+
+
+def _png_unpredict(data: bytes, columns: int, colors: int = 1, bits: int = 8) -> bytes:
+    """Undo PNG row predictors (Predictor >= 10), as used by xref streams."""
+    bpp = max(1, colors * bits // 8)
+    row_length = (columns * colors * bits + 7) // 8
+    out = bytearray()
+    previous = bytearray(row_length)
+    for start in range(0, len(data), row_length + 1):
+        filter_type = data[start]
+        row = bytearray(data[start + 1:start + 1 + row_length])
+        for i in range(len(row)):
+            left = row[i - bpp] if i >= bpp else 0
+            up = previous[i]
+            if filter_type == 1:
+                row[i] = (row[i] + left) & 0xFF
+            elif filter_type == 2:
+                row[i] = (row[i] + up) & 0xFF
+            elif filter_type == 3:
+                row[i] = (row[i] + ((left + up) >> 1)) & 0xFF
+            elif filter_type == 4:
+                up_left = previous[i - bpp] if i >= bpp else 0
+                p = left + up - up_left
+                pa, pb, pc = abs(p - left), abs(p - up), abs(p - up_left)
+                predictor = left if pa <= pb and pa <= pc else (up if pb <= pc else up_left)
+                row[i] = (row[i] + predictor) & 0xFF
+        out += row
+        previous = row
+    return bytes(out)
+
+
+class PDFReader:
+    """
+    Lazy PDF object reader.
+
+    Only the cross-reference data is read up front; objects are parsed on
+    first access and cached. Object streams are decompressed once, when an
+    object inside them is first needed.
+    """
+
+    def __init__(self, pdf_path: str):
+        self.path = Path(pdf_path)
+        self._file = open(self.path, 'rb')
+        try:
+            self.data = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+        except (ValueError, OSError):
+            self.data = self._file.read()
+        self.xref = {}      # object number -> (1, offset, gen) or (2, objstm number, index)
+        self.trailer = {}
+        self._objects = {}
+        self._object_streams = {}
+
+        try:
+            try:
+                self._read_xref_chain(self._find_startxref())
+            except (PDFError, ValueError, IndexError, KeyError, zlib.error) as e:
+                # Damaged or non-standard cross-reference data: rebuild by scanning
+                print(f"Warning: Rebuilding cross-reference table of {self.path.name}: {e}")
+                self._objects = {}
+                self._rebuild_xref()
+        except BaseException:
+            self.close()
+            raise
+
+    def close(self):
+        if isinstance(self.data, mmap.mmap):
+            self.data.close()
+        self._file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    # Cross-reference data
+
+    def _find_startxref(self) -> int:
+        tail_start = max(0, len(self.data) - 2048)
+        pos = self.data.rfind(b'startxref', tail_start)
+        if pos < 0:
+            raise PDFError("startxref not found")
+        offset, _ = parse_object(self.data, pos + len(b'startxref'))
+        return offset
+
+    def _read_xref_chain(self, offset: int):
+        seen = set()
+        while offset is not None and offset not in seen:
+            seen.add(offset)
+            pos = _skip_whitespace(self.data, offset)
+            if self.data[pos:pos + 4] == b'xref':
+                trailer = self._read_xref_table(pos + 4)
+                if isinstance(trailer.get('XRefStm'), int):
+                    # Hybrid file: compressed objects are listed in an xref stream
+                    self._read_xref_stream(trailer['XRefStm'])
+            else:
+                trailer = self._read_xref_stream(pos)
+            for key, value in trailer.items():
+                self.trailer.setdefault(key, value)
+            offset = trailer.get('Prev')
+
+        if 'Root' not in self.trailer:
+            raise PDFError("No document catalog in trailer")
+
+    def _read_xref_table(self, pos: int) -> Dict:
+        """Read a classic xref table; newer sections were read first and win."""
+        while True:
+            pos = _skip_whitespace(self.data, pos)
+            if self.data[pos:pos + 7] == b'trailer':
+                trailer, _ = parse_object(self.data, pos + 7)
+                return trailer
+            start, pos = parse_object(self.data, pos)
+            count, pos = parse_object(self.data, pos)
+            pos = _skip_whitespace(self.data, pos)
+            for number in range(start, start + count):
+                match = XREF_ENTRY.match(self.data, pos)
+                if not match:
+                    raise PDFError(f"Bad xref entry at offset {pos}")
+                if match.group(3) == b'n' and number not in self.xref:
+                    self.xref[number] = (1, int(match.group(1)), int(match.group(2)))
+                pos = _skip_whitespace(self.data, match.end())
+
+    def _read_xref_stream(self, pos: int) -> Dict:
+        stream = self._parse_indirect(pos)[1]
+        if not isinstance(stream, PDFStream) or stream.attrs.get('Type') != 'XRef':
+            raise PDFError(f"No xref stream at offset {pos}")
+        attrs = stream.attrs
+        widths = attrs['W']
+        index = attrs.get('Index', [0, attrs['Size']])
+        data = self.stream_data(stream)
+
+        pos = 0
+        for section in range(0, len(index), 2):
+            start, count = index[section], index[section + 1]
+            for number in range(start, start + count):
+                fields = []
+                for width in widths:
+                    fields.append(int.from_bytes(data[pos:pos + width], 'big') if width else None)
+                    pos += width
+                entry_type = 1 if fields[0] is None else fields[0]
+                if number in self.xref:
+                    continue
+                if entry_type == 1:
+                    self.xref[number] = (1, fields[1], fields[2] or 0)
+                elif entry_type == 2:
+                    self.xref[number] = (2, fields[1], fields[2] or 0)
+        return attrs
+
+    def _rebuild_xref(self):
+        self.xref = {}
+        self.trailer = {}
+        for match in re.finditer(rb'(?<![\d])(\d+)\s+(\d+)\s+obj\b', self.data):
+            self.xref[int(match.group(1))] = (1, match.start(), int(match.group(2)))
+        for match in re.finditer(rb'trailer\s*<<', self.data):
+            trailer, _ = parse_object(self.data, match.end() - 2)
+            self.trailer.update(trailer)
+
+        # Objects inside object streams, and the root named by xref streams
+        for number in sorted(self.xref):
+            stream = self.get(PDFRef(number, self.xref[number][2]))
+            if not isinstance(stream, PDFStream):
+                continue
+            if stream.attrs.get('Type') == 'XRef' and 'Root' in stream.attrs:
+                self.trailer.setdefault('Root', stream.attrs['Root'])
+            elif stream.attrs.get('Type') == 'ObjStm':
+                try:
+                    numbers = self._object_stream_numbers(stream)
+                except (PDFError, ValueError, zlib.error):
+                    continue
+                for index, contained in enumerate(numbers):
+                    self.xref.setdefault(contained, (2, number, index))
+
+        if 'Root' not in self.trailer:
+            raise PDFError("Document catalog not found")
+
+    # Objects
+
+    def _parse_indirect(self, pos: int) -> Tuple[int, object]:
+        match = OBJ_HEADER.match(self.data, pos)
+        if not match:
+            raise PDFError(f"No object at offset {pos}")
+        value, pos = parse_object(self.data, match.end())
+        if isinstance(value, dict):
+            after = _skip_whitespace(self.data, pos)
+            if self.data[after:after + 6] == b'stream':
+                after += 6
+                if self.data[after:after + 2] == b'\r\n':
+                    after += 2
+                elif self.data[after:after + 1] in (b'\n', b'\r'):
+                    after += 1
+                length = value.get('Length')
+                if isinstance(length, PDFRef):
+                    length = self.get(length)
+                if not isinstance(length, int):
+                    end = self.data.find(b'endstream', after)
+                    length = max(0, end - after)
+                value = PDFStream(value, after, length)
+        return int(match.group(1)), value
+
+    def get(self, obj):
+        """Resolve an indirect reference (other values are returned unchanged)."""
+        if not isinstance(obj, PDFRef):
+            return obj
+        cached = self._objects.get(obj)
+        if cached is not None:
+            return cached
+
+        entry = self.xref.get(obj[0])
+        value = None
+        if entry is not None:
+            try:
+                if entry[0] == 1:
+                    value = self._parse_indirect(entry[1])[1]
+                else:
+                    value = self._object_stream(entry[1])[entry[2]]
+            except (PDFError, IndexError, KeyError, ValueError, zlib.error) as e:
+                print(f"Warning: Could not read object {obj[0]} of {self.path.name}: {e}")
+                value = None
+        self._objects[obj] = value
+        return value
+
+    def _object_stream(self, number: int) -> List:
+        objects = self._object_streams.get(number)
+        if objects is not None:
+            return objects
+
+        stream = self.get(PDFRef(number, 0))
+        if not isinstance(stream, PDFStream):
+            raise PDFError(f"Object stream {number} not found")
+        data = self.stream_data(stream)
+        first = stream.attrs['First']
+        objects = [parse_object(data, first + offset)[0] for _, offset in self._object_stream_header(stream, data)]
+        self._object_streams[number] = objects
+        return objects
+
+    def _object_stream_numbers(self, stream: PDFStream) -> List[int]:
+        return [number for number, _ in self._object_stream_header(stream, self.stream_data(stream))]
+
+    @staticmethod
+    def _object_stream_header(stream: PDFStream, data: bytes) -> List[Tuple[int, int]]:
+        """Read the (object number, offset) pairs at the start of an object stream."""
+        pairs = []
+        pos = 0
+        for _ in range(stream.attrs['N']):
+            number, pos = parse_object(data, pos)
+            offset, pos = parse_object(data, pos)
+            pairs.append((number, offset))
+        return pairs
+
+    def stream_data(self, stream: PDFStream) -> bytes:
+        """Decode a stream (FlateDecode, ASCIIHexDecode or unfiltered)."""
+        data = bytes(self.data[stream.start:stream.start + stream.length])
+        filters = self.get(stream.attrs.get('Filter'))
+        params = self.get(stream.attrs.get('DecodeParms'))
+        if not isinstance(filters, list):
+            filters = [filters] if filters else []
+        if not isinstance(params, list):
+            params = [params] * len(filters)
+
+        for name, param in zip(filters, params):
+            param = self.get(param) or {}
+            if name in ('FlateDecode', 'Fl'):
+                try:
+                    data = zlib.decompress(data)
+                except zlib.error:
+                    # Tolerate truncated streams
+                    data = zlib.decompressobj().decompress(data)
+                predictor = param.get('Predictor', 1)
+                if predictor >= 10:
+                    data = _png_unpredict(data, param.get('Columns', 1), param.get('Colors', 1),
+                                          param.get('BitsPerComponent', 8))
+            elif name in ('ASCIIHexDecode', 'AHx'):
+                data = bytes.fromhex(re.sub(rb'[^0-9A-Fa-f]', b'', data.split(b'>')[0]).decode('ascii'))
+            else:
+                raise PDFError(f"Unsupported stream filter {name}")
+        return data
+
+    # Document structure
+
+    def iter_pages(self) -> Iterator[Tuple[int, Dict, Dict]]:
+        """
+        Walk the page tree in page order.
+
+        Yields:
+            Tuples of (1-based page number, page dictionary, resources
+            dictionary, inherited from ancestors where needed)
+        """
+        catalog = self.get(self.trailer['Root'])
+        root = self.get(catalog.get('Pages')) if isinstance(catalog, dict) else None
+        if not isinstance(root, dict):
+            raise PDFError("No page tree")
+
+        page_number = 0
+        visited = set()
+        stack = [(root, None)]
+        while stack:
+            node, inherited = stack.pop()
+            resources = self.get(node.get('Resources', inherited))
+            kids = self.get(node.get('Kids'))
+            if node.get('Type') == 'Pages' or (kids and node.get('Type') != 'Page'):
+                children = []
+                for kid in kids or []:
+                    if isinstance(kid, PDFRef):
+                        if kid in visited:
+                            continue
+                        visited.add(kid)
+                    child = self.get(kid)
+                    if isinstance(child, dict):
+                        children.append((child, resources))
+                stack.extend(reversed(children))
+            else:
+                page_number += 1
+                yield page_number, node, resources or {}
+
+
+class PDFFontScanner:
+    """
+    List the fonts of a PDF and extract embedded font programs.
+
+    Fonts are found through each page's resources and the resources of
+    the form XObjects they use (their dictionaries only, not their content).
+    """
+
+    def __init__(self, pdf_path: str):
+        self.path = Path(pdf_path)
+
+    def scan(self) -> List[Dict]:
+        """
+        Find the fonts used by the document.
+
+        Returns:
+            One dictionary per font name with 'name' (subset tag removed),
+            'subtype', 'embedded', 'subset', 'pages' and 'programs' (the
+            references of embedded font programs), sorted by name
+        """
+        with PDFReader(self.path) as reader:
+            return self._scan(reader)
+
+    def extract(self, output_dir: Optional[str] = None) -> Tuple[List[Dict], List[Tuple[str, bytes]]]:
+        """
+        Scan the fonts and decode their embedded programs.
+
+        Returns:
+            Tuple of (scan results, list of (file name, font bytes)); file
+            names end in .ttf, .otf, .cff or .pfa by program type
+        """
+        programs = []
+        with PDFReader(self.path) as reader:
+            fonts = self._scan(reader)
+            for font in fonts:
+                for index, (ref, kind) in enumerate(font['programs']):
+                    stream = reader.get(ref)
+                    if not isinstance(stream, PDFStream):
+                        continue
+                    try:
+                        data = reader.stream_data(stream)
+                    except (PDFError, zlib.error) as e:
+                        print(f"Warning: Could not decode font program of {font['name']}: {e}")
+                        continue
+                    extension = self._program_extension(kind, stream, data)
+                    stem = re.sub(r'[^\w\-]', '_', font['name']) or 'font'
+                    suffix = f"-{index + 1}" if index else ""
+                    programs.append((f"{stem}{suffix}{extension}", data))
+        return fonts, programs
+
+    def _scan(self, reader: PDFReader) -> List[Dict]:
+        fonts = {}
+        font_cache = {}  # font dictionary reference -> parsed font entry
+        visited_forms = set()
+
+        for page_number, _, resources in reader.iter_pages():
+            for font_ref, font in self._iter_resource_fonts(reader, resources, visited_forms, page_number):
+                key = font_ref if isinstance(font_ref, PDFRef) else id(font)
+                entry = font_cache.get(key)
+                if entry is None:
+                    entry = font_cache[key] = self._describe_font(reader, font)
+                if entry is None:
+                    continue
+
+                merged = fonts.get(entry['name'])
+                if merged is None:
+                    merged = fonts[entry['name']] = {
+                        'name': entry['name'], 'subtype': entry['subtype'], 'embedded': False,
+                        'subset': False, 'pages': set(), 'programs': []
+                    }
+                merged['embedded'] = merged['embedded'] or entry['embedded']
+                merged['subset'] = merged['subset'] or entry['subset']
+                merged['pages'].add(page_number)
+                if entry['program'] and entry['program'] not in merged['programs']:
+                    merged['programs'].append(entry['program'])
+
+        for font in fonts.values():
+            font['pages'] = sorted(font['pages'])
+        return [fonts[name] for name in sorted(fonts)]
+
+    def _iter_resource_fonts(self, reader: PDFReader, resources, visited_forms: set,
+                             page_number: int) -> Iterator[Tuple[object, Dict]]:
+        """Yield (reference, font dictionary) for a resource dictionary and its forms."""
+        stack = [(reader.get(resources), 0)]
+        while stack:
+            resources, depth = stack.pop()
+            if not isinstance(resources, dict):
+                continue
+
+            font_dict = reader.get(resources.get('Font'))
+            if isinstance(font_dict, dict):
+                for font_ref in font_dict.values():
+                    font = reader.get(font_ref)
+                    if isinstance(font, dict):
+                        yield font_ref, font
+
+            xobjects = reader.get(resources.get('XObject'))
+            if not isinstance(xobjects, dict) or depth > 8:
+                continue
+            for xobject_ref in xobjects.values():
+                # Forms shared across pages are followed once per page
+                key = (xobject_ref, page_number) if isinstance(xobject_ref, PDFRef) else None
+                if key is not None:
+                    if key in visited_forms:
+                        continue
+                    visited_forms.add(key)
+                xobject = reader.get(xobject_ref)
+                if isinstance(xobject, PDFStream) and xobject.attrs.get('Subtype') == 'Form':
+                    stack.append((reader.get(xobject.attrs.get('Resources')), depth + 1))
+
+    def _describe_font(self, reader: PDFReader, font: Dict) -> Optional[Dict]:
+        subtype = font.get('Subtype')
+        base_font = font.get('BaseFont') or font.get('Name')
+        if isinstance(base_font, bytes):
+            base_font = base_font.decode('latin-1')
+        if not base_font:
+            return None
+
+        descriptor = reader.get(font.get('FontDescriptor'))
+        if subtype == 'Type0':
+            descendants = reader.get(font.get('DescendantFonts'))
+            if isinstance(descendants, list) and descendants:
+                descendant = reader.get(descendants[0])
+                if isinstance(descendant, dict):
+                    descriptor = reader.get(descendant.get('FontDescriptor'))
+
+        program = None
+        if isinstance(descriptor, dict):
+            for key in FONT_FILE_KEYS:
+                if isinstance(descriptor.get(key), PDFRef):
+                    program = (descriptor[key], key)
+                    break
+
+        base_font = str(base_font)
+        # "Arial,Bold" is the PDF spelling of a style of a non-embedded TrueType font
+        name = SUBSET_PREFIX.sub('', base_font).replace(',', '-')
+        return {
+            'name': name,
+            'subtype': subtype,
+            # Type 3 glyphs are always defined in the PDF itself
+            'embedded': program is not None or subtype == 'Type3',
+            'subset': SUBSET_PREFIX.match(base_font) is not None,
+            'program': program,
+        }
+
+    @staticmethod
+    def _program_extension(kind: str, stream: PDFStream, data: bytes) -> str:
+        if kind == 'FontFile2':
+            return '.ttf'
+        if kind == 'FontFile3':
+            return '.otf' if stream.attrs.get('Subtype') == 'OpenType' or data[:4] == b'OTTO' else '.cff'
+        return '.pfa'
@@ -6,6 +6,8 @@ A tool for event tech producers to handle presentation files.
 
 import os
 import sys
+import json
+import tempfile
 from pathlib import Path
 from typing import List
 import click
@@ -13,9 +15,18 @@ from colorama import Fore, Style, init
 from tqdm import tqdm
 from dotenv import load_dotenv
 
-from font_extractor import FontExtractor, extract_fonts_from_file
+from font_extractor import FontExtractor, extract_fonts_from_file, merge_font_usage
 from pdf_converter import PDFToPPTXConverter, convert_pdf_to_pptx
 from font_hunter import FontHunter, hunt_fonts_from_list
+from font_mirror import get_font_mirror
+from installed_fonts import get_installed_fonts
+from glyph_coverage import GlyphCoverageChecker
+from font_subsetter import FontSubsetter, plan_subset_jobs
+from file_discovery import discover_files, iter_files, output_name
+from font_inventory import FontInventory
+from slide_index import SlideTextIndex
+from package_reader import EMU_PER_INCH, summarize_package
+from keynote_preview import KeynotePreviews
 
 # Load environment variables from .env file
 load_dotenv()
@@ -44,29 +55,51 @@ def print_info(message: str):
     print(f"{Fore.BLUE}ℹ {message}{Style.RESET_ALL}")
 
 
-def get_files_from_path(path: str, extensions: List[str]) -> List[Path]:
+PRESENTATION_EXTENSIONS = ['.pptx', '.key', '.keynote']
+# PDFs exported from presentations: fonts are listed, there are no slides to read
+FONT_SOURCE_EXTENSIONS = PRESENTATION_EXTENSIONS + ['.pdf']
+
+
+def get_files_from_path(path: str, extensions: List[str], include: tuple = (),
+                        exclude: tuple = ()) -> List[Path]:
     """
-    Get all files with specified extensions from a path.
+    Get all files with specified extensions from a path, including subfolders.
     
     Args:
         path: File or directory path
         extensions: List of file extensions (e.g., ['.pptx', '.key'])
+        include: Glob patterns files must match
+        exclude: Glob patterns for files and folders to skip
         
     Returns:
         List of Path objects
     """
-    path = Path(path)
-    files = []
-    
-    if path.is_file():
-        if path.suffix.lower() in extensions:
-            files.append(path)
-    elif path.is_dir():
-        for ext in extensions:
-            files.extend(path.glob(f"*{ext}"))
-            files.extend(path.glob(f"*{ext.upper()}"))
-    
-    return files
+    return list(iter_files(path, extensions, include=include, exclude=exclude))
+
+
+def _write_subset_fonts(jobs: List[tuple]):
+    """Subset fonts of all decks in one process pool and report the size savings."""
+    print_info(f"Subsetting {len(jobs)} font(s)...")
+    subsetter = FontSubsetter()
+    
+    # One pool for the jobs of every deck, each writing into its own folder
+    results = subsetter.subset_fonts((font_path, codepoints, str(folder))
+                                     for (font_path, codepoints), folder in jobs)
+    for result in results:
+        if result['error']:
+            continue
+        saved = 100 - 100 * result['subset_size'] / max(result['original_size'], 1)
+        cached = " (cached)" if result['cached'] else ""
+        print(f"  {Path(result['font']).name}: {result['original_size'] / 1024:.0f} KB -> "
+              f"{result['subset_size'] / 1024:.0f} KB ({saved:.0f}% smaller){cached}")
+
+
+def _record_inventory(inventory: FontInventory, file_path: Path, result: dict):
+    """Add an analyzed presentation to the font inventory without failing the command."""
+    try:
+        inventory.record(str(file_path), result)
+    except Exception as e:
+        print_warning(f"Could not update font inventory for {file_path.name}: {e}")
 
 
 @click.group()
@@ -83,69 +116,136 @@ def cli():
 @cli.command('extract-fonts')
 @click.argument('input_path', type=click.Path(exists=True))
 @click.option('--output', '-o', default='extracted_fonts', help='Output directory for fonts')
+@click.option('--subset', is_flag=True, help='Also write subset fonts with only the characters each deck uses')
+@click.option('--index-text', is_flag=True, help='Also add slide text and notes to the search index (search-slides)')
+@click.option('--include', '-i', multiple=True, help='Only process files matching this glob (repeatable)')
+@click.option('--exclude', '-x', multiple=True, help='Skip files and folders matching this glob (repeatable)')
 @click.option('--verbose', '-v', is_flag=True, help='Show detailed output')
-def extract_fonts_command(input_path: str, output: str, verbose: bool):
+def extract_fonts_command(input_path: str, output: str, subset: bool, index_text: bool, include: tuple,
+                          exclude: tuple, verbose: bool):
     """
-    Extract fonts from PowerPoint (.pptx) and Keynote (.key) files.
+    Extract fonts from PowerPoint (.pptx), Keynote (.key) and PDF files.
     
-    INPUT_PATH can be a single file or a directory containing presentations.
+    INPUT_PATH can be a single file or a directory of presentations;
+    subfolders are searched too. For PDFs the fonts are listed and their
+    embedded (usually subset) font programs saved.
     """
     print_info(f"Presentation Toolkit - Font Extractor")
     print_info(f"Input: {input_path}")
     print_info(f"Output: {output}\n")
     
-    # Get all presentation files
-    presentation_files = get_files_from_path(input_path, ['.pptx', '.key', '.keynote'])
-    
-    if not presentation_files:
-        print_error("No presentation files found!")
-        sys.exit(1)
-    
-    print_info(f"Found {len(presentation_files)} presentation file(s)\n")
+    # Presentation files are processed as the folder walk finds them
+    presentation_files = discover_files(input_path, FONT_SOURCE_EXTENSIONS, include, exclude)
     
     # Extract fonts from each file
-    extractor = FontExtractor(output_dir=output)
+    extractor = FontExtractor(output_dir=output, collect_text=index_text)
+    text_index = SlideTextIndex() if index_text else None
     total_fonts_extracted = 0
-    
-    for file_path in tqdm(presentation_files, desc="Processing files", unit="file"):
-        try:
-            if verbose:
-                print(f"\n{Fore.CYAN}Processing: {file_path.name}{Style.RESET_ALL}")
-            
-            if file_path.suffix.lower() == '.pptx':
-                result = extractor.extract_from_pptx(str(file_path))
-            else:
-                result = extractor.extract_from_keynote(str(file_path))
-            
-            embedded_count = len(result['embedded_fonts'])
-            referenced_count = len(result['referenced_fonts'])
-            total_fonts_extracted += embedded_count
-            
-            if verbose:
-                if embedded_count > 0:
-                    print_success(f"  Extracted {embedded_count} embedded font(s)")
-                    for font in result['embedded_fonts']:
-                        print(f"    - {Path(font).name}")
+    files_processed = 0
+    subset_jobs = []
+    
+    with FontInventory() as inventory:
+        for file_path in tqdm(presentation_files, desc="Processing files", unit="file"):
+            files_processed += 1
+            try:
+                if verbose:
+                    print(f"\n{Fore.CYAN}Processing: {file_path.name}{Style.RESET_ALL}")
+                
+                if file_path.suffix.lower() == '.pptx':
+                    result = extractor.extract_from_pptx(str(file_path))
+                elif file_path.suffix.lower() == '.pdf':
+                    result = extractor.extract_from_pdf(str(file_path), extract_embedded=True)
                 else:
-                    print_warning(f"  No embedded fonts found")
+                    result = extractor.extract_from_keynote(str(file_path))
+                _record_inventory(inventory, file_path, result)
+                if text_index is not None:
+                    text_index.record(str(file_path), result['slide_text'])
                 
-                if referenced_count > 0:
-                    print_info(f"  Found {referenced_count} font reference(s):")
-                    for font in result['referenced_fonts']:
-                        print(f"    - {font}")
+                embedded_count = len(result['embedded_fonts'])
+                referenced_count = len(result['referenced_fonts'])
+                total_fonts_extracted += embedded_count
                 
-                print_info(f"  Saved to: {result['output_folder']}")
-        
-        except Exception as e:
-            print_error(f"Error processing {file_path.name}: {e}")
+                if subset and result.get('font_codepoints'):
+                    plain_fonts = [info.get('decoded_path') or str(Path(result['output_folder']) / info['file'])
+                                   for info in result.get('embedded_font_info', [])
+                                   if info.get('decoded_path') or info.get('format') == 'sfnt']
+                    for job in plan_subset_jobs(plain_fonts, result['font_codepoints']):
+                        subset_jobs.append((job, Path(result['output_folder']) / 'subset'))
+                
+                if verbose:
+                    if embedded_count > 0:
+                        print_success(f"  Extracted {embedded_count} embedded font(s)")
+                        font_info = {info['file']: info for info in result.get('embedded_font_info', [])}
+                        for font in result['embedded_fonts']:
+                            info = font_info.get(Path(font).name, {})
+                            if info.get('family'):
+                                print(f"    - {Path(font).name} ({info['family']} {info['style']}, weight {info['weight']})")
+                            else:
+                                print(f"    - {Path(font).name}")
+                    else:
+                        print_warning(f"  No embedded fonts found")
+                    
+                    if referenced_count > 0:
+                        print_info(f"  Found {referenced_count} font reference(s):")
+                        for font in result['referenced_fonts']:
+                            print(f"    - {font}")
+                    
+                    print_info(f"  Saved to: {result['output_folder']}")
+            
+            except Exception as e:
+                print_error(f"Error processing {file_path.name}: {e}")
+    
+    if not files_processed:
+        print_error("No presentation files found!")
+        sys.exit(1)
+    
+    if subset_jobs:
+        _write_subset_fonts(subset_jobs)
     
     print(f"\n{Fore.GREEN}{'='*60}{Style.RESET_ALL}")
     print_success(f"Extraction complete!")
+    print_info(f"Presentation files processed: {files_processed}")
     print_info(f"Total embedded fonts extracted: {total_fonts_extracted}")
     print_info(f"Output directory: {output}")
     print(f"{Fore.GREEN}{'='*60}{Style.RESET_ALL}")
 
 
+@cli.command('keynote-previews')
+@click.argument('input_path', type=click.Path(exists=True))
+@click.option('--output', '-o', default='keynote_previews', help='Output directory for preview images')
+@click.option('--include', '-i', multiple=True, help='Only process files matching this glob (repeatable)')
+@click.option('--exclude', '-x', multiple=True, help='Skip files and folders matching this glob (repeatable)')
+def keynote_previews_command(input_path: str, output: str, include: tuple, exclude: tuple):
+    """
+    Extract the slide thumbnails stored inside Keynote files.
+    
+    Keynote saves a document preview and a thumbnail per slide; they are
+    copied out as slide-001.jpg, slide-002.jpg, ... without rendering.
+    INPUT_PATH can be a single .key file or a directory.
+    """
+    files_processed = 0
+    output_names = {}
+    for file_path in discover_files(input_path, ['.key', '.keynote'], include, exclude):
+        files_processed += 1
+        try:
+            preview_folder = Path(output) / output_name(file_path, output_names)
+            previews = KeynotePreviews(str(file_path)).extract(str(preview_folder))
+        except Exception as e:
+            print_error(f"Error reading previews of {file_path.name}: {e}")
+            continue
+        
+        slides = sum(1 for preview in previews if preview['slide'] is not None)
+        if previews:
+            print_success(f"{file_path.name}: {len(previews)} preview(s), {slides} mapped to slides")
+        else:
+            print_warning(f"{file_path.name}: no previews stored in the document")
+    
+    if not files_processed:
+        print_error("No Keynote files found!")
+        sys.exit(1)
+    print_info(f"Output directory: {output}")
+
+
 @cli.command('pdf-to-pptx')
 @click.argument('input_path', type=click.Path(exists=True))
 @click.option('--output', '-o', default='converted_pptx', help='Output directory for PPTX files')
@@ -207,8 +307,26 @@ def pdf_to_pptx_command(input_path: str, output: str, dpi: int, verbose: bool):
 @click.option('--project-name', '-p', default=None, help='Project name for output folder')
 @click.option('--output', '-o', default='hunted_fonts', help='Output directory')
 @click.option('--api-key', '-k', default=None, help='Google Fonts API key (or set GOOGLE_FONTS_API_KEY in .env)')
+@click.option('--min-runs', default=0, type=int, help='Skip fonts used in fewer text runs than this (stray references)')
+@click.option('--subset', is_flag=True, help='Also write subset copies of downloaded fonts to fonts_subset/')
+@click.option('--jobs', '-j', default=8, type=int, help='Fonts to hunt at the same time (default: 8)')
+@click.option('--max-per-host', default=4, type=int, help='Concurrent requests per server (default: 4)')
+@click.option('--rate-limit', default=10.0, type=float, help='Requests per second per server (default: 10, 0 for no limit)')
+@click.option('--deadline', default=None, type=float,
+              help='Seconds the hunt may spend on network requests; unfinished fonts get search links')
+@click.option('--mirror', '-m', default=None, type=click.Path(exists=True, file_okay=False),
+              help='Local font mirror to search first, e.g. a google/fonts checkout (or set FONT_MIRROR_DIR)')
+@click.option('--font-dir', multiple=True, type=click.Path(exists=True, file_okay=False),
+              help='Extra folder of installed fonts to skip, besides the system font folders (repeatable)')
+@click.option('--ignore-installed', is_flag=True, help='Hunt fonts even if they are installed on this machine')
+@click.option('--refresh', is_flag=True, help='Search again instead of reusing results remembered from earlier hunts')
+@click.option('--include', '-i', multiple=True, help='Only process files matching this glob (repeatable)')
+@click.option('--exclude', '-x', multiple=True, help='Skip files and folders matching this glob (repeatable)')
 @click.option('--verbose', '-v', is_flag=True, help='Show detailed output')
-def hunt_fonts_command(input_path: str, project_name: str, output: str, api_key: str, verbose: bool):
+def hunt_fonts_command(input_path: str, project_name: str, output: str, api_key: str, min_runs: int,
+                       subset: bool, jobs: int, max_per_host: int, rate_limit: float, deadline: float,
+                       mirror: str, font_dir: tuple,
+                       ignore_installed: bool, refresh: bool, include: tuple, exclude: tuple, verbose: bool):
     """
     Hunt for fonts from presentations across 10 free repositories.
     
@@ -216,7 +334,8 @@ def hunt_fonts_command(input_path: str, project_name: str, output: str, api_key:
     searches for them across Google Fonts and 9 other free font repositories.
     Generates a comprehensive HTML report with download links.
     
-    INPUT_PATH can be a single presentation file or directory.
+    INPUT_PATH can be a single presentation file or directory; PDFs
+    exported from presentations are analyzed too.
     """
     print_info(f"Presentation Toolkit - Font Hunter 🔍")
     print_info(f"Input: {input_path}")
@@ -230,45 +349,77 @@ def hunt_fonts_command(input_path: str, project_name: str, output: str, api_key:
         else:
             project_name = input_path_obj.name or "fonts"
     
-    # Get all presentation files
-    presentation_files = get_files_from_path(input_path, ['.pptx', '.key', '.keynote'])
-    
-    if not presentation_files:
-        print_error("No presentation files found!")
-        sys.exit(1)
-    
-    print_info(f"Found {len(presentation_files)} presentation file(s)")
+    # Presentation files are analyzed as the folder walk finds them
+    presentation_files = discover_files(input_path, FONT_SOURCE_EXTENSIONS, include, exclude)
     
     # Extract font names from all presentations
     print(f"\n{Fore.CYAN}Step 1: Analyzing presentations...{Style.RESET_ALL}\n")
     
     all_fonts = set()
+    font_usage = {}
+    font_codepoints = {}
+    unmeasured_fonts = set()  # fonts from files without run statistics (Keynote)
+    embedded_font_info = []
+    theme_fallback_fonts = set()
+    named_fonts = set()  # referenced other than as a theme's script fallback, by any deck
     extractor = FontExtractor()
-    
-    for file_path in presentation_files:
-        try:
-            if verbose:
-                print(f"  Analyzing: {file_path.name}")
-            
-            if file_path.suffix.lower() == '.pptx':
-                result = extractor.extract_from_pptx(str(file_path))
-            else:
-                result = extractor.extract_from_keynote(str(file_path))
-            
-            # Add referenced fonts to the hunt list
-            all_fonts.update(result['referenced_fonts'])
+    files_analyzed = 0
+    
+    with FontInventory() as inventory:
+        for file_path in presentation_files:
+            files_analyzed += 1
+            try:
+                if verbose:
+                    print(f"  Analyzing: {file_path.name}")
+                
+                if file_path.suffix.lower() == '.pptx':
+                    result = extractor.extract_from_pptx(str(file_path))
+                elif file_path.suffix.lower() == '.pdf':
+                    # Fonts embedded in a PDF are subsets, so they are hunted too
+                    result = extractor.extract_from_pdf(str(file_path))
+                else:
+                    result = extractor.extract_from_keynote(str(file_path))
+                _record_inventory(inventory, file_path, result)
+                
+                # Add referenced fonts to the hunt list
+                all_fonts.update(result['referenced_fonts'])
+                fallbacks = set(result.get('theme_fallback_fonts', []))
+                theme_fallback_fonts |= fallbacks
+                named_fonts.update(font for font in result['referenced_fonts'] if font not in fallbacks)
+                for font, codepoints in result.get('font_codepoints', {}).items():
+                    font_codepoints.setdefault(font, set()).update(codepoints)
+                if result.get('font_usage'):
+                    merge_font_usage(font_usage, result['font_usage'])
+                else:
+                    unmeasured_fonts.update(result['referenced_fonts'])
+                
+                # Also note embedded fonts (already have these)
+                embedded_font_info.extend(info for info in result.get('embedded_font_info', []) if info.get('family'))
+                if verbose and result['embedded_fonts']:
+                    print(f"    ✓ {len(result['embedded_fonts'])} embedded fonts found (already available)")
             
-            # Also note embedded fonts (already have these)
-            if verbose and result['embedded_fonts']:
-                print(f"    ✓ {len(result['embedded_fonts'])} embedded fonts found (already available)")
-        
-        except Exception as e:
-            print_error(f"Error analyzing {file_path.name}: {e}")
+            except Exception as e:
+                print_error(f"Error analyzing {file_path.name}: {e}")
+    
+    if not files_analyzed:
+        print_error("No presentation files found!")
+        sys.exit(1)
+    
+    print_info(f"Analyzed {files_analyzed} presentation file(s)")
     
     if not all_fonts:
         print_warning("No font references found in presentations")
         sys.exit(0)
     
+    if min_runs > 0:
+        # Fonts only named in styles or used in a handful of runs are strays
+        stray_fonts = {font for font in all_fonts - unmeasured_fonts
+                       if font_usage.get(font, {}).get('runs', 0) < min_runs}
+        if stray_fonts:
+            print_warning(f"Skipping {len(stray_fonts)} font(s) used in fewer than {min_runs} run(s): "
+                          f"{', '.join(sorted(stray_fonts))}")
+            all_fonts -= stray_fonts
+    
     print_success(f"Found {len(all_fonts)} unique fonts to hunt for\n")
     
     # Hunt for fonts
@@ -276,12 +427,29 @@ def hunt_fonts_command(input_path: str, project_name: str, output: str, api_key:
     
     # Use provided API key or environment variable
     effective_api_key = api_key or os.getenv('GOOGLE_FONTS_API_KEY')
-    if not effective_api_key:
+    font_mirror = get_font_mirror(mirror)
+    if not effective_api_key and not font_mirror:
         print_warning("No Google Fonts API key found. Set GOOGLE_FONTS_API_KEY in .env file")
         print_info("You can still use other repositories, but auto-download won't work\n")
-    
-    hunter = FontHunter(api_key=effective_api_key, output_dir=output)
-    results = hunter.hunt_fonts(sorted(list(all_fonts)), project_name)
+    if font_mirror:
+        stats = font_mirror.refresh()
+        print_info(f"Font mirror: {font_mirror.root} ({stats['fonts']} fonts, "
+                   f"{stats['parsed']} newly indexed)\n")
+    
+    hunter = FontHunter(api_key=effective_api_key, output_dir=output, max_workers=jobs,
+                        max_per_host=max_per_host, mirror=font_mirror,
+                        installed_fonts=None if ignore_installed else get_installed_fonts(list(font_dir)),
+                        skip_installed=not ignore_installed, refresh_results=refresh,
+                        deadline=deadline, rate_limit=rate_limit or None)
+    results = hunter.hunt_fonts(sorted(list(all_fonts)), project_name, available_fonts=embedded_font_info,
+                                theme_fallback_fonts=theme_fallback_fonts - named_fonts,
+                                font_usage=font_usage)
+    
+    if subset and font_codepoints:
+        fonts_folder = Path(results['project_folder']) / 'fonts_downloaded'
+        font_files = sorted(f for f in fonts_folder.iterdir() if f.suffix.lower() in ('.ttf', '.otf'))
+        subset_folder = Path(results['project_folder']) / 'fonts_subset'
+        _write_subset_fonts([(job, subset_folder) for job in plan_subset_jobs(font_files, font_codepoints)])
     
     # Display summary
     print(f"\n{Fore.GREEN}{'='*60}{Style.RESET_ALL}")
@@ -290,6 +458,8 @@ def hunt_fonts_command(input_path: str, project_name: str, output: str, api_key:
     print(f"  ✅ Auto-downloaded (Google Fonts): {len(results['google_fonts_downloaded'])}")
     print(f"  🆓 Found on free repositories: {len(results['free_fonts_found'])}")
     print(f"  💰 Commercial fonts (purchase needed): {len(results['commercial_fonts'])}")
+    if results['already_available']:
+        print(f"  📦 Already available (embedded/downloaded): {len(results['already_available'])}")
     
     print(f"\n{Fore.CYAN}Output:{Style.RESET_ALL}")
     print(f"  📁 Project folder: {results['project_folder']}")
@@ -315,48 +485,291 @@ def hunt_fonts_command(input_path: str, project_name: str, output: str, api_key:
         pass
 
 
-@cli.command('info')
-@click.argument('file_path', type=click.Path(exists=True))
-def info_command(file_path: str):
+@cli.command('check-glyphs')
+@click.argument('input_path', type=click.Path(exists=True))
+@click.option('--fonts-dir', '-f', multiple=True, type=click.Path(exists=True, file_okay=False),
+              help='Extra font folder to check against, e.g. hunted_fonts/<project>/fonts_downloaded (repeatable)')
+@click.option('--no-system-fonts', is_flag=True, help='Do not check against locally installed fonts')
+@click.option('--output', '-o', default='extracted_fonts', help='Output directory for extracted fonts')
+@click.option('--include', '-i', multiple=True, help='Only process files matching this glob (repeatable)')
+@click.option('--exclude', '-x', multiple=True, help='Skip files and folders matching this glob (repeatable)')
+def check_glyphs_command(input_path: str, fonts_dir: tuple, no_system_fonts: bool, output: str,
+                         include: tuple, exclude: tuple):
     """
-    Display information about a presentation or PDF file.
+    Check that the fonts used in presentations have glyphs for their text.
+    
+    Compares the characters each font renders against embedded fonts, the
+    given font folders and locally installed fonts, and lists missing glyphs
+    (e.g. CJK or Nordic diacritics).
+    
+    INPUT_PATH can be a single presentation file or directory.
     """
-    file_path = Path(file_path)
-    
-    print_info(f"File Information")
-    print(f"{Fore.CYAN}{'='*60}{Style.RESET_ALL}")
-    print(f"File: {file_path.name}")
-    print(f"Path: {file_path.absolute()}")
-    print(f"Size: {file_path.stat().st_size / 1024:.2f} KB")
-    print(f"Type: {file_path.suffix}")
-    
-    if file_path.suffix.lower() == '.pptx':
-        print(f"\n{Fore.CYAN}Analyzing PowerPoint file...{Style.RESET_ALL}")
-        extractor = FontExtractor()
-        result = extractor.extract_from_pptx(str(file_path))
+    presentation_files = get_files_from_path(input_path, [".pptx"], include, exclude)
+    
+    if not presentation_files:
+        print_error("No PowerPoint files found!")
+        sys.exit(1)
+    
+    extractor = FontExtractor(output_dir=output)
+    checker = GlyphCoverageChecker(font_dirs=list(fonts_dir), include_system_fonts=not no_system_fonts)
+    problems = 0
+    
+    for file_path in presentation_files:
+        try:
+            result = extractor.extract_from_pptx(str(file_path))
+        except Exception as e:
+            print_error(f"Error analyzing {file_path.name}: {e}")
+            continue
         
-        print(f"\nEmbedded Fonts: {len(result['embedded_fonts'])}")
-        for font in result['embedded_fonts']:
-            print(f"  - {Path(font).name}")
+        # Embedded fonts only stand in for their own deck
+        deck_checker = checker.overlay()
+        for info in result.get('embedded_font_info', []):
+            if not info.get('family'):
+                continue
+            font_path = info.get('decoded_path')
+            if not font_path and info.get('format') == 'sfnt':
+                font_path = str(Path(result['output_folder']) / info['file'])
+            if font_path:
+                deck_checker.add_font_file(font_path, 'embedded', info)
         
-        print(f"\nReferenced Fonts: {len(result['referenced_fonts'])}")
-        for font in result['referenced_fonts']:
-            print(f"  - {font}")
-    
-    elif file_path.suffix.lower() in ['.key', '.keynote']:
-        print(f"\n{Fore.CYAN}Analyzing Keynote file...{Style.RESET_ALL}")
-        extractor = FontExtractor()
-        result = extractor.extract_from_keynote(str(file_path))
+        print(f"\n{Fore.CYAN}{file_path.name}{Style.RESET_ALL}")
+        for entry in deck_checker.check(result.get('font_codepoints', {})):
+            if entry['status'] == 'ok':
+                print_success(f"  {entry['font']}: {entry['checked']} characters covered ({entry['source']})")
+            elif entry['status'] == 'missing_glyphs':
+                problems += 1
+                missing = ''.join(entry['missing'][:40])
+                more = f" (+{len(entry['missing']) - 40} more)" if len(entry['missing']) > 40 else ""
+                print_error(f"  {entry['font']}: {len(entry['missing'])} missing glyph(s) in "
+                            f"{Path(entry['file']).name} ({entry['source']}): {missing}{more}")
+            else:
+                problems += 1
+                print_warning(f"  {entry['font']}: no font file available to check")
+    
+    print(f"\n{Fore.GREEN}{'='*60}{Style.RESET_ALL}")
+    if problems:
+        print_warning(f"{problems} font(s) with missing glyphs or no available font file")
+    else:
+        print_success("All fonts cover the text they render")
+    print(f"{Fore.GREEN}{'='*60}{Style.RESET_ALL}")
+
+
+@cli.command('index-fonts')
+@click.argument('input_path', type=click.Path(exists=True))
+@click.option('--output', '-o', default='extracted_fonts', help='Output directory for extracted fonts')
+@click.option('--inventory', default=None, type=click.Path(dir_okay=False),
+              help='Inventory database (default: ~/.cache/presentation-toolkit/font_inventory.sqlite)')
+@click.option('--force', is_flag=True, help='Re-analyze presentations that have not changed')
+@click.option('--index-text', is_flag=True, help='Also add slide text and notes to the search index (search-slides)')
+@click.option('--include', '-i', multiple=True, help='Only process files matching this glob (repeatable)')
+@click.option('--exclude', '-x', multiple=True, help='Skip files and folders matching this glob (repeatable)')
+def index_fonts_command(input_path: str, output: str, inventory: str, force: bool, index_text: bool,
+                        include: tuple, exclude: tuple):
+    """
+    Add presentations (and PDF exports) to the cross-deck font inventory.
+    
+    Only new and changed presentations are analyzed; presentations that
+    were deleted from INPUT_PATH are dropped from the inventory.
+    """
+    extractor = FontExtractor(output_dir=output, collect_text=index_text)
+    text_index = SlideTextIndex() if index_text else None
+    analyzed = unchanged = 0
+    
+    with FontInventory(inventory) as font_inventory:
+        presentation_files = discover_files(input_path, FONT_SOURCE_EXTENSIONS, include, exclude)
+        for file_path in tqdm(presentation_files, desc="Indexing files", unit="file"):
+            if not force and font_inventory.is_current(str(file_path)) and (
+                    text_index is None or text_index.is_current(str(file_path))):
+                unchanged += 1
+                continue
+            try:
+                if file_path.suffix.lower() == '.pptx':
+                    result = extractor.extract_from_pptx(str(file_path))
+                elif file_path.suffix.lower() == '.pdf':
+                    result = extractor.extract_from_pdf(str(file_path))
+                else:
+                    result = extractor.extract_from_keynote(str(file_path))
+                font_inventory.record(str(file_path), result)
+                if text_index is not None:
+                    text_index.record(str(file_path), result['slide_text'])
+                analyzed += 1
+            except Exception as e:
+                print_error(f"Error indexing {file_path.name}: {e}")
         
-        print(f"\nEmbedded Fonts: {len(result['embedded_fonts'])}")
-        for font in result['embedded_fonts']:
-            print(f"  - {Path(font).name}")
+        removed = font_inventory.prune(input_path) if Path(input_path).is_dir() else 0
+        if text_index is not None and Path(input_path).is_dir():
+            text_index.prune(input_path)
+        stats = font_inventory.stats()
+        db_path = font_inventory.db_path
+    
+    print_success(f"Indexed {analyzed} presentation(s), {unchanged} unchanged, {removed} removed")
+    print_info(f"Inventory: {stats['decks']} presentation(s), {stats['fonts']} font(s) ({db_path})")
+
+
+@cli.command('query-fonts')
+@click.option('--font', '-f', default=None, help='List presentations that use this font or family')
+@click.option('--decks', '-d', default=None, help='List fonts needed by presentations whose path matches '
+                                                  'this glob or text (e.g. "Room B")')
+@click.option('--exact', is_flag=True, help='Match the font name exactly instead of as a family prefix')
+@click.option('--json', 'as_json', is_flag=True, help='Print results as JSON')
+@click.option('--inventory', default=None, type=click.Path(dir_okay=False),
+              help='Inventory database (default: ~/.cache/presentation-toolkit/font_inventory.sqlite)')
+def query_fonts_command(font: str, decks: str, exact: bool, as_json: bool, inventory: str):
+    """
+    Query the font inventory built by index-fonts, extract-fonts and hunt-fonts.
     
-    elif file_path.suffix.lower() == '.pdf':
+    \b
+    Examples:
+      query-fonts --font Gotham        which presentations need Gotham?
+      query-fonts --decks "Room B"     which fonts does Room B need?
+    """
+    with FontInventory(inventory) as font_inventory:
+        if font:
+            results = font_inventory.decks_for_font(font, exact=exact)
+        else:
+            results = font_inventory.fonts_for_decks(decks)
+    
+    if as_json:
+        print(json.dumps(results, indent=2, ensure_ascii=False))
+        return
+    
+    if not results:
+        print_warning("No matching presentations in the inventory")
+        return
+    
+    if font:
+        print_info(f"{len(results)} presentation(s) use {font}:")
+        for entry in results:
+            embedded = " [embedded]" if entry['embedded'] else ""
+            usage = f"{len(entry['slides'])} slide(s), {entry['runs']} run(s)" if entry['runs'] else "style only"
+            print(f"  {entry['deck']}")
+            print(f"    {entry['font']}: {usage}{embedded}")
+    else:
+        scope = f"presentations matching '{decks}'" if decks else "all presentations"
+        print_info(f"{len(results)} font(s) needed by {scope}:")
+        for entry in results:
+            embedded = f", embedded in {entry['embedded_in']}" if entry['embedded_in'] else ""
+            print(f"  {entry['font']} ({entry['category'] or 'unknown'}): {entry['decks']} deck(s), "
+                  f"{entry['slides']} slide(s){embedded}")
+
+
+@cli.command('search-slides')
+@click.argument('query')
+@click.option('--limit', '-n', default=20, type=int, help='Maximum number of slides to list')
+@click.option('--json', 'as_json', is_flag=True, help='Print results as JSON')
+def search_slides_command(query: str, limit: int, as_json: bool):
+    """
+    Find slides by their title, text or speaker notes.
+    
+    Searches presentations indexed with --index-text. QUERY uses SQLite FTS5
+    syntax, e.g. "Q3 revenue", "revenue AND forecast" or "title: agenda".
+    """
+    try:
+        with SlideTextIndex() as text_index:
+            results = text_index.search(query, limit=limit)
+    except Exception as e:
+        print_error(f"Search failed: {e}")
+        sys.exit(1)
+    
+    if as_json:
+        print(json.dumps(results, indent=2, ensure_ascii=False))
+        return
+    
+    if not results:
+        print_warning("No matching slides")
+        return
+    
+    for entry in results:
+        title = f" - {entry['title'].splitlines()[0]}" if entry['title'] else ""
+        print(f"{Fore.CYAN}{entry['deck']}{Style.RESET_ALL} (slide {entry['slide']}){title}")
+        print(f"    {' '.join(entry['snippet'].split())}")
+
+
+def _format_bytes(size: int) -> str:
+    """Human-readable size (KB below 1 MB, MB above)."""
+    if size < 1024 * 1024:
+        return f"{size / 1024:.1f} KB"
+    return f"{size / (1024 * 1024):.1f} MB"
+
+
+def _print_summary(summary: dict):
+    """Print a package summary from summarize_package."""
+    print(f"File: {summary['file']}")
+    print(f"Path: {summary['path']}")
+    print(f"Size: {_format_bytes(summary['size'])}")
+    print(f"Type: {summary['type'] or 'package'}")
+    
+    if summary['error']:
+        print_error(f"Could not read package: {summary['error']}")
+        return
+    
+    if summary['slides'] is not None:
+        print(f"Slides: {summary['slides']}")
+    if summary['slide_width']:
+        width = summary['slide_width'] / EMU_PER_INCH
+        height = summary['slide_height'] / EMU_PER_INCH
+        ratio = f" ({summary['aspect_ratio']})" if summary['aspect_ratio'] else ""
+        print(f"Slide size: {width:.2f} x {height:.2f} in{ratio}")
+    
+    print(f"Embedded fonts: {summary['embedded_fonts']} ({_format_bytes(summary['embedded_font_bytes'])})")
+    print(f"Media: {_format_bytes(summary['media_bytes'])}")
+    for media_type, media in sorted(summary['media'].items(), key=lambda item: -item[1]['bytes']):
+        print(f"  - {media_type}: {media['count']} file(s), {_format_bytes(media['bytes'])}")
+    
+    print("Largest parts:")
+    for part in summary['largest_parts']:
+        print(f"  - {part['name']}: {_format_bytes(part['size'])}")
+
+
+@cli.command('info')
+@click.argument('input_path', type=click.Path(exists=True))
+@click.option('--ndjson', is_flag=True, help='Print one JSON summary per line')
+@click.option('--fonts', is_flag=True, help='Also analyze the slides and list referenced fonts (slower)')
+def info_command(input_path: str, ndjson: bool, fonts: bool):
+    """
+    Display information about a presentation or PDF file.
+    
+    Summaries are read from the zip directory and presentation.xml only,
+    so INPUT_PATH can also be a folder of hundreds of decks to triage.
+    """
+    input_path_obj = Path(input_path)
+    if input_path_obj.is_file() and input_path_obj.suffix.lower() == '.pdf':
+        print_info(f"File Information")
+        print(f"{Fore.CYAN}{'='*60}{Style.RESET_ALL}")
+        print(f"File: {input_path_obj.name}")
+        print(f"Path: {input_path_obj.absolute()}")
+        print(f"Size: {input_path_obj.stat().st_size / 1024:.2f} KB")
         print(f"\n{Fore.CYAN}PDF file detected{Style.RESET_ALL}")
         print("Use 'pdf-to-pptx' command to convert to PowerPoint")
+        print(f"{Fore.CYAN}{'='*60}{Style.RESET_ALL}")
+        return
     
-    print(f"{Fore.CYAN}{'='*60}{Style.RESET_ALL}")
+    with tempfile.TemporaryDirectory() as scratch_dir:
+        extractor = FontExtractor(output_dir=scratch_dir, dedupe_fonts=False) if fonts else None
+        
+        for file_path in discover_files(input_path, PRESENTATION_EXTENSIONS):
+            summary = summarize_package(str(file_path))
+            
+            if extractor is not None and not summary['error']:
+                if file_path.suffix.lower() == '.pptx':
+                    result = extractor.extract_from_pptx(str(file_path))
+                else:
+                    result = extractor.extract_from_keynote(str(file_path))
+                summary['referenced_fonts'] = result['referenced_fonts']
+            
+            if ndjson:
+                print(json.dumps(summary, ensure_ascii=False), flush=True)
+                continue
+            
+            print(f"{Fore.CYAN}{'='*60}{Style.RESET_ALL}")
+            _print_summary(summary)
+            if 'referenced_fonts' in summary:
+                print(f"Referenced fonts: {len(summary['referenced_fonts'])}")
+                for font in summary['referenced_fonts']:
+                    print(f"  - {font}")
+    
+    if not ndjson:
+        print(f"{Fore.CYAN}{'='*60}{Style.RESET_ALL}")
 
 
 if __name__ == '__main__':
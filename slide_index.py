@@ -0,0 +1,159 @@
+"""
+Full-text index of slide content.
+Stores slide titles, text and speaker notes collected during font
+extraction in an SQLite FTS5 index, so decks can be found by what they say.
+"""
+
+import os
+import time
+import sqlite3
+from pathlib import Path
+from typing import Dict, List, Optional
+
+from font_inventory import file_signature
+
+
+DEFAULT_SLIDE_INDEX_PATH = Path.home() / ".cache" / "presentation-toolkit" / "slide_text.sqlite"
+
+SCHEMA_VERSION = 1
+
+# slides holds the text; slide_fts is an external-content FTS5 index over
+# it, kept in sync by triggers so a deck's rows can be replaced by deck_id
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS decks (
+    id INTEGER PRIMARY KEY,
+    path TEXT UNIQUE NOT NULL,
+    size INTEGER NOT NULL,
+    mtime_ns INTEGER NOT NULL,
+    indexed_at REAL NOT NULL
+);
+CREATE TABLE IF NOT EXISTS slides (
+    id INTEGER PRIMARY KEY,
+    deck_id INTEGER NOT NULL REFERENCES decks(id) ON DELETE CASCADE,
+    slide INTEGER NOT NULL,
+    title TEXT NOT NULL DEFAULT '',
+    body TEXT NOT NULL DEFAULT '',
+    notes TEXT NOT NULL DEFAULT ''
+);
+CREATE INDEX IF NOT EXISTS slides_deck ON slides (deck_id);
+CREATE VIRTUAL TABLE IF NOT EXISTS slide_fts USING fts5(
+    title, body, notes,
+    content='slides', content_rowid='id',
+    tokenize='unicode61 remove_diacritics 2'
+);
+CREATE TRIGGER IF NOT EXISTS slides_ai AFTER INSERT ON slides BEGIN
+    INSERT INTO slide_fts (rowid, title, body, notes) VALUES (new.id, new.title, new.body, new.notes);
+END;
+CREATE TRIGGER IF NOT EXISTS slides_ad AFTER DELETE ON slides BEGIN
+    INSERT INTO slide_fts (slide_fts, rowid, title, body, notes)
+    VALUES ('delete', old.id, old.title, old.body, old.notes);
+END;
+"""
+
+
+class SlideTextIndex:
+    """
+    Search presentations by slide title, text and speaker notes.
+
+    Each recorded presentation replaces its previous slides, keyed by its
+    absolute path. Queries use FTS5 syntax ("Q3 revenue", "revenue AND
+    forecast", "notes: thank*") and are ranked by BM25, titles weighted
+    highest.
+    """
+
+    def __init__(self, db_path: Optional[str] = None):
+        self.db_path = Path(db_path) if db_path else DEFAULT_SLIDE_INDEX_PATH
+        self.db_path.parent.mkdir(exist_ok=True, parents=True)
+        self._conn = sqlite3.connect(str(self.db_path), timeout=30)
+        self._conn.row_factory = sqlite3.Row
+        self._conn.execute("PRAGMA foreign_keys = ON")
+        self._conn.execute("PRAGMA journal_mode = WAL")
+        self._conn.execute("PRAGMA synchronous = NORMAL")
+        try:
+            self._conn.executescript(SCHEMA)
+        except sqlite3.OperationalError as e:
+            self._conn.close()
+            raise RuntimeError(f"The slide text index needs SQLite with FTS5 support: {e}")
+        self._conn.execute(f"PRAGMA user_version = {SCHEMA_VERSION}")
+
+    def close(self):
+        self._conn.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def is_current(self, presentation_path: str) -> bool:
+        """Check whether a presentation is indexed and unchanged since."""
+        path = Path(presentation_path).absolute()
+        row = self._conn.execute("SELECT size, mtime_ns FROM decks WHERE path = ?", (str(path),)).fetchone()
+        if row is None:
+            return False
+        try:
+            return (row['size'], row['mtime_ns']) == file_signature(path)
+        except OSError:
+            return False
+
+    def record(self, presentation_path: str, slide_text: List[Dict]):
+        """
+        Store the text of one presentation, replacing earlier rows.
+
+        Args:
+            presentation_path: Path to the presentation
+            slide_text: The 'slide_text' entry of an extraction result
+        """
+        path = Path(presentation_path).absolute()
+        size, mtime_ns = file_signature(path)
+
+        with self._conn:
+            # Cascades to slides, whose delete trigger updates the FTS index
+            self._conn.execute("DELETE FROM decks WHERE path = ?", (str(path),))
+            deck_id = self._conn.execute(
+                "INSERT INTO decks (path, size, mtime_ns, indexed_at) VALUES (?, ?, ?, ?)",
+                (str(path), size, mtime_ns, time.time())
+            ).lastrowid
+            self._conn.executemany(
+                "INSERT INTO slides (deck_id, slide, title, body, notes) VALUES (?, ?, ?, ?, ?)",
+                [(deck_id, entry['slide'], entry['title'], entry['text'], entry['notes'])
+                 for entry in slide_text if entry['title'] or entry['text'] or entry['notes']]
+            )
+
+    def prune(self, root: Optional[str] = None) -> int:
+        """Drop presentations below root (or anywhere) that no longer exist on disk."""
+        query = "SELECT id, path FROM decks"
+        params = ()
+        if root:
+            prefix = str(Path(root).absolute()).rstrip(os.sep) + os.sep
+            query += " WHERE substr(path, 1, ?) = ?"
+            params = (len(prefix), prefix)
+
+        missing = [(row['id'],) for row in self._conn.execute(query, params) if not Path(row['path']).exists()]
+        with self._conn:
+            self._conn.executemany("DELETE FROM decks WHERE id = ?", missing)
+        return len(missing)
+
+    def search(self, query: str, limit: int = 20) -> List[Dict]:
+        """
+        Find slides matching a full-text query.
+
+        Returns:
+            One dictionary per slide with 'deck', 'slide', 'title' and
+            'snippet', best match first
+        """
+        rows = self._conn.execute(
+            "SELECT d.path, s.slide, s.title, "
+            "snippet(slide_fts, -1, '[', ']', '...', 12) AS snippet "
+            "FROM slide_fts JOIN slides s ON s.id = slide_fts.rowid JOIN decks d ON d.id = s.deck_id "
+            "WHERE slide_fts MATCH ? ORDER BY bm25(slide_fts, 10.0, 1.0, 0.5) LIMIT ?",
+            (query, limit)
+        )
+        return [{'deck': row['path'], 'slide': row['slide'], 'title': row['title'], 'snippet': row['snippet']}
+                for row in rows]
+
+    def stats(self) -> Dict:
+        """Return the number of indexed presentations and slides."""
+        decks = self._conn.execute("SELECT COUNT(*) FROM decks").fetchone()[0]
+        slides = self._conn.execute("SELECT COUNT(*) FROM slides").fetchone()[0]
+        return {'decks': decks, 'slides': slides}
@@ -0,0 +1,100 @@
+"""
+Tests for the cross-project download cache under eviction and concurrent fetches.
+"""
+
+import multiprocessing
+import threading
+import time
+
+import pytest
+
+import download_cache
+from download_cache import FontDownloadCache
+
+
+FONT = b'\x00\x01\x00\x00' + b'glyphs' * 100
+URL = 'https://fonts.example/roboto.ttf'
+
+
+def _fetch(cache, target, download):
+    target.parent.mkdir(parents=True, exist_ok=True)
+    return cache.fetch('Roboto', 'regular', '2024-01-01', URL, target, download)
+
+
+def _evicting_link(monkeypatch, cache, other):
+    """Make `other` evict everything just before cache's first link attempt, as another process could."""
+    real_link_into = cache.store.link_into
+    calls = []
+
+    def link_into(digest, target_path):
+        calls.append(digest)
+        if len(calls) == 1:
+            other.evict(0)
+        return real_link_into(digest, target_path)
+
+    monkeypatch.setattr(cache.store, 'link_into', link_into)
+    return calls
+
+
+def test_entry_evicted_before_link_is_downloaded_again(tmp_path, monkeypatch):
+    cache = FontDownloadCache(str(tmp_path / 'cache'))
+    other = FontDownloadCache(str(tmp_path / 'cache'))
+    downloads = []
+    _fetch(cache, tmp_path / 'a' / 'Roboto.ttf', lambda url: downloads.append(url) or FONT)
+
+    _evicting_link(monkeypatch, cache, other)
+    result = _fetch(cache, tmp_path / 'b' / 'Roboto.ttf', lambda url: downloads.append(url) or FONT)
+
+    assert result['cached'] is False
+    assert downloads == [URL, URL]
+    assert (tmp_path / 'b' / 'Roboto.ttf').read_bytes() == FONT
+
+
+def test_fresh_download_evicted_before_link_is_stored_again(tmp_path, monkeypatch):
+    cache = FontDownloadCache(str(tmp_path / 'cache'))
+    other = FontDownloadCache(str(tmp_path / 'cache'))
+
+    calls = _evicting_link(monkeypatch, cache, other)
+    result = _fetch(cache, tmp_path / 'Roboto.ttf', lambda url: FONT)
+
+    assert len(calls) == 2
+    assert result['cached'] is False
+    assert (tmp_path / 'Roboto.ttf').read_bytes() == FONT
+    assert cache.store.blob_path(result['sha256']).exists()
+    assert cache.stats()['entries'] == 1
+
+
+def _slow_fetch(cache_dir, counter, target):
+    """Fetch through a cache instance of its own, counting real downloads in a file."""
+    def download(url):
+        with open(counter, 'a') as f:
+            f.write('x')
+        time.sleep(0.3)
+        return FONT
+
+    cache = FontDownloadCache(cache_dir)
+    try:
+        _fetch(cache, target, download)
+    finally:
+        cache.close()
+
+
+@pytest.mark.skipif(download_cache.fcntl is None, reason="download locks need fcntl")
+@pytest.mark.parametrize('worker', ['thread', 'process'])
+def test_concurrent_fetches_download_once(tmp_path, worker):
+    cache_dir, counter = str(tmp_path / 'cache'), tmp_path / 'downloads'
+    FontDownloadCache(cache_dir).close()
+    targets = [tmp_path / name / 'Roboto.ttf' for name in ('a', 'b')]
+
+    if worker == 'thread':
+        workers = [threading.Thread(target=_slow_fetch, args=(cache_dir, counter, target)) for target in targets]
+    else:
+        context = multiprocessing.get_context('fork')
+        workers = [context.Process(target=_slow_fetch, args=(cache_dir, counter, target)) for target in targets]
+    for w in workers:
+        w.start()
+    for w in workers:
+        w.join(timeout=30)
+
+    assert counter.read_text() == 'x'
+    assert [target.read_bytes() for target in targets] == [FONT, FONT]
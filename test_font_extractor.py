@@ -0,0 +1,65 @@
+"""
+Tests for the PPTX font scan of FontExtractor.
+"""
+
+import re
+import zipfile
+
+from pptx import Presentation
+from pptx.util import Inches
+
+from font_extractor import FontExtractor
+
+
+HEADING_FONT = 'Georgia'
+
+
+def _with_heading_font(path, typeface):
+    """Rewrite the theme so titles (+mj-lt) resolve to typeface."""
+    with zipfile.ZipFile(path) as zip_ref:
+        parts = {info.filename: zip_ref.read(info) for info in zip_ref.infolist()}
+    theme = parts['ppt/theme/theme1.xml'].decode('utf-8')
+    parts['ppt/theme/theme1.xml'] = re.sub(r'(<a:majorFont>\s*<a:latin typeface=")[^"]*',
+                                           r'\g<1>' + typeface, theme, count=1).encode('utf-8')
+    with zipfile.ZipFile(path, 'w', zipfile.ZIP_DEFLATED) as zip_ref:
+        for name, data in parts.items():
+            zip_ref.writestr(name, data)
+
+
+def test_table_after_title_counts_as_body_text(tmp_path):
+    prs = Presentation()
+    slide = prs.slides.add_slide(prs.slide_layouts[5])  # Title Only
+    slide.shapes.title.text = 'Quarterly'
+    table = slide.shapes.add_table(1, 1, Inches(1), Inches(2), Inches(4), Inches(1)).table
+    table.cell(0, 0).text = 'Revenue table'
+    deck = tmp_path / 'deck.pptx'
+    prs.save(deck)
+    _with_heading_font(deck, HEADING_FONT)
+
+    result = FontExtractor(output_dir=str(tmp_path / 'out')).extract_from_pptx(str(deck))
+    usage = result['font_usage']
+
+    assert usage[HEADING_FONT]['characters'] == len('Quarterly')
+    assert usage[HEADING_FONT]['runs'] == 1
+    assert usage['Calibri']['characters'] == len('Revenue table')
+
+
+def test_east_asian_text_is_credited_to_the_ea_font(tmp_path):
+    prs = Presentation()
+    slide = prs.slides.add_slide(prs.slide_layouts[6])  # Blank
+    box = slide.shapes.add_textbox(Inches(1), Inches(1), Inches(4), Inches(1))
+    run = box.text_frame.paragraphs[0].add_run()
+    run.text = 'Tokyo 日本語'
+    run.font.name = 'Montserrat'
+    ea = run._r.get_or_add_rPr().makeelement('{http://schemas.openxmlformats.org/drawingml/2006/main}ea',
+                                             {'typeface': 'Yu Gothic'})
+    run._r.get_or_add_rPr().append(ea)
+    deck = tmp_path / 'deck.pptx'
+    prs.save(deck)
+
+    result = FontExtractor(output_dir=str(tmp_path / 'out')).extract_from_pptx(str(deck))
+
+    assert result['font_usage']['Montserrat']['characters'] == len('Tokyo ')
+    assert result['font_usage']['Yu Gothic']['characters'] == len('日本語')
+    assert result['font_codepoints']['Yu Gothic'] == sorted(map(ord, '日本語'))
+    assert ord('日') not in result['font_codepoints']['Montserrat']
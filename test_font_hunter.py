@@ -0,0 +1,78 @@
+"""
+Tests for how FontHunter classifies and remembers hunt outcomes.
+"""
+
+import json
+import time
+
+import pytest
+
+from download_cache import FontDownloadCache
+from font_hunter import FontHunter
+from google_fonts_catalog import CACHE_FORMAT, GoogleFontsCatalog
+from hunt_cache import HuntResultCache
+
+
+@pytest.fixture
+def hunter(tmp_path, monkeypatch):
+    monkeypatch.delenv('FONT_MIRROR_DIR', raising=False)
+    # A fresh cached catalog answers lookups without any request
+    catalog_path = tmp_path / 'catalog.json'
+    catalog_path.write_text(json.dumps({
+        'format': CACHE_FORMAT,
+        'items': [{'family': 'Roboto', 'variants': ['regular'],
+                   'files': {'regular': 'http://127.0.0.1:9/roboto.ttf'}}],
+        'etag': None,
+        'last_modified': None,
+        'fetched_at': time.time(),
+    }))
+    catalog = GoogleFontsCatalog(str(catalog_path), api_url='http://127.0.0.1:9/webfonts')
+    return FontHunter(api_key='test', output_dir=str(tmp_path / 'hunted'), catalog=catalog,
+                      download_cache=FontDownloadCache(str(tmp_path / 'downloads')), skip_installed=False,
+                      result_cache=HuntResultCache(str(tmp_path / 'results.sqlite')))
+
+
+def test_unknown_font_is_remembered_as_commercial(hunter):
+    results = hunter.hunt_fonts(['Gotham Black'], 'deck')
+
+    # Hunted as its family, Gotham
+    assert [font['searched_names'] for font in results['commercial_fonts']] == [['Gotham Black']]
+    assert results['free_fonts_found'] == []
+    category, _ = hunter.result_cache.get('Gotham', hunter.catalog.api_url)
+    assert category == 'commercial_fonts'
+
+
+def test_registry_font_is_remembered_as_free(hunter):
+    results = hunter.hunt_fonts(['League Gothic'], 'deck')
+
+    assert [font['font_name'] for font in results['free_fonts_found']] == ['League Gothic']
+    assert results['commercial_fonts'] == []
+    category, _ = hunter.result_cache.get('League Gothic', hunter.catalog.api_url)
+    assert category == 'free_fonts_found'
+
+
+def test_only_theme_fallback_system_fonts_are_skipped(hunter):
+    results = hunter.hunt_fonts(['Angsana New', 'Meiryo'], 'deck', theme_fallback_fonts={'Angsana New'})
+
+    assert [font['font_name'] for font in results['already_available']] == ['Angsana New']
+    hunted = [font['font_name'] for category in ('google_fonts_downloaded', 'free_fonts_found', 'commercial_fonts', 'not_found')
+              for font in results[category]]
+    assert 'Meiryo' in hunted
+
+
+def test_failing_font_does_not_abort_the_hunt(hunter, monkeypatch):
+    hunt_font = hunter._hunt_font
+
+    def flaky(font_name, *args, **kwargs):
+        if font_name == 'Gotham':
+            raise RuntimeError('boom')
+        return hunt_font(font_name, *args, **kwargs)
+
+    monkeypatch.setattr(hunter, '_hunt_font', flaky)
+    results = hunter.hunt_fonts(['Gotham', 'League Gothic'], 'deck')
+
+    assert [font['font_name'] for font in results['free_fonts_found']] == ['League Gothic']
+    [failed] = results['commercial_fonts']
+    assert failed['font_name'] == 'Gotham'
+    assert failed['error'] == 'boom'
+    assert failed['search_links']
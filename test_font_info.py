@@ -0,0 +1,95 @@
+"""
+Tests for identifying obfuscated (.odttf) and EOT-wrapped embedded fonts.
+"""
+
+import struct
+from io import BytesIO
+
+import pytest
+from fontTools.fontBuilder import FontBuilder
+from fontTools.pens.ttGlyphPen import TTGlyphPen
+
+from font_info import (EOT_FLAG_COMPRESSED, EOT_FLAG_XOR_ENCRYPTED, EOT_MAGIC, EOT_XOR_KEY, decode_embedded_font,
+                       deobfuscate_odttf)
+
+
+FONT_KEY = '{4C5A6E2B-9D1F-4E3A-8B7C-0123456789AB}'
+
+
+@pytest.fixture(scope='module')
+def ttf():
+    """A tiny TrueType font named 'Probe Sans' Bold Italic, weight 700."""
+    builder = FontBuilder(1000, isTTF=True)
+    builder.setupGlyphOrder(['.notdef', 'A'])
+    builder.setupCharacterMap({ord('A'): 'A'})
+    builder.setupGlyf({name: TTGlyphPen(None).glyph() for name in ('.notdef', 'A')})
+    builder.setupHorizontalMetrics({'.notdef': (500, 0), 'A': (500, 0)})
+    builder.setupHorizontalHeader(ascent=800, descent=-200)
+    builder.setupNameTable({'familyName': 'Probe Sans', 'styleName': 'Bold Italic'})
+    builder.setupOS2(usWeightClass=700, fsSelection=0x01)
+    builder.setupPost()
+    out = BytesIO()
+    builder.save(out)
+    return out.getvalue()
+
+
+def _obfuscate(data, guid):
+    key = bytes.fromhex(guid.strip('{}').replace('-', ''))[::-1]
+    return bytes(data[i] ^ key[i % 16] for i in range(32)) + data[32:]
+
+
+def _eot(font_data, flags=0, family='Probe Sans', style='Bold Italic', weight=700, italic=True):
+    """An EOT 2.1 file: the fixed header, four names, an empty root string and the font data."""
+    names = b''
+    for name in (family, style, 'Version 1.0', f"{family} {style}"):
+        encoded = name.encode('utf-16-le')
+        names += struct.pack('<HH', 0, len(encoded)) + encoded
+    names += struct.pack('<HH', 0, 0)  # padding, empty RootString
+    header_size = 80 + len(names)
+    header = struct.pack('<IIII', header_size + len(font_data), len(font_data), 0x00020001, flags)
+    header += bytes(10)  # PANOSE
+    header += struct.pack('<BBIHH', 1, int(italic), weight, 0, EOT_MAGIC)
+    header += bytes(80 - len(header))
+    return header + names + font_data
+
+
+def test_odttf_is_deobfuscated_with_its_guid(ttf):
+    obfuscated = _obfuscate(ttf, FONT_KEY)
+    assert obfuscated != ttf
+
+    info, plain = decode_embedded_font(obfuscated, filename=f"{FONT_KEY}.odttf")
+
+    assert plain == ttf
+    assert (info['family'], info['style'], info['weight'], info['bold'], info['italic']) == \
+        ('Probe Sans', 'Bold Italic', 700, True, True)
+    assert (info['format'], info['decoded']) == ('odttf', True)
+
+
+def test_odttf_key_can_be_given_without_braces_or_dashes(ttf):
+    key = FONT_KEY.strip('{}').replace('-', '').lower()
+    assert deobfuscate_odttf(_obfuscate(ttf, FONT_KEY), key) == ttf
+
+
+@pytest.mark.parametrize('xor', [False, True])
+def test_uncompressed_eot_is_unwrapped(ttf, xor):
+    font_data = bytes(b ^ EOT_XOR_KEY for b in ttf) if xor else ttf
+    flags = EOT_FLAG_XOR_ENCRYPTED if xor else 0
+
+    info, plain = decode_embedded_font(_eot(font_data, flags), filename='font1.fntdata')
+
+    assert plain == ttf
+    assert (info['family'], info['weight'], info['italic']) == ('Probe Sans', 700, True)
+    assert (info['format'], info['decoded']) == ('eot', True)
+
+
+def test_compressed_eot_is_identified_from_its_header():
+    # MicroType Express data cannot be decoded; the names still come from the header
+    data = _eot(b'MTX compressed glyphs', EOT_FLAG_COMPRESSED, family='Header Serif', style='Italic',
+                weight=300, italic=True)
+
+    info, plain = decode_embedded_font(data, filename='font2.fntdata')
+
+    assert plain is None
+    assert (info['family'], info['style'], info['full_name']) == ('Header Serif', 'Italic', 'Header Serif Italic')
+    assert (info['weight'], info['bold'], info['italic']) == (300, False, True)
+    assert (info['format'], info['decoded']) == ('eot-compressed', False)
@@ -0,0 +1,28 @@
+"""
+Tests for the Google Fonts catalog index.
+"""
+
+from google_fonts_catalog import CatalogIndex
+
+
+def _index(*families):
+    return CatalogIndex([{'family': family, 'files': {'regular': f'https://example.test/{family}.ttf'}}
+                         for family in families])
+
+
+def test_style_suffix_resolves_to_family():
+    match = _index('Barlow', 'Roboto').lookup('Barlow SemiBold Italic')
+    assert match['family'] == 'Barlow'
+    assert match['match'] == 'family+style'
+    assert match['style'] == 'semibolditalic'
+
+
+def test_width_is_not_a_style_of_the_base_family():
+    match = _index('Barlow', 'Roboto').lookup('Barlow Condensed')
+    assert match['family'] != 'Barlow'
+
+
+def test_width_family_wins_over_base_family():
+    match = _index('Barlow', 'Barlow Condensed').lookup('BarlowCondensed-Bold')
+    assert match['family'] == 'Barlow Condensed'
+    assert match['style'] == 'bold'
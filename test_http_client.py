@@ -0,0 +1,108 @@
+"""
+Tests for HTTPClient retries, circuit breaker and deadlines, against a local server.
+"""
+
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+
+import http_client
+from http_client import CircuitOpenError, DeadlineExceeded, HTTPClient
+
+
+class ScriptedHandler(BaseHTTPRequestHandler):
+    """Answers each path with the next status of its script; the last one repeats."""
+
+    scripts = {}
+    hits = {}
+    delay = 0.0
+
+    def do_GET(self):
+        script = self.scripts.setdefault(self.path, [200])
+        status = script.pop(0) if len(script) > 1 else script[0]
+        self.hits[self.path] = self.hits.get(self.path, 0) + 1
+        time.sleep(self.delay if self.path == '/slow' else 0)
+        self.send_response(status)
+        # Retry at once rather than after a random backoff
+        self.send_header('Retry-After', '0')
+        self.send_header('Content-Length', '2')
+        self.end_headers()
+        self.wfile.write(b'ok')
+
+    def log_message(self, *args):
+        pass
+
+
+@pytest.fixture
+def server():
+    ScriptedHandler.scripts, ScriptedHandler.hits, ScriptedHandler.delay = {}, {}, 0.0
+    httpd = ThreadingHTTPServer(('127.0.0.1', 0), ScriptedHandler)
+    httpd.daemon_threads = True
+    thread = threading.Thread(target=httpd.serve_forever, kwargs={'poll_interval': 0.05}, daemon=True)
+    thread.start()
+    yield f"http://127.0.0.1:{httpd.server_address[1]}"
+    httpd.shutdown()
+    httpd.server_close()
+
+
+@pytest.fixture
+def client():
+    with HTTPClient(rate_limit=None, timeout=5) as client:
+        yield client
+
+
+def test_retries_until_success(server, client):
+    ScriptedHandler.scripts['/flaky'] = [503, 502, 200]
+
+    response = client.get(server + '/flaky')
+
+    assert response.status_code == 200
+    totals = client.stats()['totals']
+    assert (totals['requests'], totals['retries']) == (3, 2)
+
+
+def test_last_response_is_returned_when_retries_run_out(server, client):
+    ScriptedHandler.scripts['/down'] = [503]
+
+    assert client.get(server + '/down').status_code == 503
+    assert ScriptedHandler.hits['/down'] == client.max_retries + 1
+
+
+def test_breaker_opens_and_resets_after_cooldown(server, monkeypatch):
+    monkeypatch.setattr(http_client, 'BREAKER_COOLDOWN', 0.2)
+    ScriptedHandler.scripts['/broken'] = [500]
+
+    with HTTPClient(rate_limit=None, max_retries=0) as client:
+        for _ in range(http_client.BREAKER_THRESHOLD):
+            assert client.get(server + '/broken').status_code == 500
+
+        # Open: refused without reaching the server
+        with pytest.raises(CircuitOpenError):
+            client.get(server + '/broken')
+        assert ScriptedHandler.hits['/broken'] == http_client.BREAKER_THRESHOLD
+        assert client.stats()['totals']['fast_failures'] == 1
+
+        # After the cooldown one probe goes through; its success closes the breaker
+        time.sleep(0.25)
+        ScriptedHandler.scripts['/broken'] = [200]
+        assert client.get(server + '/broken').status_code == 200
+        assert client.get(server + '/broken').status_code == 200
+        assert not client.stats()['hosts'][server.split('//')[1]]['circuit_open']
+
+
+def test_deadline_cuts_a_slow_request_short(server, client):
+    ScriptedHandler.delay = 2.0
+    started = time.monotonic()
+
+    with pytest.raises(DeadlineExceeded):
+        client.get(server + '/slow', deadline=started + 0.3)
+
+    assert time.monotonic() - started < 1.5
+
+
+def test_passed_deadline_sends_nothing(server, client):
+    with pytest.raises(DeadlineExceeded):
+        client.with_deadline(time.monotonic() - 1).get(server + '/anything')
+    assert ScriptedHandler.hits == {}
@@ -0,0 +1,150 @@
+"""
+Tests for the Keynote IWA reader, on archives built by hand.
+"""
+
+import os
+import zipfile
+
+import pytest
+
+import keynote_iwa
+from keynote_iwa import (CHARACTER_STYLE_ARCHIVE, IWAError, KeynoteArchive, iter_fields, iter_objects,
+                         read_font_records, snappy_decompress)
+
+
+@pytest.fixture(autouse=True)
+def pure_python_snappy(monkeypatch):
+    monkeypatch.setattr(keynote_iwa, '_snappy', None)
+
+
+def varint(value):
+    out = bytearray()
+    while True:
+        byte = value & 0x7F
+        value >>= 7
+        if value:
+            out.append(byte | 0x80)
+        else:
+            out.append(byte)
+            return bytes(out)
+
+
+def field(number, value):
+    """Encode a varint (int) or length-delimited (bytes) protobuf field."""
+    if isinstance(value, int):
+        return varint(number << 3) + varint(value)
+    return varint(number << 3 | 2) + varint(len(value)) + value
+
+
+def literal(data):
+    if len(data) <= 60:
+        return bytes([(len(data) - 1) << 2]) + data
+    # Longer literals store their length in 1-4 extra bytes
+    extra = ((len(data) - 1).bit_length() + 7) // 8
+    return bytes([(59 + extra) << 2]) + (len(data) - 1).to_bytes(extra, 'little') + data
+
+
+def copy(offset, length):
+    """A snappy copy with a 1-byte offset (lengths 4-11, offsets below 2048)."""
+    return bytes([(offset >> 8) << 5 | (length - 4) << 2 | 1, offset & 0xFF])
+
+
+def iwa_chunk(stream):
+    """Frame a stream as one IWA chunk holding a literal-only snappy block."""
+    block = varint(len(stream)) + literal(stream)
+    return b'\x00' + len(block).to_bytes(3, 'little') + block
+
+
+def archive(identifier, message_type, payload):
+    info = field(1, identifier) + field(2, field(1, message_type) + field(3, len(payload)))
+    return varint(len(info)) + info + payload
+
+
+def style(font_name, bold=None):
+    properties = field(5, font_name.encode('utf-8'))
+    if bold is not None:
+        properties = field(1, int(bold)) + properties
+    return field(11, properties)
+
+
+def test_overlapping_copy_repeats_the_last_bytes():
+    block = varint(12) + literal(b'ab') + copy(2, 10)
+    assert snappy_decompress(block) == b'ab' * 6
+
+
+def test_copy_past_output_is_rejected():
+    with pytest.raises(IWAError):
+        snappy_decompress(varint(6) + literal(b'ab') + copy(3, 4))
+
+
+def test_iter_fields_reads_each_wire_type():
+    message = field(1, 300) + field(2, b'hi') + varint(3 << 3 | 1) + b'8 bytes!' + varint(4 << 3 | 5) + b'4byt'
+    assert list(iter_fields(message)) == [(1, 0, 300), (2, 2, b'hi'), (3, 1, b'8 bytes!'), (4, 5, b'4byt')]
+
+
+def test_iter_objects_splits_archives():
+    stream = archive(7, CHARACTER_STYLE_ARCHIVE, b'first') + archive(8, 1, b'second')
+    assert list(iter_objects(stream)) == [(7, CHARACTER_STYLE_ARCHIVE, b'first'), (8, 1, b'second')]
+
+
+def test_font_records_come_from_style_archives():
+    stream = (archive(1, CHARACTER_STYLE_ARCHIVE, style('Montserrat-Bold', bold=True))
+              + archive(2, 1, style('Not A Style'))
+              + archive(3, keynote_iwa.PARAGRAPH_STYLE_ARCHIVE, style('Helvetica Neue')))
+
+    records = list(read_font_records(iwa_chunk(stream)))
+
+    assert records == [
+        {'font_name': 'Montserrat-Bold', 'bold': True, 'italic': None, 'style_type': CHARACTER_STYLE_ARCHIVE},
+        {'font_name': 'Helvetica Neue', 'bold': None, 'italic': None,
+         'style_type': keynote_iwa.PARAGRAPH_STYLE_ARCHIVE},
+    ]
+
+
+DOCUMENT = iwa_chunk(archive(1, CHARACTER_STYLE_ARCHIVE, style('Montserrat')))
+MEDIA = iwa_chunk(archive(1, CHARACTER_STYLE_ARCHIVE, style('Media Font')))
+
+
+def _zip(path, files):
+    with zipfile.ZipFile(path, 'w') as zip_ref:
+        for name, data in files.items():
+            zip_ref.writestr(name, data)
+
+
+def _key_zip(tmp_path):
+    path = tmp_path / 'talk.key'
+    _zip(path, {'Index/Document.iwa': DOCUMENT, 'Data/movie.iwa': MEDIA})
+    return path
+
+
+def _package_with_folder(tmp_path):
+    path = tmp_path / 'talk.key'
+    (path / 'Index').mkdir(parents=True)
+    (path / 'Index' / 'Document.iwa').write_bytes(DOCUMENT)
+    (path / 'Data').mkdir()
+    (path / 'Data' / 'movie.iwa').write_bytes(MEDIA)
+    return path
+
+
+def _package_with_index_zip(tmp_path):
+    path = tmp_path / 'talk.key'
+    path.mkdir()
+    _zip(path / 'Index.zip', {'Index/Document.iwa': DOCUMENT})
+    (path / 'Data').mkdir()
+    (path / 'Data' / 'movie.iwa').write_bytes(MEDIA)
+    return path
+
+
+@pytest.mark.parametrize('build', [_key_zip, _package_with_folder, _package_with_index_zip])
+def test_data_folder_is_never_read(tmp_path, monkeypatch, build):
+    path = build(tmp_path)
+    touched = []
+
+    real_scandir, real_read = os.scandir, zipfile.ZipFile.read
+    monkeypatch.setattr(keynote_iwa.os, 'scandir', lambda p: touched.append(str(p)) or real_scandir(p))
+    monkeypatch.setattr(zipfile.ZipFile, 'read',
+                        lambda self, name, *args: touched.append(getattr(name, 'filename', name))
+                        or real_read(self, name, *args))
+
+    assert KeynoteArchive(str(path)).font_names() == {'Montserrat'}
+    assert not [name for name in touched if 'Data' in name.replace(os.sep, '/').split('/')]
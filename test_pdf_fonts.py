@@ -0,0 +1,121 @@
+"""
+Tests for the PDF font scan, on small PDFs written byte by byte.
+"""
+
+import zlib
+
+import pytest
+
+from pdf_fonts import PDFFontScanner
+
+
+FORM_CONTENT = b'q Q'
+FONT_PROGRAM = b'\x00\x01\x00\x00not really a font'
+
+# Object number -> body; page 1 uses a form XObject with its own font
+OBJECTS = {
+    1: b'<< /Type /Catalog /Pages 2 0 R >>',
+    2: b'<< /Type /Pages /Kids [3 0 R 4 0 R] /Count 2 >>',
+    3: b'<< /Type /Page /Parent 2 0 R /Resources << /Font << /F1 5 0 R >> /XObject << /X1 7 0 R >> >> >>',
+    4: b'<< /Type /Page /Parent 2 0 R /Resources << /Font << /F1 5 0 R /F2 6 0 R >> >> >>',
+    5: b'<< /Type /Font /Subtype /Type1 /BaseFont /Helvetica >>',
+    6: b'<< /Type /Font /Subtype /TrueType /BaseFont /ABCDEF+Montserrat-Bold /FontDescriptor 8 0 R >>',
+    7: (b'<< /Type /XObject /Subtype /Form /Resources << /Font << /F3 9 0 R >> >> /Length %d >>\nstream\n%s\nendstream'
+        % (len(FORM_CONTENT), FORM_CONTENT)),
+    8: b'<< /Type /FontDescriptor /FontName /ABCDEF+Montserrat-Bold /FontFile2 10 0 R >>',
+    9: b'<< /Type /Font /Subtype /TrueType /BaseFont /Arial,Bold >>',
+    10: b'<< /Length %d >>\nstream\n%s\nendstream' % (len(FONT_PROGRAM), FONT_PROGRAM),
+}
+
+EXPECTED = [
+    {'name': 'Arial-Bold', 'subtype': 'TrueType', 'embedded': False, 'subset': False, 'pages': [1]},
+    {'name': 'Helvetica', 'subtype': 'Type1', 'embedded': False, 'subset': False, 'pages': [1, 2]},
+    {'name': 'Montserrat-Bold', 'subtype': 'TrueType', 'embedded': True, 'subset': True, 'pages': [2]},
+]
+
+
+def _write_objects(objects):
+    data = bytearray(b'%PDF-1.5\n%\xe2\xe3\xcf\xd3\n')
+    offsets = {}
+    for number, body in objects.items():
+        offsets[number] = len(data)
+        data += b'%d 0 obj\n%s\nendobj\n' % (number, body)
+    return data, offsets
+
+
+def classic_pdf():
+    data, offsets = _write_objects(OBJECTS)
+    xref = len(data)
+    size = max(offsets) + 1
+    data += b'xref\n0 %d\n0000000000 65535 f \n' % size
+    for number in range(1, size):
+        data += b'%010d 00000 n \n' % offsets[number]
+    data += b'trailer\n<< /Size %d /Root 1 0 R >>\nstartxref\n%d\n%%%%EOF\n' % (size, xref)
+    return bytes(data)
+
+
+def xref_stream_pdf():
+    """Dictionaries without streams go in an object stream, listed by an xref stream."""
+    packed = [number for number, body in OBJECTS.items() if b'stream' not in body]
+    header, body = b'', b''
+    for number in packed:
+        header += b'%d %d ' % (number, len(body))
+        body += OBJECTS[number] + b'\n'
+    object_stream = zlib.compress(header + body)
+    direct = {number: body for number, body in OBJECTS.items() if number not in packed}
+    direct[11] = (b'<< /Type /ObjStm /N %d /First %d /Filter /FlateDecode /Length %d >>\nstream\n%s\nendstream'
+                  % (len(packed), len(header), len(object_stream), object_stream))
+    data, offsets = _write_objects(direct)
+
+    size = 13
+    offsets[12] = len(data)
+    rows = [b'\x00' + (0).to_bytes(4, 'big') + (65535).to_bytes(2, 'big')]
+    for number in range(1, size):
+        if number in packed:
+            rows.append(b'\x02' + (11).to_bytes(4, 'big') + packed.index(number).to_bytes(2, 'big'))
+        else:
+            rows.append(b'\x01' + offsets[number].to_bytes(4, 'big') + (0).to_bytes(2, 'big'))
+    xref = zlib.compress(b''.join(rows))
+    data += (b'12 0 obj\n<< /Type /XRef /Size %d /W [1 4 2] /Root 1 0 R /Filter /FlateDecode /Length %d >>\n'
+             b'stream\n%s\nendstream\nendobj\n' % (size, len(xref), xref))
+    data += b'startxref\n%d\n%%%%EOF\n' % offsets[12]
+    return bytes(data)
+
+
+def wrong_offset_pdf():
+    data = classic_pdf()
+    return data[:data.rindex(b'startxref')] + b'startxref\n42\n%%EOF\n'
+
+
+def missing_xref_pdf():
+    data, _ = _write_objects(OBJECTS)
+    return bytes(data + b'trailer\n<< /Root 1 0 R >>\n%%EOF\n')
+
+
+def _scan(tmp_path, data):
+    path = tmp_path / 'doc.pdf'
+    path.write_bytes(data)
+    fonts = PDFFontScanner(str(path)).scan()
+    return [{key: font[key] for key in ('name', 'subtype', 'embedded', 'subset', 'pages')} for font in fonts]
+
+
+@pytest.mark.parametrize('build, rebuilt', [
+    (classic_pdf, False),
+    (xref_stream_pdf, False),
+    (wrong_offset_pdf, True),
+    (missing_xref_pdf, True),
+])
+def test_fonts_are_found_through_pages_and_forms(tmp_path, capsys, build, rebuilt):
+    assert _scan(tmp_path, build()) == EXPECTED
+    # Only damaged files fall back to scanning for objects
+    assert ('Rebuilding cross-reference table' in capsys.readouterr().out) == rebuilt
+
+
+def test_embedded_program_is_extracted(tmp_path):
+    path = tmp_path / 'doc.pdf'
+    path.write_bytes(xref_stream_pdf())
+
+    fonts, programs = PDFFontScanner(str(path)).extract()
+
+    assert [font['name'] for font in fonts] == [font['name'] for font in EXPECTED]
+    assert programs == [('Montserrat-Bold.ttf', FONT_PROGRAM)]
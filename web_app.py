@@ -11,9 +11,14 @@ from flask import Flask, render_template, request, jsonify, send_file, send_from
 from werkzeug.utils import secure_filename
 from dotenv import load_dotenv
 import tempfile
+from functools import lru_cache
+from io import BytesIO
 
 from font_hunter import FontHunter
 from font_extractor import FontExtractor
+from font_inventory import FontInventory
+from http_client import HTTPClient
+from keynote_preview import KeynotePreviews
 from pdf_converter import PDFToPPTXConverter
 
 # Load environment variables
@@ -33,12 +38,24 @@ Path('hunted_fonts').mkdir(exist_ok=True)
 Path('extracted_fonts').mkdir(exist_ok=True)
 Path('converted_pptx').mkdir(exist_ok=True)
 
+# Keep-alive connections are reused across requests
+http_client = HTTPClient()
+
 
 def allowed_file(filename):
     """Check if file extension is allowed."""
     return '.' in filename and filename.rsplit('.', 1)[1].lower() in ALLOWED_EXTENSIONS
 
 
+def _record_inventory(filepath, result):
+    """Add an analyzed upload to the font inventory."""
+    try:
+        with FontInventory() as inventory:
+            inventory.record(filepath, result)
+    except Exception as e:
+        print(f"Warning: Could not update font inventory: {e}")
+
+
 @app.route('/')
 def index():
     """Main page."""
@@ -100,8 +117,11 @@ def hunt_fonts():
             result = extractor.extract_from_pptx(filepath)
         elif file_ext in ['.key', '.keynote']:
             result = extractor.extract_from_keynote(filepath)
+        elif file_ext == '.pdf':
+            result = extractor.extract_from_pdf(filepath)
         else:
             return jsonify({'error': 'Not a presentation file'}), 400
+        _record_inventory(filepath, result)
         
         # Get font names
         font_names = list(result['referenced_fonts'])
@@ -116,8 +136,12 @@ def hunt_fonts():
         
         # Hunt for fonts
         api_key = os.getenv('GOOGLE_FONTS_API_KEY')
-        hunter = FontHunter(api_key=api_key, output_dir='hunted_fonts')
-        hunt_results = hunter.hunt_fonts(font_names, project_name)
+        # The server's installed fonts say nothing about the client's machine
+        hunter = FontHunter(api_key=api_key, output_dir='hunted_fonts', http=http_client, skip_installed=False)
+        embedded_font_info = [info for info in result.get('embedded_font_info', []) if info.get('family')]
+        hunt_results = hunter.hunt_fonts(font_names, project_name, available_fonts=embedded_font_info,
+                                         font_usage=result.get('font_usage'),
+                                         theme_fallback_fonts=set(result.get('theme_fallback_fonts', [])))
         
         # Prepare response
         response = {
@@ -127,13 +151,16 @@ def hunt_fonts():
                 'google_fonts_downloaded': len(hunt_results['google_fonts_downloaded']),
                 'free_fonts_found': len(hunt_results['free_fonts_found']),
                 'commercial_fonts': len(hunt_results['commercial_fonts']),
+                'already_available': len(hunt_results['already_available']),
                 'project_folder': hunt_results['project_folder'],
                 'report_path': hunt_results['report_path']
             },
             'details': {
                 'google_fonts': hunt_results['google_fonts_downloaded'],
                 'free_fonts': hunt_results['free_fonts_found'],
-                'commercial_fonts': hunt_results['commercial_fonts']
+                'commercial_fonts': hunt_results['commercial_fonts'],
+                'already_available': hunt_results['already_available'],
+                'font_usage': hunt_results['font_usage']
             }
         }
         
@@ -165,8 +192,11 @@ def extract_fonts():
             result = extractor.extract_from_pptx(filepath)
         elif file_ext in ['.key', '.keynote']:
             result = extractor.extract_from_keynote(filepath)
+        elif file_ext == '.pdf':
+            result = extractor.extract_from_pdf(filepath, extract_embedded=True)
         else:
             return jsonify({'error': 'Not a presentation file'}), 400
+        _record_inventory(filepath, result)
         
         return jsonify({
             'success': True,
@@ -174,7 +204,8 @@ def extract_fonts():
             'referenced_fonts': len(result['referenced_fonts']),
             'output_folder': result['output_folder'],
             'fonts': result['embedded_fonts'],
-            'font_names': result['referenced_fonts']
+            'font_names': result['referenced_fonts'],
+            'font_usage': result.get('font_usage', {})
         })
     
     except Exception as e:
@@ -238,13 +269,16 @@ def download_fonts(project_name):
     """Download fonts as a zip file."""
     import zipfile
     
-    fonts_folder = Path('hunted_fonts') / project_name / 'fonts_downloaded'
+    # ?subset=1 delivers the subset fonts written by `hunt-fonts --subset`
+    use_subset = request.args.get('subset') in ('1', 'true')
+    fonts_folder = Path('hunted_fonts') / project_name / ('fonts_subset' if use_subset else 'fonts_downloaded')
     
     if not fonts_folder.exists():
         return "No fonts found", 404
     
     # Create temporary zip file
-    zip_path = Path(tempfile.gettempdir()) / f'{project_name}_fonts.zip'
+    suffix = '_subset' if use_subset else ''
+    zip_path = Path(tempfile.gettempdir()) / f'{project_name}_fonts{suffix}.zip'
     
     with zipfile.ZipFile(zip_path, 'w') as zipf:
         for font_file in fonts_folder.glob('*.ttf'):
@@ -252,7 +286,74 @@ def download_fonts(project_name):
         for font_file in fonts_folder.glob('*.otf'):
             zipf.write(font_file, font_file.name)
     
-    return send_file(zip_path, as_attachment=True, download_name=f'{project_name}_fonts.zip')
+    return send_file(zip_path, as_attachment=True, download_name=f'{project_name}_fonts{suffix}.zip')
+
+
+@app.route('/font-inventory')
+def font_inventory():
+    """
+    Query the font inventory.
+    
+    ?font=Gotham lists the presentations using a font (add &exact=1 for the
+    exact name); ?decks=Room%20B lists the fonts needed by matching decks.
+    """
+    font = request.args.get('font')
+    decks = request.args.get('decks')
+    exact = request.args.get('exact') in ('1', 'true')
+    
+    try:
+        with FontInventory() as inventory:
+            if font:
+                results = inventory.decks_for_font(font, exact=exact)
+            else:
+                results = inventory.fonts_for_decks(decks)
+            stats = inventory.stats()
+    except Exception as e:
+        return jsonify({'error': str(e)}), 500
+    
+    return jsonify({'success': True, 'inventory': stats, 'results': results})
+
+
+@lru_cache(maxsize=64)
+def _keynote_preview_listing(filepath: str, mtime_ns: int):
+    """Preview listing of a Keynote upload, cached while the file is unchanged."""
+    return KeynotePreviews(filepath).list_previews()
+
+
+@app.route('/keynote-previews/<filename>')
+def keynote_previews(filename):
+    """List the slide thumbnails stored in an uploaded Keynote file."""
+    filepath = Path(app.config['UPLOAD_FOLDER']) / secure_filename(filename)
+    
+    if not filepath.exists() or filepath.suffix.lower() not in ('.key', '.keynote'):
+        return jsonify({'error': 'Keynote file not found'}), 404
+    
+    try:
+        listing = _keynote_preview_listing(str(filepath), filepath.stat().st_mtime_ns)
+    except Exception as e:
+        return jsonify({'error': str(e)}), 500
+    
+    previews = [dict(preview) for preview in listing]
+    for index, preview in enumerate(previews):
+        preview['url'] = url_for('keynote_preview', filename=filepath.name, index=index)
+    return jsonify({'success': True, 'previews': previews})
+
+
+@app.route('/keynote-preview/<filename>/<int:index>')
+def keynote_preview(filename, index):
+    """Serve one Keynote preview image, as listed by /keynote-previews."""
+    filepath = Path(app.config['UPLOAD_FOLDER']) / secure_filename(filename)
+    
+    if not filepath.exists() or filepath.suffix.lower() not in ('.key', '.keynote'):
+        return "File not found", 404
+    
+    listing = _keynote_preview_listing(str(filepath), filepath.stat().st_mtime_ns)
+    if index >= len(listing):
+        return "Preview not found", 404
+    
+    name = listing[index]['name']
+    mimetype = 'image/tiff' if name.lower().endswith(('.tif', '.tiff')) else 'image/jpeg'
+    return send_file(BytesIO(KeynotePreviews(str(filepath)).read(name)), mimetype=mimetype, max_age=3600)
 
 
 @app.route('/download-converted/<filename>')